@@ -13,13 +13,54 @@ Araştırma Katmanları:
 """
 
 from groq import Groq
-from typing import List, Dict, Optional, Generator, Any
+from typing import List, Dict, Optional, Generator, AsyncGenerator, Any, Tuple
+import asyncio
 import os
 import re
 import json
-import requests
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from config.settings import DEFAULT_MODEL, SERPER_API_KEY
+from config.settings import (
+    DEFAULT_MODEL,
+    SERPER_API_KEY,
+    SERPER_BASE_URL,
+    SERPER_BATCH_SIZE,
+    RESEARCH_MAX_WORKERS,
+    RESEARCH_BATCH_MODE,
+    RESEARCH_EARLY_STOP,
+    RESEARCH_INITIAL_QUERIES,
+    RESEARCH_MIN_NEW_SOURCES,
+    RESEARCH_SATURATION_FACTOR,
+    PIPELINE_MAX_WORKERS,
+)
+from agents.http_client import http_post
+from agents.singleflight import get_group as get_flight_group
+from agents.resilience import get_provider
+from agents.research_dedup import ResearchDeduplicator, SaturationTracker
+from agents.research_packer import pack_research
+from agents.extractors import DEFAULT_EXTRACTOR, unique
+from agents.search_result import SearchResult, extract_domain, NEWS, KNOWLEDGE_GRAPH, ANSWER, QUESTION
+from agents.search_cache import (
+    get_search_cache,
+    make_key as make_search_key,
+    ttl_for as search_cache_ttl,
+    stale_ttl_for as search_cache_stale_ttl,
+    is_recent as is_recent_search,
+)
+from agents.research_snapshots import ResearchSnapshot, get_snapshot_store, schedule_refresh as schedule_snapshot_refresh
+from agents.revalidator import get_revalidator, PRIORITY_NEWS, PRIORITY_EVERGREEN
+from agents.image_curator import (
+    UNSPLASH_ACCESS_KEY,
+    search_images,
+    get_image_curator,
+    insert_section_images,
+    section_headings,
+)
+from agents.pipeline_dag import Stage, Step, StageGraph
+from agents.checkpoints import StageCheckpoints
 
 
 # ============================================================
@@ -129,50 +170,9 @@ RESEARCH_CATEGORIES = {
 # UNSPLASH API
 # ============================================================
 
-UNSPLASH_ACCESS_KEY = os.getenv("UNSPLASH_ACCESS_KEY", "")
-
-def search_images(query: str, count: int = 3) -> List[Dict]:
-    if not UNSPLASH_ACCESS_KEY:
-        return []
-    
-    try:
-        response = requests.get(
-            "https://api.unsplash.com/search/photos",
-            params={"query": query, "per_page": count, "orientation": "landscape"},
-            headers={"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"},
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
-        
-        images = []
-        for photo in data.get("results", []):
-            images.append({
-                "url": photo["urls"]["regular"],
-                "thumb": photo["urls"]["thumb"],
-                "alt": photo.get("alt_description", query),
-                "credit": photo["user"]["name"],
-                "credit_link": photo["user"]["links"]["html"]
-            })
-        return images
-    except:
-        return []
-
-
 def get_images_for_topic(topic: str, sections: List[str] = None) -> Dict[str, Dict]:
-    images = {}
-    
-    hero_images = search_images(topic, count=1)
-    if hero_images:
-        images["hero"] = hero_images[0]
-    
-    if sections:
-        for section in sections[:5]:
-            section_images = search_images(f"{section} {topic}", count=1)
-            if section_images:
-                images[section] = section_images[0]
-    
-    return images
+    """Hero + bölüm görselleri (sorgular tekilleştirilip eş zamanlı aranır)"""
+    return get_image_curator().curate(topic, sections)
 
 
 # ============================================================
@@ -180,397 +180,702 @@ def get_images_for_topic(topic: str, sections: List[str] = None) -> Dict[str, Di
 # ============================================================
 
 def web_search(query: str, num_results: int = 10, language: str = "tr", 
-               search_type: str = "search", time_range: str = None) -> List[Dict]:
+               search_type: str = "search", time_range: str = None,
+               use_cached: bool = True) -> List[SearchResult]:
     """
     Gelişmiş web arama fonksiyonu
     
+    Sonuçlar search cache üzerinden paylaşılır; boş sonuçlar önbelleğe alınmaz.
+    TTL'i dolmuş (bayat) kayıt hemen döndürülür ve arka planda yenilenir.
+    
     Args:
         query: Arama sorgusu
         num_results: Sonuç sayısı
         language: Dil (tr/en)
         search_type: Arama tipi (search/news)
         time_range: Zaman aralığı (d=gün, w=hafta, m=ay, y=yıl)
+        use_cached: False ise önbellek okunmaz (sonuç yine yazılır)
     """
     if not SERPER_API_KEY:
         return []
     
+    cache = get_search_cache()
+    cache_key = make_search_key(query, language, search_type, time_range, num_results)
+    fetch = _search_fetcher(query, num_results, language, search_type, time_range, cache, cache_key)
+    
+    if cache and use_cached:
+        cached = _cache_get(cache, cache_key)
+        if cached is not None:
+            results, fresh = cached
+            if not fresh:
+                _schedule_revalidation(cache_key, fetch, search_type, time_range)
+            return results
+    
+    return fetch()
+
+
+def _search_fetcher(query: str, num_results: int, language: str, search_type: str,
+                    time_range: Optional[str], cache, cache_key: str):
+    """Aramayı yapan fonksiyon; aynı anda gelen özdeş aramalar tek istekte birleşir"""
+    return lambda: get_flight_group("search").do(
+        cache_key,
+        lambda: _fetch_search(query, num_results, language, search_type, time_range, cache, cache_key)
+    )
+
+
+def _schedule_revalidation(cache_key: str, fetch, search_type: str, time_range: Optional[str]):
+    """Bayat arama kaydını arka planda yeniler (haber aramaları öncelikli)"""
+    priority = PRIORITY_NEWS if is_recent_search(search_type, time_range) else PRIORITY_EVERGREEN
+    get_revalidator().schedule(f"search:{cache_key}", fetch, priority)
+
+
+def _serper_endpoint(search_type: str) -> str:
+    """Arama tipine göre Serper endpoint'i"""
+    if search_type == "news":
+        return f"{SERPER_BASE_URL}/news"
+    return f"{SERPER_BASE_URL}/search"
+
+
+def _serper_params(query: str, num_results: int, language: str, time_range: Optional[str]) -> Dict:
+    """Serper request parametreleri"""
+    params = {
+        "q": query,
+        "gl": "tr" if language == "tr" else "us",
+        "hl": language,
+        "num": num_results
+    }
+    
+    # Zaman filtresi
+    if time_range:
+        params["tbs"] = f"qdr:{time_range}"
+    
+    return params
+
+
+def _fetch_search(query: str, num_results: int, language: str, search_type: str,
+                  time_range: Optional[str], cache, cache_key: str) -> List[SearchResult]:
+    """Serper'a isteği gönderir ve sonucu önbelleğe yazar"""
     try:
-        # Endpoint belirleme
-        endpoint = "https://google.serper.dev/search"
-        if search_type == "news":
-            endpoint = "https://google.serper.dev/news"
-        
-        # Request parametreleri
-        params = {
-            "q": query,
-            "gl": "tr" if language == "tr" else "us",
-            "hl": language,
-            "num": num_results
-        }
-        
-        # Zaman filtresi
-        if time_range:
-            params["tbs"] = f"qdr:{time_range}"
-        
-        response = requests.post(
-            endpoint,
-            headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
-            json=params,
-            timeout=15
-        )
-        response.raise_for_status()
-        data = response.json()
-        
-        results = []
-        
-        # Organik sonuçlar
-        for item in data.get("organic", []):
-            results.append({
-                "title": item.get("title", ""),
-                "snippet": item.get("snippet", ""),
-                "link": item.get("link", ""),
-                "date": item.get("date", ""),
-                "source": extract_domain(item.get("link", ""))
-            })
+        def send():
+            response = http_post(
+                _serper_endpoint(search_type),
+                headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
+                json=_serper_params(query, num_results, language, time_range),
+                timeout=15
+            )
+            response.raise_for_status()
+            return response
         
-        # News sonuçları
-        for item in data.get("news", []):
-            results.append({
-                "title": item.get("title", ""),
-                "snippet": item.get("snippet", ""),
-                "link": item.get("link", ""),
-                "date": item.get("date", ""),
-                "source": item.get("source", "")
-            })
-        
-        # Knowledge Graph
-        if "knowledgeGraph" in data:
-            kg = data["knowledgeGraph"]
-            kg_result = {
-                "title": kg.get("title", ""),
-                "snippet": kg.get("description", ""),
-                "link": kg.get("website", ""),
-                "source": "Knowledge Graph",
-                "is_kg": True,
-                "attributes": kg.get("attributes", {})
-            }
-            results.insert(0, kg_result)
-        
-        # Answer Box
-        if "answerBox" in data:
-            ab = data["answerBox"]
-            answer_result = {
-                "title": ab.get("title", "Doğrudan Cevap"),
-                "snippet": ab.get("answer", ab.get("snippet", "")),
-                "link": ab.get("link", ""),
-                "source": "Answer Box",
-                "is_answer": True
-            }
-            results.insert(0, answer_result)
-        
-        # People Also Ask
-        if "peopleAlsoAsk" in data:
-            for paa in data["peopleAlsoAsk"][:3]:
-                results.append({
-                    "title": paa.get("question", ""),
-                    "snippet": paa.get("snippet", ""),
-                    "link": paa.get("link", ""),
-                    "source": "İlgili Soru",
-                    "is_question": True
-                })
-        
-        return results
+        results = parse_serper_response(get_provider("serper").call(send).json())
         
     except Exception as e:
         print(f"Arama hatası: {e}")
         return []
+    
+    if cache and results:
+        _cache_set(cache, cache_key, results, search_cache_ttl(search_type, time_range),
+                   search_cache_stale_ttl(search_type, time_range))
+    
+    return results
 
 
-def extract_domain(url: str) -> str:
-    """URL'den domain çıkarır"""
-    try:
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
-        domain = parsed.netloc.replace("www.", "")
-        return domain
-    except:
-        return ""
-
-
-def extract_statistics(text: str) -> List[str]:
-    """Metinden istatistikleri çıkarır"""
-    stats = []
-    
-    # Yüzde kalıpları
-    percentages = re.findall(r'%\s*\d+[\.,]?\d*|\d+[\.,]?\d*\s*%', text)
-    stats.extend([f"📈 {p.strip()}" for p in percentages])
+def web_search_batch(searches: List[Dict], use_cached: bool = True) -> List[List[SearchResult]]:
+    """
+    Birden fazla aramayı Serper batch modunda çalıştırır
     
-    # Büyük sayılar (milyon, milyar, trilyon)
-    big_numbers = re.findall(r'\d+[\.,]?\d*\s*(milyon|milyar|trilyon|million|billion|trillion)', text, re.IGNORECASE)
-    stats.extend([f"💰 {n[0]} {n[1]}" if isinstance(n, tuple) else f"💰 {n}" for n in big_numbers])
+    Aynı endpoint'e giden sorgular tek POST'ta (en fazla SERPER_BATCH_SIZE)
+    gönderilir, yanıtlar sorgu sırasına göre ayrıştırılır. Bayat önbellek
+    kayıtları web_search'teki gibi sunulur ve tek tek yenilenir.
     
-    # Para birimleri
-    money = re.findall(r'[\$€₺]\s*\d+[\.,]?\d*\s*(milyon|milyar|bin|K|M|B)?', text, re.IGNORECASE)
+    Args:
+        searches: [{"query", "num_results", "language", "search_type", "time_range"}]
+        use_cached: False ise önbellek okunmaz (sonuçlar yine yazılır)
     
-    # Yıl bazlı veriler
-    year_data = re.findall(r'20\d{2}\s*[-–]\s*20\d{2}|20\d{2}\s+yılında', text)
-    stats.extend([f"📅 {y}" for y in year_data])
+    Returns:
+        Her arama için web_search ile aynı biçimde sonuç listesi (aynı sırada)
+    """
+    outputs = [[] for _ in searches]
+    if not SERPER_API_KEY or not searches:
+        return outputs
+    
+    cache = get_search_cache()
+    groups = {}
+    
+    for position, search in enumerate(searches):
+        query = search["query"]
+        num_results = search.get("num_results", 10)
+        language = search.get("language", "tr")
+        search_type = search.get("search_type", "search")
+        time_range = search.get("time_range")
+        
+        cache_key = make_search_key(query, language, search_type, time_range, num_results)
+        if cache and use_cached:
+            cached = _cache_get(cache, cache_key)
+            if cached is not None:
+                outputs[position], fresh = cached
+                if not fresh:
+                    fetch = _search_fetcher(query, num_results, language, search_type, time_range, cache, cache_key)
+                    _schedule_revalidation(cache_key, fetch, search_type, time_range)
+                continue
+        
+        groups.setdefault(_serper_endpoint(search_type), []).append({
+            "position": position,
+            "params": _serper_params(query, num_results, language, time_range),
+            "cache_key": cache_key,
+            "ttl": search_cache_ttl(search_type, time_range),
+            "stale_ttl": search_cache_stale_ttl(search_type, time_range)
+        })
+    
+    chunks = [
+        (endpoint, items[start:start + SERPER_BATCH_SIZE])
+        for endpoint, items in groups.items()
+        for start in range(0, len(items), SERPER_BATCH_SIZE)
+    ]
     
-    return list(set(stats))[:10]  # Maksimum 10 istatistik
+    def send_chunk(endpoint: str, items: List[Dict]):
+        try:
+            def send():
+                response = http_post(
+                    endpoint,
+                    headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
+                    json=[item["params"] for item in items],
+                    timeout=30
+                )
+                response.raise_for_status()
+                return response
+            
+            data = get_provider("serper").call(send).json()
+            if not isinstance(data, list) or len(data) != len(items):
+                raise ValueError(f"Beklenmeyen batch yanıtı ({len(items)} sorgu)")
+        except Exception as e:
+            print(f"Batch arama hatası: {e}")
+            return
+        
+        for item, item_data in zip(items, data):
+            results = parse_serper_response(item_data)
+            outputs[item["position"]] = results
+            if cache and results:
+                _cache_set(cache, item["cache_key"], results, item["ttl"], item["stale_ttl"])
+    
+    if len(chunks) == 1:
+        send_chunk(*chunks[0])
+    elif chunks:
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            list(executor.map(lambda chunk: send_chunk(*chunk), chunks))
+    
+    return outputs
+
+
+def parse_serper_response(data: Dict) -> List[SearchResult]:
+    """Serper yanıtını sonuç listesine çevirir"""
+    results = []
+    
+    # Organik sonuçlar
+    for item in data.get("organic", []):
+        results.append(SearchResult(
+            title=item.get("title", ""),
+            snippet=item.get("snippet", ""),
+            link=item.get("link", ""),
+            date=item.get("date", ""),
+            source=extract_domain(item.get("link", ""))
+        ))
+    
+    # News sonuçları
+    for item in data.get("news", []):
+        results.append(SearchResult(
+            title=item.get("title", ""),
+            snippet=item.get("snippet", ""),
+            link=item.get("link", ""),
+            date=item.get("date", ""),
+            source=item.get("source", ""),
+            kind=NEWS
+        ))
+    
+    # Knowledge Graph
+    if "knowledgeGraph" in data:
+        kg = data["knowledgeGraph"]
+        results.insert(0, SearchResult(
+            title=kg.get("title", ""),
+            snippet=kg.get("description", ""),
+            link=kg.get("website", ""),
+            source="Knowledge Graph",
+            kind=KNOWLEDGE_GRAPH,
+            attributes=kg.get("attributes", {})
+        ))
+    
+    # Answer Box
+    if "answerBox" in data:
+        ab = data["answerBox"]
+        results.insert(0, SearchResult(
+            title=ab.get("title", "Doğrudan Cevap"),
+            snippet=ab.get("answer", ab.get("snippet", "")),
+            link=ab.get("link", ""),
+            source="Answer Box",
+            kind=ANSWER
+        ))
+    
+    # People Also Ask
+    if "peopleAlsoAsk" in data:
+        for paa in data["peopleAlsoAsk"][:3]:
+            results.append(SearchResult(
+                title=paa.get("question", ""),
+                snippet=paa.get("snippet", ""),
+                link=paa.get("link", ""),
+                source="İlgili Soru",
+                kind=QUESTION
+            ))
+    
+    return results
+
+
+def _cache_get(cache, cache_key: str) -> Optional[Tuple[List[SearchResult], bool]]:
+    """Önbellekteki kaydı (SearchResult listesi, taze_mi) olarak döndürür"""
+    entry = cache.lookup(cache_key)
+    if entry is None:
+        return None
+    cached, fresh = entry
+    return [SearchResult.from_dict(item) for item in cached], fresh
+
+
+def _cache_set(cache, cache_key: str, results: List[SearchResult], ttl: int, stale_ttl: int = 0):
+    cache.set(cache_key, [r.to_dict() for r in results], ttl, stale_ttl)
+
+
+def extract_statistics(text: str) -> List[str]:
+    """Metinden istatistikleri çıkarır"""
+    return DEFAULT_EXTRACTOR.extract_statistics(text)
 
 
 def extract_quotes(text: str) -> List[str]:
     """Metinden alıntıları çıkarır"""
-    quotes = []
-    
-    # Tırnak içindeki metinler (çeşitli tırnak stilleri)
-    # Standart çift tırnak
-    quoted = re.findall(r'"([^"]{20,200})"', text)
-    # Tek tırnak
-    quoted += re.findall(r"'([^']{20,200})'", text)
-    # Guillemet tırnaklar
-    quoted += re.findall(r'«([^»]{20,200})»', text)
-    
-    for q in quoted[:5]:
-        quotes.append(f'💬 "{q}"')
-    
-    return quotes
+    return DEFAULT_EXTRACTOR.extract_quotes(text)
 
 
 # ============================================================
 # 7 KATMANLI ARAŞTIRMA SİSTEMİ
 # ============================================================
 
-def deep_research(topic: str, format_type: str = "standard") -> Dict[str, Any]:
+def build_research_plan(topic: str, format_type: str = "standard",
+                        depth: str = "deep") -> List[Dict[str, Any]]:
     """
-    7 katmanlı derinlemesine araştırma sistemi
+    Araştırma katmanlarını ve sorgularını sıralı plan olarak döndürür
     
-    Returns:
-        {
-            "layers": {...},
-            "statistics": [...],
-            "quotes": [...],
-            "sources_count": int,
-            "compiled_research": str
-        }
-    """
+    Her katman: name, category, queries, search (web_search parametreleri),
+    limit (katmanda tutulacak sonuç sayısı), extract (statistics/quotes)
     
-    research_data = {
-        "layers": {},
-        "statistics": [],
-        "quotes": [],
-        "sources": [],
-        "sources_count": 0
-    }
+    depth (RESEARCH_DEPTH_CONFIG) katmanları ve katman başına sorgu sayısını
+    sınırlar; formata özel katman her derinlikte çalışır.
+    """
     
-    # ═══════════════════════════════════════════════════════
-    # KATMAN 1: GENEL BİLGİ
-    # ═══════════════════════════════════════════════════════
+    # Türkçe konuyu İngilizceye çevir (basit yaklaşım)
+    topic_en = topic  # İleride çeviri API eklenebilir
     
-    general_queries = [
-        f"{topic} nedir",
-        f"{topic} tanımı ve önemi",
-        f"{topic} temel kavramlar"
+    plan = [
+        # KATMAN 1: GENEL BİLGİ
+        {
+            "name": "general",
+            "category": RESEARCH_CATEGORIES["general"],
+            "queries": [
+                f"{topic} nedir",
+                f"{topic} tanımı ve önemi",
+                f"{topic} temel kavramlar"
+            ],
+            "search": {"language": "tr"},
+            "limit": 8,
+            "extract": []
+        },
+        # KATMAN 2: İSTATİSTİK & VERİ
+        {
+            "name": "statistics",
+            "category": RESEARCH_CATEGORIES["statistics"],
+            "queries": [
+                f"{topic} istatistikleri 2024",
+                f"{topic} pazar büyüklüğü",
+                f"{topic} araştırma verileri",
+                f"{topic} yüzde oran rakamlar"
+            ],
+            "search": {"language": "tr"},
+            "limit": 8,
+            "extract": ["statistics"]
+        },
+        # KATMAN 3: GÜNCEL HABERLER (son 1 aylık haberler)
+        {
+            "name": "news",
+            "category": RESEARCH_CATEGORIES["news"],
+            "queries": [
+                f"{topic} son gelişmeler",
+                f"{topic} 2024 haberleri"
+            ],
+            "search": {"language": "tr", "search_type": "news", "time_range": "m"},
+            "limit": 6,
+            "extract": []
+        },
+        # KATMAN 4: UZMAN GÖRÜŞLERİ
+        {
+            "name": "expert",
+            "category": RESEARCH_CATEGORIES["expert"],
+            "queries": [
+                f"{topic} uzman görüşü",
+                f"{topic} profesyonel tavsiye",
+                f'"{topic}" CEO açıklama'
+            ],
+            "search": {"language": "tr"},
+            "limit": 6,
+            "extract": ["quotes"]
+        },
+        # KATMAN 5: VAKA ÇALIŞMALARI
+        {
+            "name": "cases",
+            "category": RESEARCH_CATEGORIES["cases"],
+            "queries": [
+                f"{topic} başarı hikayesi",
+                f"{topic} örnek şirket",
+                f"{topic} vaka çalışması case study"
+            ],
+            "search": {"language": "tr"},
+            "limit": 6,
+            "extract": []
+        },
+        # KATMAN 6: GLOBAL KAYNAKLAR (İNGİLİZCE)
+        {
+            "name": "global",
+            "category": RESEARCH_CATEGORIES["global"],
+            "queries": [
+                f"{topic_en} statistics 2024",
+                f"{topic_en} trends research",
+                f"{topic_en} best practices"
+            ],
+            "search": {"language": "en"},
+            "limit": 6,
+            "extract": ["statistics"]
+        },
+        # KATMAN 7: SSS & SORUNLAR
+        {
+            "name": "faq",
+            "category": RESEARCH_CATEGORIES["faq"],
+            "queries": [
+                f"{topic} sık sorulan sorular",
+                f"{topic} sorunları çözümleri",
+                f"{topic} nasıl yapılır"
+            ],
+            "search": {"language": "tr"},
+            "limit": 6,
+            "extract": []
+        },
     ]
     
-    layer_results = []
-    for query in general_queries:
-        results = web_search(query, num_results=5, language="tr")
-        layer_results.extend(results)
-    
-    research_data["layers"]["general"] = {
-        "category": RESEARCH_CATEGORIES["general"],
-        "results": layer_results[:8],
-        "query_count": len(general_queries)
+    # FORMAT BAZLI EK ARAŞTIRMA
+    format_extra_queries = {
+        "listicle": [f"{topic} en iyi yolları", f"{topic} ipuçları listesi"],
+        "howto": [f"{topic} adım adım rehber", f"{topic} başlangıç kılavuzu"],
+        "comparison": [f"{topic} karşılaştırma", f"{topic} alternatifleri vs"],
+        "casestudy": [f"{topic} ROI sonuçlar", f"{topic} dönüşüm metrikleri"]
     }
     
-    # ═══════════════════════════════════════════════════════
-    # KATMAN 2: İSTATİSTİK & VERİ
-    # ═══════════════════════════════════════════════════════
+    if format_type in format_extra_queries:
+        plan.append({
+            "name": "format_specific",
+            "key": f"format_specific:{format_type}",
+            "category": {"icon": "🎯", "name": f"{format_type.title()} Özel", "description": "Format bazlı araştırma"},
+            "queries": format_extra_queries[format_type],
+            "search": {"language": "tr"},
+            "limit": 6,
+            "extract": []
+        })
     
-    stats_queries = [
-        f"{topic} istatistikleri 2024",
-        f"{topic} pazar büyüklüğü",
-        f"{topic} araştırma verileri",
-        f"{topic} yüzde oran rakamlar"
-    ]
+    profile = RESEARCH_DEPTH_CONFIG.get(depth, RESEARCH_DEPTH_CONFIG["deep"])
+    if profile["layers"] is not None:
+        plan = [layer for layer in plan if layer["name"] in profile["layers"] or layer["name"] == "format_specific"]
+    if profile["queries_per_layer"] is not None:
+        for layer in plan:
+            layer["queries"] = layer["queries"][:profile["queries_per_layer"]]
     
-    layer_results = []
-    for query in stats_queries:
-        results = web_search(query, num_results=5, language="tr")
-        layer_results.extend(results)
-        
-        # İstatistik çıkarma
-        for r in results:
-            stats = extract_statistics(r.get("snippet", ""))
-            research_data["statistics"].extend(stats)
-    
-    research_data["layers"]["statistics"] = {
-        "category": RESEARCH_CATEGORIES["statistics"],
-        "results": layer_results[:8],
-        "query_count": len(stats_queries)
-    }
+    return plan
+
+
+def resolve_research_depth(length: str = "medium", user_plan: str = "free",
+                           override: Optional[str] = None) -> str:
+    """
+    Araştırma derinliğini seçer
     
-    # ═══════════════════════════════════════════════════════
-    # KATMAN 3: GÜNCEL HABERLER
-    # ═══════════════════════════════════════════════════════
+    Varsayılan LENGTH_CONFIG'ten gelir; override verilirse o kullanılır.
+    Her iki durumda da kullanıcının planının izin verdiği derinlik aşılmaz.
+    """
+    order = list(RESEARCH_DEPTH_CONFIG)
+    depth = override if override in RESEARCH_DEPTH_CONFIG else \
+        LENGTH_CONFIG.get(length, LENGTH_CONFIG["medium"])["research_depth"]
+    allowed = PLAN_RESEARCH_DEPTH.get(user_plan, PLAN_RESEARCH_DEPTH["free"])
+    return order[min(order.index(depth), order.index(allowed))]
+
+
+def run_research_plan(plan: List[Dict[str, Any]],
+                      max_workers: int = RESEARCH_MAX_WORKERS,
+                      batch_mode: str = RESEARCH_BATCH_MODE,
+                      use_cached: bool = True,
+                      early_stop: bool = RESEARCH_EARLY_STOP) -> Dict[str, Any]:
+    """
+    Plandaki sorguları eş zamanlı çalıştırır
     
-    news_queries = [
-        f"{topic} son gelişmeler",
-        f"{topic} 2024 haberleri"
-    ]
+    batch_mode:
+        "off"     - her sorgu ayrı istek (web_search)
+        "layer"   - her katman tek batch isteği (web_search_batch)
+        "request" - tüm sorgular tek batch isteği
     
-    layer_results = []
-    for query in news_queries:
-        # Son 1 aylık haberler
-        results = web_search(query, num_results=5, language="tr", search_type="news", time_range="m")
-        layer_results.extend(results)
+    use_cached=False ise arama önbelleği okunmaz (arka plan yenilemesi)
     
-    research_data["layers"]["news"] = {
-        "category": RESEARCH_CATEGORIES["news"],
-        "results": layer_results[:6],
-        "query_count": len(news_queries)
-    }
+    max_workers yalnızca thread havuzunun boyutudur; 0 ise havuz serper
+    AdaptiveLimiter'ının max_limit'i kadar açılır ve gerçek eş zamanlılığı
+    limiter belirler (havuz, limiter'ın artırdığı sınırı kesmesin).
     
-    # ═══════════════════════════════════════════════════════
-    # KATMAN 4: UZMAN GÖRÜŞLERİ
-    # ═══════════════════════════════════════════════════════
+    early_stop ise sorgular en fazla iki dalgada çalışır: önce her katmanın ilk
+    RESEARCH_INITIAL_QUERIES sorgusu, sonra doymamış katmanların kalan
+    sorgularının hepsi birlikte. İlk dalgada yeni URL getirmeyen veya yeterli
+    URL'ye ulaşan katman durur; atlanan sorguların sonuç listesi boş kalır.
     
-    expert_queries = [
-        f"{topic} uzman görüşü",
-        f"{topic} profesyonel tavsiye",
-        f'"{topic}" CEO açıklama'
-    ]
+    Returns:
+        {
+            "results": {katman: [sorgu sırasıyla sonuç listeleri]},
+            "stopped": {katman: {"reason": saturated/enough, "saved": int}},
+            "timings": {"layers": {katman: saniye}, "total": saniye,
+                        "query_time_sum": saniye, "calls": int, "waves": int,
+                        "queries_run": int, "queries_saved": int},
+            "queries_run": {katman: çalıştırılan sorgu sayısı}
+        }
+    """
     
-    layer_results = []
-    for query in expert_queries:
-        results = web_search(query, num_results=5, language="tr")
-        layer_results.extend(results)
-        
-        # Alıntı çıkarma
-        for r in results:
-            quotes = extract_quotes(r.get("snippet", ""))
-            research_data["quotes"].extend(quotes)
-    
-    research_data["layers"]["expert"] = {
-        "category": RESEARCH_CATEGORIES["expert"],
-        "results": layer_results[:6],
-        "query_count": len(expert_queries)
+    layers = {layer["name"]: layer for layer in plan}
+    first_wave = RESEARCH_INITIAL_QUERIES if early_stop else None
+    
+    def layer_tasks(layer: Dict[str, Any], start: int, stop: Optional[int]) -> List[tuple]:
+        return [
+            (layer["name"], index, query, layer["search"])
+            for index, query in enumerate(layer["queries"][start:stop], start)
+        ]
+    
+    def make_units(tasks: List[tuple]) -> List[List[tuple]]:
+        """Aynı istekte gönderilecek sorgu grupları"""
+        if batch_mode == "request":
+            return [tasks] if tasks else []
+        if batch_mode == "layer":
+            grouped = {}
+            for task in tasks:
+                grouped.setdefault(task[0], []).append(task)
+            return list(grouped.values())
+        return [[task] for task in tasks]
+    
+    def run_unit(unit: List[tuple]) -> tuple:
+        started = time.perf_counter()
+        if batch_mode in ("layer", "request"):
+            unit_results = web_search_batch([
+                {"query": query, "num_results": 5, **search}
+                for _, _, query, search in unit
+            ], use_cached=use_cached)
+        else:
+            unit_results = [
+                web_search(query, num_results=5, use_cached=use_cached, **search)
+                for _, _, query, search in unit
+            ]
+        return unit_results, started, time.perf_counter()
+    
+    results = {layer["name"]: [[] for _ in layer["queries"]] for layer in plan}
+    spans = {layer["name"]: [] for layer in plan}
+    trackers = {
+        layer["name"]: SaturationTracker(math.ceil(layer["limit"] * RESEARCH_SATURATION_FACTOR),
+                                         RESEARCH_MIN_NEW_SOURCES)
+        for layer in plan
     }
-    
-    # ═══════════════════════════════════════════════════════
-    # KATMAN 5: VAKA ÇALIŞMALARI
-    # ═══════════════════════════════════════════════════════
-    
-    case_queries = [
-        f"{topic} başarı hikayesi",
-        f"{topic} örnek şirket",
-        f"{topic} vaka çalışması case study"
-    ]
-    
-    layer_results = []
-    for query in case_queries:
-        results = web_search(query, num_results=5, language="tr")
-        layer_results.extend(results)
-    
-    research_data["layers"]["cases"] = {
-        "category": RESEARCH_CATEGORIES["cases"],
-        "results": layer_results[:6],
-        "query_count": len(case_queries)
+    next_index = {layer["name"]: len(layer["queries"][:first_wave]) for layer in plan}
+    stopped = {}
+    unit_durations = []
+    calls = 0
+    waves = 0
+    queries_run = 0
+    
+    wave = [task for layer in plan for task in layer_tasks(layer, 0, first_wave)]
+    
+    pool_size = max_workers or get_provider("serper").concurrency.max_limit
+    
+    total_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, pool_size)) as executor:
+        while wave:
+            units = make_units(wave)
+            calls += len(units)
+            waves += 1
+            queries_run += len(wave)
+            
+            futures = {executor.submit(run_unit, unit): unit for unit in units}
+            for future in as_completed(futures):
+                unit = futures[future]
+                unit_results, started, finished = future.result()
+                unit_durations.append(finished - started)
+                for (name, index, _, _), query_results in zip(unit, unit_results):
+                    results[name][index] = query_results
+                    spans[name].append((started, finished))
+            
+            # Sorgu sırasıyla doygunluk kontrolü, devam eden katmanların kalan sorguları
+            for name, index, _, _ in sorted(wave, key=lambda task: (task[0], task[1])):
+                trackers[name].add(results[name][index])
+            
+            wave = []
+            for name, layer in layers.items():
+                remaining = len(layer["queries"]) - next_index[name]
+                if remaining <= 0 or name in stopped:
+                    continue
+                reason = trackers[name].reason()
+                if reason:
+                    stopped[name] = {"reason": reason, "saved": remaining}
+                    continue
+                # Kalan sorgular tek dalgada (sıralı turlar paralellik kazancını geri almasın)
+                wave.extend(layer_tasks(layer, next_index[name], len(layer["queries"])))
+                next_index[name] = len(layer["queries"])
+    total = time.perf_counter() - total_started
+    
+    timings = {
+        "layers": {
+            name: round(max(f for _, f in layer_spans) - min(s for s, _ in layer_spans), 3)
+            for name, layer_spans in spans.items() if layer_spans
+        },
+        "total": round(total, 3),
+        "query_time_sum": round(sum(unit_durations), 3),
+        "calls": calls,
+        "waves": waves,
+        "queries_run": queries_run,
+        "queries_saved": sum(stop["saved"] for stop in stopped.values())
     }
     
-    # ═══════════════════════════════════════════════════════
-    # KATMAN 6: GLOBAL KAYNAKLAR (İNGİLİZCE)
-    # ═══════════════════════════════════════════════════════
-    
-    # Türkçe konuyu İngilizceye çevir (basit yaklaşım)
-    topic_en = topic  # İleride çeviri API eklenebilir
-    
-    global_queries = [
-        f"{topic_en} statistics 2024",
-        f"{topic_en} trends research",
-        f"{topic_en} best practices"
-    ]
-    
-    layer_results = []
-    for query in global_queries:
-        results = web_search(query, num_results=5, language="en")
-        layer_results.extend(results)
-        
-        # İngilizce istatistikler
-        for r in results:
-            stats = extract_statistics(r.get("snippet", ""))
-            research_data["statistics"].extend(stats)
-    
-    research_data["layers"]["global"] = {
-        "category": RESEARCH_CATEGORIES["global"],
-        "results": layer_results[:6],
-        "query_count": len(global_queries)
-    }
+    return {"results": results, "stopped": stopped, "timings": timings, "queries_run": dict(next_index)}
+
+
+def deep_research(topic: str, format_type: str = "standard",
+                  max_workers: int = RESEARCH_MAX_WORKERS,
+                  snapshot: Optional[ResearchSnapshot] = None,
+                  refresh_stale: bool = True,
+                  depth: str = "deep") -> Dict[str, Any]:
+    """
+    7 katmanlı derinlemesine araştırma sistemi
     
-    # ═══════════════════════════════════════════════════════
-    # KATMAN 7: SSS & SORUNLAR
-    # ═══════════════════════════════════════════════════════
+    Tüm katmanların sorguları eş zamanlı çalışır (serper eş zamanlılık sınırıyla),
+    sonuçlar plan sırasına göre birleştirilir. depth hangi katmanların ve
+    kaç sorgunun çalışacağını belirler (RESEARCH_DEPTH_CONFIG).
     
-    faq_queries = [
-        f"{topic} sık sorulan sorular",
-        f"{topic} sorunları çözümleri",
-        f"{topic} nasıl yapılır"
-    ]
+    snapshot verilirse yalnızca eksik veya bayat süresi de dolmuş katmanlar
+    beklenerek aranır; yeni çekilen katmanlar snapshot'a yazılır. Bayat
+    katmanlar hemen kullanılır, refresh_stale ise arka planda yenilenir.
     
-    layer_results = []
-    for query in faq_queries:
-        results = web_search(query, num_results=5, language="tr")
-        layer_results.extend(results)
+    Returns:
+        {
+            "layers": {...},
+            "statistics": [...],
+            "quotes": [...],
+            "sources_count": int,
+            "depth": str,
+            "query_count": int (çalıştırılan sorgu),
+            "queries_planned": int,
+            "timings": {...},
+            "snapshot": {...} (snapshot verildiyse),
+            "compiled_research": str
+        }
+    """
     
-    research_data["layers"]["faq"] = {
-        "category": RESEARCH_CATEGORIES["faq"],
-        "results": layer_results[:6],
-        "query_count": len(faq_queries)
+    research_data = {
+        "layers": {},
+        "statistics": [],
+        "quotes": [],
+        "sources": [],
+        "sources_count": 0
     }
     
-    # ═══════════════════════════════════════════════════════
-    # FORMAT BAZLI EK ARAŞTIRMA
-    # ═══════════════════════════════════════════════════════
-    
-    format_extra_queries = {
-        "listicle": [f"{topic} en iyi yolları", f"{topic} ipuçları listesi"],
-        "howto": [f"{topic} adım adım rehber", f"{topic} başlangıç kılavuzu"],
-        "comparison": [f"{topic} karşılaştırma", f"{topic} alternatifleri vs"],
-        "casestudy": [f"{topic} ROI sonuçlar", f"{topic} dönüşüm metrikleri"]
-    }
+    plan = build_research_plan(topic, format_type, depth)
+    
+    fetch_plan = plan
+    stale_plan = []
+    if snapshot is not None:
+        fetch_plan = [layer for layer in plan if not snapshot.is_usable(layer)]
+        if refresh_stale:
+            stale_plan = [layer for layer in plan if snapshot.is_usable(layer) and not snapshot.is_fresh(layer)]
+    execution = run_research_plan(fetch_plan, max_workers=max_workers)
+    
+    # Stale-while-revalidate: bayat katmanlar arka planda, önbelleği atlayarak aranır
+    if stale_plan:
+        schedule_snapshot_refresh(
+            topic, stale_plan,
+            lambda layers: run_research_plan(layers, max_workers=max_workers, use_cached=False)
+        )
     
-    if format_type in format_extra_queries:
-        extra_results = []
-        for query in format_extra_queries[format_type]:
-            results = web_search(query, num_results=5, language="tr")
-            extra_results.extend(results)
+    # Yeni çekilen katmanlar snapshot'a yazılır; arama boş dönerse eski sonuçlar kullanılır
+    raw_results = {}
+    for layer in plan:
+        fetched = execution["results"].get(layer["name"])
+        if fetched is not None and snapshot is not None:
+            snapshot.put_results(layer, fetched)
+        if fetched is not None and (any(fetched) or snapshot is None or snapshot.age(layer) is None):
+            raw_results[layer["name"]] = fetched
+        else:
+            raw_results[layer["name"]] = snapshot.get_results(layer)
+    
+    # Katmanlar arası tekilleştirme: aynı URL ve benzer snippet'ler bir kez girer
+    deduplicator = ResearchDeduplicator()
+    
+    for layer in plan:
+        layer_results = []
+        for results in raw_results[layer["name"]]:
+            layer_results.extend(results)
+            
+            # İstatistik ve alıntı çıkarma (snippet başına tek tarama)
+            if layer["extract"]:
+                for r in results:
+                    stats, quotes = DEFAULT_EXTRACTOR.scan(r.snippet)
+                    if "statistics" in layer["extract"]:
+                        research_data["statistics"].extend(stats)
+                    if "quotes" in layer["extract"]:
+                        research_data["quotes"].extend(quotes)
         
-        research_data["layers"]["format_specific"] = {
-            "category": {"icon": "🎯", "name": f"{format_type.title()} Özel", "description": "Format bazlı araştırma"},
-            "results": extra_results[:6],
-            "query_count": len(format_extra_queries[format_type])
+        research_data["layers"][layer["name"]] = {
+            "category": layer["category"],
+            "results": deduplicator.filter(layer_results, limit=layer["limit"]),
+            # Çalıştırılan sorgu (erken durma / snapshot'tan gelen katmanda daha az)
+            "query_count": execution["queries_run"].get(layer["name"], 0),
+            "queries_planned": len(layer["queries"])
+        }
+    
+    research_data["depth"] = depth
+    research_data["query_count"] = execution["timings"]["queries_run"]
+    research_data["queries_planned"] = sum(len(layer["queries"]) for layer in plan)
+    research_data["timings"] = execution["timings"]
+    research_data["early_stop"] = execution["stopped"]
+    research_data["dedup"] = deduplicator.stats
+    
+    if snapshot is not None:
+        fetched = {layer["name"] for layer in fetch_plan}
+        research_data["snapshot"] = {
+            "revision": snapshot.revision,
+            "refreshed_layers": [layer["name"] for layer in plan if layer["name"] in fetched],
+            "reused_layers": [layer["name"] for layer in plan if layer["name"] not in fetched],
+            "revalidating_layers": [layer["name"] for layer in stale_plan],
+            "layer_age": {layer["name"]: snapshot.age(layer) for layer in plan if layer["name"] not in fetched}
         }
     
     # ═══════════════════════════════════════════════════════
     # SONUÇLARI DERLİME
     # ═══════════════════════════════════════════════════════
     
-    # Toplam kaynak sayısı
+    # Toplam kaynak sayısı ve benzersiz siteler (sıra korunur)
     total_sources = 0
+    sources = {}
     for layer_name, layer_data in research_data["layers"].items():
         total_sources += len(layer_data["results"])
         for result in layer_data["results"]:
-            if result.get("source") and result["source"] not in research_data["sources"]:
-                research_data["sources"].append(result["source"])
+            if result.source:
+                sources.setdefault(result.source, None)
     
+    research_data["sources"] = list(sources)
     research_data["sources_count"] = total_sources
     
-    # İstatistikleri benzersizleştir
-    research_data["statistics"] = list(set(research_data["statistics"]))[:15]
+    # İstatistikleri benzersizleştir (ilk görülme sırası)
+    research_data["statistics"] = unique(research_data["statistics"])[:15]
     
-    # Alıntıları benzersizleştir
-    research_data["quotes"] = list(set(research_data["quotes"]))[:8]
+    # Alıntıları benzersizleştir (ilk görülme sırası)
+    research_data["quotes"] = unique(research_data["quotes"])[:8]
     
     # Derlenmiş araştırma metni oluştur
     research_data["compiled_research"] = compile_research_text(research_data)
@@ -609,11 +914,11 @@ def compile_research_text(research_data: Dict) -> str:
             sections.append(f"*{category['description']}*\n")
             
             for r in results[:5]:
-                title = r.get("title", "")
-                snippet = r.get("snippet", "")
-                link = r.get("link", "")
-                source = r.get("source", "")
-                date = r.get("date", "")
+                title = r.title
+                snippet = r.snippet
+                link = r.link
+                source = r.source
+                date = r.date
                 
                 if title and snippet:
                     sections.append(f"**{title}**")
@@ -661,11 +966,21 @@ TONE_CONFIG = {
 }
 
 LENGTH_CONFIG = {
-    "short": {"words": "800-1000", "sections": 4},
-    "medium": {"words": "1500-1800", "sections": 6},
-    "long": {"words": "2500-3000", "sections": 8}
+    "short": {"words": "800-1000", "sections": 4, "research_tokens": 1000, "research_depth": "quick"},
+    "medium": {"words": "1500-1800", "sections": 6, "research_tokens": 1500, "research_depth": "standard"},
+    "long": {"words": "2500-3000", "sections": 8, "research_tokens": 2200, "research_depth": "deep"}
+}
+
+# Araştırma derinliği: çalışacak katmanlar (None = hepsi) ve katman başına sorgu sayısı
+RESEARCH_DEPTH_CONFIG = {
+    "quick": {"name": "Hızlı", "layers": ["general", "statistics", "news", "expert", "faq"], "queries_per_layer": 2},
+    "standard": {"name": "Standart", "layers": ["general", "statistics", "news", "expert", "cases", "faq"], "queries_per_layer": 3},
+    "deep": {"name": "Derin", "layers": None, "queries_per_layer": None}
 }
 
+# Plan başına izin verilen en derin profil
+PLAN_RESEARCH_DEPTH = {"free": "standard", "pro": "deep"}
+
 FORMAT_CONFIG = {
     "standard": {"name": "Standart Blog", "description": "Klasik blog yazısı", "icon": "📝"},
     "listicle": {"name": "Listicle", "description": "\"10 Yol\" formatı", "icon": "📋"},
@@ -680,7 +995,7 @@ FORMAT_CONFIG = {
 # ============================================================
 
 def call_llm(client: Groq, system: str, user: str, temp: float = 0.7) -> str:
-    response = client.chat.completions.create(
+    response = get_provider("groq").call(lambda: client.chat.completions.create(
         model=DEFAULT_MODEL,
         messages=[
             {"role": "system", "content": system},
@@ -688,7 +1003,7 @@ def call_llm(client: Groq, system: str, user: str, temp: float = 0.7) -> str:
         ],
         temperature=temp,
         max_tokens=6000,
-    )
+    ))
     return response.choices[0].message.content
 
 
@@ -757,7 +1072,7 @@ Highlight kutuları, bilgi kutuları ve çağrı kutularını kullan."""
     user = f"""KONU: {topic}
 
 ARAŞTIRMA VERİLERİ:
-{research[:6000]}
+{research}
 
 Bu verileri kullanarak profesyonel, veri destekli blog yazısı yaz. Her iddiayı araştırma verileriyle destekle."""
 
@@ -771,6 +1086,7 @@ def write_listicle(client: Groq, topic: str, research: str, images: Dict,
     list_count = {"short": 5, "medium": 7, "long": 10}[length]
     image_md = _format_images(images)
     stats_md = _format_statistics(statistics or [])
+    quotes_md = _format_quotes(quotes or [])
     
     system = f"""Sen listicle uzmanısın. "{list_count} Yol/Strateji/İpucu" formatında yaz.
 
@@ -786,12 +1102,15 @@ HER MADDE İÇİN:
 KULLANILACAK İSTATİSTİKLER:
 {stats_md}
 
+KULLANILACAK ALINTILAR:
+{quotes_md}
+
 GÖRSELLER: {image_md}"""
 
     user = f"""KONU: {topic}
 
 ARAŞTIRMA:
-{research[:5000]}
+{research}
 
 Her maddede araştırmadan veri kullan."""
 
@@ -804,6 +1123,8 @@ def write_howto(client: Groq, topic: str, research: str, images: Dict,
     lng = LENGTH_CONFIG[length]
     step_count = {"short": 5, "medium": 7, "long": 10}[length]
     image_md = _format_images(images)
+    stats_md = _format_statistics(statistics or [])
+    quotes_md = _format_quotes(quotes or [])
     
     system = f"""Sen teknik rehber yazarısın. Adım adım uygulama rehberi yaz.
 
@@ -821,12 +1142,18 @@ EKSTRA BÖLÜMLER:
 - Sık yapılan hatalar (sonda)
 - Sorun giderme bölümü
 
+KULLANILACAK VERİLER (uygun adımlarda kaynakla kullan):
+{stats_md}
+
+KULLANILACAK ALINTILAR:
+{quotes_md}
+
 GÖRSELLER: {image_md}"""
 
     user = f"""KONU: {topic}
 
 ARAŞTIRMA:
-{research[:5000]}
+{research}
 
 Pratik, uygulanabilir rehber yaz."""
 
@@ -839,6 +1166,7 @@ def write_comparison(client: Groq, topic: str, research: str, images: Dict,
     lng = LENGTH_CONFIG[length]
     image_md = _format_images(images)
     stats_md = _format_statistics(statistics or [])
+    quotes_md = _format_quotes(quotes or [])
     
     system = f"""Sen karşılaştırma analisti yazarısın. Detaylı X vs Y analizi yaz.
 
@@ -855,12 +1183,15 @@ YAPI:
 KULLANILACAK VERİLER:
 {stats_md}
 
+KULLANILACAK ALINTILAR:
+{quotes_md}
+
 GÖRSELLER: {image_md}"""
 
     user = f"""KONU: {topic}
 
 ARAŞTIRMA:
-{research[:5000]}
+{research}
 
 Objektif, veri destekli karşılaştırma yaz."""
 
@@ -899,7 +1230,7 @@ GÖRSELLER: {image_md}"""
     user = f"""KONU: {topic}
 
 ARAŞTIRMA:
-{research[:5000]}
+{research}
 
 Gerçekçi, veri destekli vaka çalışması yaz."""
 
@@ -1070,117 +1401,118 @@ def calculate_overall_quality(readability, seo, fact, originality) -> Dict:
 # STREAMING PIPELINE
 # ============================================================
 
+def restore_research(research_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Checkpoint'ten okunan araştırmanın sonuçlarını SearchResult'a çevirir"""
+    if research_data:
+        for layer in research_data["layers"].values():
+            layer["results"] = [SearchResult.from_dict(r) for r in layer["results"]]
+    return research_data
+
+
 def run_blog_pipeline_streaming(
     topic: str,
     audience: str = "general",
     tone: str = "friendly",
     length: str = "medium",
-    format_type: str = "standard"
+    format_type: str = "standard",
+    reuse_research: bool = True,
+    refresh_stale: bool = True,
+    research_depth: Optional[str] = None,
+    user_plan: str = "free",
+    checkpoint_id: Optional[str] = None
 ) -> Generator[Dict[str, Any], None, None]:
     """
     Streaming blog pipeline - Her aşamada event döndürür
+    
+    Aşamalar StageGraph ile çalışır: araştırma ve görsel paralel, yazar ikisini
+    bekler; kalite analizi ve bölüm görselleri editörden sonra paralel.
+    
+    reuse_research: Konunun araştırma snapshot'ı varsa kullanılır
+    refresh_stale: Snapshot'taki bayat katmanlar kullanılır ve arka planda
+        yenilenir (False ise yenilenmez)
+    research_depth: quick/standard/deep (None ise uzunluk ve plana göre)
+    user_plan: Kullanıcı planı (free/pro), izin verilen en derin araştırma
+    checkpoint_id: Verilirse tamamlanan aşamalar kaydedilir; aynı id ile tekrar
+        denenince kayıtlı aşamalar atlanır (bkz. agents/checkpoints.py)
     """
     
     client = Groq()
     format_info = FORMAT_CONFIG.get(format_type, FORMAT_CONFIG["standard"])
-    
-    results = {
-        "topic": topic,
-        "format": format_type,
-        "research": "",
-        "research_data": None,
-        "images": {},
-        "draft": "",
-        "final": "",
-        "quality": None,
-    }
-    
-    total_steps = 5
+    length_info = LENGTH_CONFIG.get(length, LENGTH_CONFIG["medium"])
+    depth = resolve_research_depth(length, user_plan, research_depth)
+    curator = get_image_curator()
+    checkpoints = StageCheckpoints(checkpoint_id, {
+        "topic": topic, "audience": audience, "tone": tone, "length": length,
+        "format_type": format_type, "depth": depth
+    })
+    
+    # Aşamalar bağımlılıklarıyla tanımlanır; bağımsız olanlar (araştırma ∥ görsel,
+    # kalite ∥ bölüm görselleri) eş zamanlı çalışır, event'ler yine adım sırasıyla gelir.
+    # Her aşamanın sonucu ctx[aşama adı]'na yazılır.
     
     # ═══════════════════════════════════════════════════════
     # AGENT 1: DERİN ARAŞTIRMACI
     # ═══════════════════════════════════════════════════════
     
-    yield {
-        "type": "agent_start",
-        "agent": AGENTS["researcher"],
-        "step": 1,
-        "total_steps": total_steps,
-        "message": "7 katmanlı derin araştırma başlatılıyor..."
-    }
+    def research(ctx: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not SERPER_API_KEY:
+            return None
+        
+        # Araştırma snapshot'ı: aynı konu farklı formatta yeniden aranmaz
+        snapshot_store = get_snapshot_store()
+        snapshot = None
+        if snapshot_store:
+            snapshot = snapshot_store.load(topic) if reuse_research else None
+            snapshot = snapshot or ResearchSnapshot(topic)
+        
+        research_data = deep_research(topic, format_type, snapshot=snapshot,
+                                      refresh_stale=refresh_stale, depth=depth)
+        
+        if snapshot_store and research_data["snapshot"]["refreshed_layers"]:
+            research_data["snapshot"]["revision"] = snapshot_store.save(snapshot)
+        
+        return research_data
     
-    if SERPER_API_KEY:
-        research_data = deep_research(topic, format_type)
-        results["research"] = research_data["compiled_research"]
-        results["research_data"] = research_data
+    def research_complete(ctx: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        research_data = ctx["research"]
+        if not research_data:
+            return "Araştırma atlandı (API key yok)", {"sources_found": 0}
         
-        yield {
-            "type": "agent_complete",
-            "agent": AGENTS["researcher"],
-            "step": 1,
-            "total_steps": total_steps,
-            "message": f"{research_data['sources_count']} kaynak, {len(research_data['statistics'])} istatistik bulundu",
-            "data": {
-                "sources_found": research_data["sources_count"],
-                "statistics_count": len(research_data["statistics"]),
-                "quotes_count": len(research_data["quotes"]),
-                "layers": list(research_data["layers"].keys())
-            }
-        }
-    else:
-        yield {
-            "type": "agent_complete",
-            "agent": AGENTS["researcher"],
-            "step": 1,
-            "total_steps": total_steps,
-            "message": "Araştırma atlandı (API key yok)",
-            "data": {"sources_found": 0}
+        return f"{research_data['sources_count']} kaynak, {len(research_data['statistics'])} istatistik bulundu", {
+            "sources_found": research_data["sources_count"],
+            "statistics_count": len(research_data["statistics"]),
+            "quotes_count": len(research_data["quotes"]),
+            "layers": list(research_data["layers"].keys()),
+            "depth": depth,
+            "query_count": research_data["query_count"],
+            "queries_planned": research_data["queries_planned"],
+            "queries_saved": research_data["timings"]["queries_saved"],
+            "stopped_layers": research_data["early_stop"],
+            "timings": research_data["timings"],
+            "snapshot": research_data.get("snapshot"),
+            "top_sources": [
+                layer["results"][0] for layer in research_data["layers"].values()
+                if layer["results"]
+            ]
         }
     
     # ═══════════════════════════════════════════════════════
-    # AGENT 2: GÖRSEL UZMANI
+    # AGENT 2: GÖRSEL UZMANI (araştırmayla paralel)
     # ═══════════════════════════════════════════════════════
     
-    yield {
-        "type": "agent_start",
-        "agent": AGENTS["visual_curator"],
-        "step": 2,
-        "total_steps": total_steps,
-        "message": "Görseller aranıyor..."
-    }
+    def images(ctx: Dict[str, Any]) -> Dict[str, Dict]:
+        # Bölüm görselleri final başlıkları belli olunca aranır (section_images)
+        return get_images_for_topic(topic) if UNSPLASH_ACCESS_KEY else {}
     
-    if UNSPLASH_ACCESS_KEY:
-        results["images"] = get_images_for_topic(topic, [topic])
-        yield {
-            "type": "agent_complete",
-            "agent": AGENTS["visual_curator"],
-            "step": 2,
-            "total_steps": total_steps,
-            "message": f"{len(results['images'])} görsel bulundu",
-            "data": {"images_found": len(results["images"])}
-        }
-    else:
-        yield {
-            "type": "agent_complete",
-            "agent": AGENTS["visual_curator"],
-            "step": 2,
-            "total_steps": total_steps,
-            "message": "Görsel arama atlandı",
-            "data": {"images_found": 0}
-        }
+    def images_complete(ctx: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        if not UNSPLASH_ACCESS_KEY:
+            return "Görsel arama atlandı", {"images_found": 0}
+        return f"{len(ctx['images'])} görsel bulundu", {"images_found": len(ctx["images"])}
     
     # ═══════════════════════════════════════════════════════
-    # AGENT 3: YAZAR
+    # AGENT 3: YAZAR (araştırma + görsel)
     # ═══════════════════════════════════════════════════════
     
-    yield {
-        "type": "agent_start",
-        "agent": AGENTS["writer"],
-        "step": 3,
-        "total_steps": total_steps,
-        "message": f"{format_info['name']} formatında veri destekli yazılıyor..."
-    }
-    
     format_writers = {
         "standard": write_standard,
         "listicle": write_listicle,
@@ -1189,105 +1521,134 @@ def run_blog_pipeline_streaming(
         "casestudy": write_casestudy,
     }
     
-    # İstatistik ve alıntıları al
-    statistics = []
-    quotes = []
-    if results["research_data"]:
-        statistics = results["research_data"].get("statistics", [])
-        quotes = results["research_data"].get("quotes", [])
-    
-    writer_func = format_writers.get(format_type, write_standard)
-    results["draft"] = writer_func(
-        client, topic, results["research"], results["images"],
-        audience, tone, length, statistics, quotes
-    )
-    
-    word_count = len(results["draft"].split())
+    def writer(ctx: Dict[str, Any]) -> str:
+        research_data = ctx["research"]
+        
+        # Yazara konuya en alakalı, bütçeye sığan bağlam gider
+        research_context = ""
+        statistics = []
+        quotes = []
+        if research_data:
+            research_context = pack_research(research_data, topic, length_info["research_tokens"])
+            statistics = research_data.get("statistics", [])
+            quotes = research_data.get("quotes", [])
+        
+        writer_func = format_writers.get(format_type, write_standard)
+        return writer_func(
+            client, topic, research_context, ctx["images"],
+            audience, tone, length, statistics, quotes
+        )
     
-    yield {
-        "type": "agent_complete",
-        "agent": AGENTS["writer"],
-        "step": 3,
-        "total_steps": total_steps,
-        "message": f"Taslak hazır ({word_count} kelime)",
-        "data": {"word_count": word_count}
-    }
+    def writer_complete(ctx: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        word_count = len(ctx["writer"].split())
+        return f"Taslak hazır ({word_count} kelime)", {"word_count": word_count}
     
     # ═══════════════════════════════════════════════════════
     # AGENT 4: EDITÖR
     # ═══════════════════════════════════════════════════════
     
-    yield {
-        "type": "agent_start",
-        "agent": AGENTS["editor"],
-        "step": 4,
-        "total_steps": total_steps,
-        "message": "Final düzenleme ve SEO optimizasyonu yapılıyor..."
-    }
-    
-    results["final"] = run_final_editor(client, results["draft"], topic, format_type)
-    
-    yield {
-        "type": "agent_complete",
-        "agent": AGENTS["editor"],
-        "step": 4,
-        "total_steps": total_steps,
-        "message": "Düzenleme tamamlandı",
-        "data": {}
-    }
+    def editor(ctx: Dict[str, Any]) -> str:
+        return run_final_editor(client, ctx["writer"], topic, format_type)
+    
+    def section_images(ctx: Dict[str, Any]) -> Dict[str, Dict]:
+        # Final başlıklarının görselleri kalite analiziyle paralel aranır
+        if not UNSPLASH_ACCESS_KEY:
+            return {}
+        hero = ctx["images"].get("hero")
+        try:
+            sections = curator.curate(topic, section_headings(ctx["editor"]), include_hero=False)
+        except Exception as e:
+            print(f"Bölüm görseli hatası: {e}")
+            return {}
+        return {section: image for section, image in sections.items()
+                if not hero or image["url"] != hero["url"]}
     
     # ═══════════════════════════════════════════════════════
     # AGENT 5: KALİTE ANALİSTİ
     # ═══════════════════════════════════════════════════════
     
-    yield {
-        "type": "agent_start",
-        "agent": AGENTS["quality_analyst"],
-        "step": 5,
-        "total_steps": total_steps,
-        "message": "Kalite analizi yapılıyor..."
-    }
+    def quality(ctx: Dict[str, Any]) -> Dict[str, Any]:
+        # Alt skorlar regex / sayım tabanlı CPU işi: thread'e bölmek (GIL) veya
+        # checkpoint'lemek kazanç sağlamaz, tek aşamada sırayla hesaplanır
+        content = ctx["editor"]
+        research_text = ctx["research"]["compiled_research"] if ctx["research"] else ""
+        readability = calculate_readability_score(content)
+        seo = calculate_seo_score(content, topic)
+        fact_check = calculate_fact_score(client, content, research_text)
+        originality = calculate_originality_score(client, content, topic)
+        return {
+            "overall": calculate_overall_quality(readability, seo, fact_check, originality),
+            "readability": readability,
+            "seo": seo,
+            "fact_check": fact_check,
+            "originality": originality
+        }
     
-    readability = calculate_readability_score(results["final"])
-    seo = calculate_seo_score(results["final"], topic)
-    fact = calculate_fact_score(client, results["final"], results["research"])
-    originality = calculate_originality_score(client, results["final"], topic)
-    overall = calculate_overall_quality(readability, seo, fact, originality)
-    
-    results["quality"] = {
-        "overall": overall,
-        "readability": readability,
-        "seo": seo,
-        "fact_check": fact,
-        "originality": originality
-    }
+    def quality_complete(ctx: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        overall = ctx["quality"]["overall"]
+        return f"Kalite skoru: {overall['score']}/100 ({overall['grade']})", {"quality": ctx["quality"]}
+    
+    # Dış servis çağıran aşamalar (Serper / Unsplash / Groq) checkpoint'lenir
+    graph = StageGraph(
+        stages=[
+            Stage("research", checkpoints.wrap("research", research, restore=restore_research)),
+            Stage("images", checkpoints.wrap("images", images)),
+            Stage("writer", checkpoints.wrap("writer", writer), deps=["research", "images"]),
+            Stage("editor", checkpoints.wrap("editor", editor), deps=["writer"]),
+            Stage("section_images", section_images, deps=["editor", "images"]),
+            Stage("quality", quality, deps=["editor", "research"]),
+        ],
+        steps=[
+            Step(1, AGENTS["researcher"], ["research"],
+                 f"{RESEARCH_DEPTH_CONFIG[depth]['name']} araştırma başlatılıyor...", research_complete),
+            Step(2, AGENTS["visual_curator"], ["images"],
+                 "Görseller aranıyor...", images_complete),
+            Step(3, AGENTS["writer"], ["writer"],
+                 f"{format_info['name']} formatında veri destekli yazılıyor...", writer_complete),
+            Step(4, AGENTS["editor"], ["editor"],
+                 "Final düzenleme ve SEO optimizasyonu yapılıyor...", lambda ctx: ("Düzenleme tamamlandı", {})),
+            Step(5, AGENTS["quality_analyst"], ["quality"],
+                 "Kalite analizi yapılıyor...", quality_complete),
+        ],
+        max_workers=PIPELINE_MAX_WORKERS
+    )
     
-    yield {
-        "type": "agent_complete",
-        "agent": AGENTS["quality_analyst"],
-        "step": 5,
-        "total_steps": total_steps,
-        "message": f"Kalite skoru: {overall['score']}/100 ({overall['grade']})",
-        "data": {"quality": results["quality"]}
-    }
+    ctx: Dict[str, Any] = {}
+    step_stages = {step.number: step.stages for step in graph.steps}
+    for event in graph.run(ctx):
+        # Checkpoint'li aşamalarının hepsi kayıttan gelen adım işaretlenir
+        if event["type"] == "agent_complete":
+            restored = [name for name in step_stages[event["step"]] if name in checkpoints.saved]
+            if restored and all(name in checkpoints.resumed for name in restored):
+                event["data"]["resumed"] = True
+        yield event
     
     # ═══════════════════════════════════════════════════════
     # FINAL
     # ═══════════════════════════════════════════════════════
     
+    final = insert_section_images(ctx["editor"], ctx["section_images"])
+    all_images = dict(ctx["images"])
+    all_images.update(ctx["section_images"])
+    research_data = ctx["research"]
+    
     yield {
         "type": "final",
         "message": "Blog tamamlandı!",
         "data": {
-            "content": results["final"],
-            "quality": results["quality"],
+            "content": final,
+            "quality": ctx["quality"],
             "format": format_type,
-            "word_count": len(results["final"].split()),
+            "word_count": len(final.split()),
+            "images": all_images,
             "research_stats": {
-                "sources": results["research_data"]["sources_count"] if results["research_data"] else 0,
-                "statistics": len(results["research_data"]["statistics"]) if results["research_data"] else 0,
-                "quotes": len(results["research_data"]["quotes"]) if results["research_data"] else 0
-            }
+                "sources": research_data["sources_count"] if research_data else 0,
+                "statistics": len(research_data["statistics"]) if research_data else 0,
+                "quotes": len(research_data["quotes"]) if research_data else 0,
+                "depth": depth
+            },
+            "stage_timings": graph.timings,
+            "resumed_stages": [name for name in graph.stages if name in checkpoints.resumed]
         }
     }
 
@@ -1302,12 +1663,19 @@ def run_blog_pipeline(
     tone: str = "friendly",
     length: str = "medium",
     format_type: str = "standard",
-    verbose: bool = True
+    verbose: bool = True,
+    reuse_research: bool = True,
+    refresh_stale: bool = True,
+    research_depth: Optional[str] = None,
+    user_plan: str = "free",
+    checkpoint_id: Optional[str] = None
 ) -> dict:
     """Normal (non-streaming) pipeline"""
     
     result = None
-    for event in run_blog_pipeline_streaming(topic, audience, tone, length, format_type):
+    for event in run_blog_pipeline_streaming(topic, audience, tone, length, format_type,
+                                             reuse_research, refresh_stale,
+                                             research_depth, user_plan, checkpoint_id):
         if verbose:
             if event["type"] == "agent_start":
                 print(f"\n{event['agent']['avatar']} {event['agent']['name']}: {event['message']}")
@@ -1325,6 +1693,102 @@ def run_blog_pipeline(
     return result
 
 
+# ============================================================
+# ASYNC PIPELINE (FastAPI)
+# ============================================================
+
+_STREAM_DONE = object()
+
+
+async def run_blog_pipeline_async_streaming(
+    topic: str,
+    audience: str = "general",
+    tone: str = "friendly",
+    length: str = "medium",
+    format_type: str = "standard",
+    reuse_research: bool = True,
+    refresh_stale: bool = True,
+    research_depth: Optional[str] = None,
+    user_plan: str = "free",
+    checkpoint_id: Optional[str] = None
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    run_blog_pipeline_streaming'in async karşılığı - aynı event'leri üretir
+    
+    Pipeline kendi thread'inde çalışır (aşamaları StageGraph havuzunda),
+    event'ler asyncio kuyruğuyla aktarılır; event loop hiçbir aşamada
+    bloklanmaz. Tüketici bırakırsa (ör. SSE bağlantısı koptu) pipeline
+    bir sonraki event'te durdurulur.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+    
+    def publish(item: Tuple[Any, Optional[BaseException]]):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # Event loop kapanmış
+            cancelled.set()
+    
+    def produce():
+        events = run_blog_pipeline_streaming(topic, audience, tone, length, format_type,
+                                             reuse_research, refresh_stale,
+                                             research_depth, user_plan, checkpoint_id)
+        try:
+            for event in events:
+                if cancelled.is_set():
+                    break
+                publish((event, None))
+        except Exception as e:
+            publish((None, e))
+        finally:
+            events.close()
+            publish((_STREAM_DONE, None))
+    
+    threading.Thread(target=produce, name="pipeline-stream", daemon=True).start()
+    
+    try:
+        while True:
+            event, error = await queue.get()
+            if error is not None:
+                raise error
+            if event is _STREAM_DONE:
+                break
+            yield event
+    finally:
+        cancelled.set()
+
+
+async def run_blog_pipeline_async(
+    topic: str,
+    audience: str = "general",
+    tone: str = "friendly",
+    length: str = "medium",
+    format_type: str = "standard",
+    reuse_research: bool = True,
+    refresh_stale: bool = True,
+    research_depth: Optional[str] = None,
+    user_plan: str = "free",
+    checkpoint_id: Optional[str] = None
+) -> Optional[dict]:
+    """run_blog_pipeline'ın async karşılığı (event loop'u bloklamaz)"""
+    
+    result = None
+    async for event in run_blog_pipeline_async_streaming(topic, audience, tone, length, format_type,
+                                                         reuse_research, refresh_stale,
+                                                         research_depth, user_plan, checkpoint_id):
+        if event["type"] == "final":
+            result = {
+                "topic": topic,
+                "format": format_type,
+                "final": event["data"]["content"],
+                "quality": event["data"]["quality"]
+            }
+    
+    return result
+
+
 def get_agents_info() -> Dict:
     """Agent bilgilerini döndür"""
     return AGENTS
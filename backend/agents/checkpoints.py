@@ -0,0 +1,315 @@
+"""
+ContentForge Stage Checkpoints
+Başarısız üretimin tamamlanan aşamalarından devam edilmesi
+
+Pipeline, checkpoint_id verilirse dış servis çağıran aşamaların (araştırma,
+görseller, taslak, final) çıktısını bitince kaydeder. Aynı id ile
+tekrar denendiğinde kayıtlı aşamalar yeniden çalıştırılmaz; ör. editör hata
+verdiyse yeniden denemede araştırma (Serper) ve taslak (Groq) atlanır.
+
+- Anahtar "<user_id>:<üretim id>"; başka kullanıcının kaydı okunamaz
+- Her kayıtta üretim parametrelerinin parmak izi tutulur; konu, format vb.
+  değiştiyse eski checkpoint'ler kullanılmaz
+- İçerik kaydedilince checkpoint'ler silinir, kalanlar CHECKPOINT_TTL sonra
+
+Depolama: CACHE_DIR altında SQLite (WAL), zlib ile sıkıştırılmış JSON.
+JOB_DATABASE_URL tanımlıysa Postgres (farklı makinedeki worker da devam edebilir).
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from config.settings import CACHE_DIR, CHECKPOINT_ENABLED, CHECKPOINT_TTL, JOB_DATABASE_URL
+from agents.search_result import to_jsonable
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+
+# Eviction kontrolü kaç yazmada bir yapılır
+EVICTION_CHECK_INTERVAL = 20
+
+
+def checkpoint_key(user_id: str, generation_id: str) -> str:
+    """Kullanıcıya ait checkpoint anahtarı"""
+    return f"{user_id}:{generation_id}"
+
+
+def params_fingerprint(params: Dict[str, Any]) -> str:
+    """Üretim parametrelerinin parmak izi (değişirse checkpoint geçersiz)"""
+    data = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def _encode(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False, default=to_jsonable).encode("utf-8"))
+
+
+def _decode(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+class CheckpointStore:
+    """SQLite tabanlı aşama checkpoint deposu"""
+
+    def __init__(self, path: str, ttl: int = CHECKPOINT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                checkpoint_key TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (checkpoint_key, stage)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints(created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Thread başına bir bağlantı"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, key: str, fingerprint: str) -> Dict[str, Any]:
+        """Anahtarın parmak izi tutan, süresi dolmamış checkpoint'leri (aşama -> çıktı)"""
+        try:
+            rows = self._connect().execute(
+                "SELECT stage, payload FROM checkpoints "
+                "WHERE checkpoint_key = ? AND fingerprint = ? AND created_at >= ?",
+                (key, fingerprint, time.time() - self.ttl)
+            ).fetchall()
+            return {stage: _decode(payload) for stage, payload in rows}
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            print(f"Checkpoint okuma hatası: {e}")
+            return {}
+
+    def save(self, key: str, stage: str, value: Any, fingerprint: str) -> bool:
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO checkpoints (checkpoint_key, stage, fingerprint, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, stage, fingerprint, _encode(value), time.time())
+            )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Checkpoint yazma hatası: {e}")
+            return False
+
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICTION_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+        return True
+
+    def delete(self, key: str) -> int:
+        """Üretimin tüm checkpoint'lerini siler (içerik kaydedildi)"""
+        try:
+            return self._connect().execute(
+                "DELETE FROM checkpoints WHERE checkpoint_key = ?", (key,)
+            ).rowcount
+        except sqlite3.Error as e:
+            print(f"Checkpoint silme hatası: {e}")
+            return 0
+
+    def evict(self) -> int:
+        """Süresi dolan checkpoint'leri siler"""
+        try:
+            return self._connect().execute(
+                "DELETE FROM checkpoints WHERE created_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+        except sqlite3.Error as e:
+            print(f"Checkpoint temizleme hatası: {e}")
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            entries, generations = self._connect().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT checkpoint_key) FROM checkpoints"
+            ).fetchone()
+        except sqlite3.Error:
+            entries = generations = None
+        return {"entries": entries, "generations": generations, "ttl": self.ttl}
+
+
+class PostgresCheckpointStore:
+    """Postgres checkpoint deposu (JOB_DATABASE_URL, çok makineli worker'lar)"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        checkpoint_key TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        payload BYTEA NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (checkpoint_key, stage)
+    );
+    CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints(created_at);
+    """
+
+    def __init__(self, dsn: str, ttl: int = CHECKPOINT_TTL):
+        if psycopg is None:
+            raise RuntimeError('JOB_DATABASE_URL için psycopg gerekli: pip install "psycopg[binary]"')
+
+        self.dsn = dsn
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        with self._connect().transaction():
+            self._connect().execute(self.SCHEMA)
+
+    def _connect(self) -> "psycopg.Connection":
+        """Thread başına bir bağlantı (autocommit)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            conn = psycopg.connect(self.dsn, autocommit=True)
+            self._local.conn = conn
+        return conn
+
+    def load(self, key: str, fingerprint: str) -> Dict[str, Any]:
+        try:
+            rows = self._connect().execute(
+                "SELECT stage, payload FROM checkpoints WHERE checkpoint_key = %s AND fingerprint = %s "
+                "AND created_at >= NOW() - make_interval(secs => %s)",
+                (key, fingerprint, self.ttl)
+            ).fetchall()
+            return {stage: _decode(payload) for stage, payload in rows}
+        except (psycopg.Error, zlib.error, ValueError) as e:
+            print(f"Checkpoint okuma hatası: {e}")
+            return {}
+
+    def save(self, key: str, stage: str, value: Any, fingerprint: str) -> bool:
+        try:
+            self._connect().execute(
+                "INSERT INTO checkpoints (checkpoint_key, stage, fingerprint, payload) VALUES (%s, %s, %s, %s) "
+                "ON CONFLICT (checkpoint_key, stage) DO UPDATE SET fingerprint = EXCLUDED.fingerprint, "
+                "payload = EXCLUDED.payload, created_at = NOW()",
+                (key, stage, fingerprint, _encode(value))
+            )
+        except (psycopg.Error, TypeError, ValueError) as e:
+            print(f"Checkpoint yazma hatası: {e}")
+            return False
+
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICTION_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+        return True
+
+    def delete(self, key: str) -> int:
+        try:
+            return self._connect().execute(
+                "DELETE FROM checkpoints WHERE checkpoint_key = %s", (key,)
+            ).rowcount
+        except psycopg.Error as e:
+            print(f"Checkpoint silme hatası: {e}")
+            return 0
+
+    def evict(self) -> int:
+        try:
+            return self._connect().execute(
+                "DELETE FROM checkpoints WHERE created_at < NOW() - make_interval(secs => %s)", (self.ttl,)
+            ).rowcount
+        except psycopg.Error as e:
+            print(f"Checkpoint temizleme hatası: {e}")
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            entries, generations = self._connect().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT checkpoint_key) FROM checkpoints"
+            ).fetchone()
+        except psycopg.Error:
+            entries = generations = None
+        return {"entries": entries, "generations": generations, "ttl": self.ttl}
+
+
+class StageCheckpoints:
+    """
+    Tek üretimin checkpoint'leri (pipeline içinde)
+
+    wrap() ile sarılan aşama, kaydı varsa çalıştırılmaz; yoksa çalışır ve
+    çıktısı kaydedilir. Depo yoksa (devre dışı) veya anahtar verilmediyse
+    aşamalar olduğu gibi çalışır.
+    """
+
+    def __init__(self, key: Optional[str], params: Dict[str, Any]):
+        self.store = get_checkpoint_store() if key else None
+        self.key = key
+        self.fingerprint = params_fingerprint(params)
+        self.saved = self.store.load(key, self.fingerprint) if self.store else {}
+        self.resumed: List[str] = []
+
+    def wrap(self, name: str, fn: Callable[[Dict[str, Any]], Any],
+             restore: Optional[Callable[[Any], Any]] = None) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Args:
+            restore: Kayıtlı JSON'u aşamanın çıktı tipine çeviren fonksiyon
+        """
+        def run(ctx: Dict[str, Any]) -> Any:
+            if name in self.saved:
+                self.resumed.append(name)
+                value = self.saved[name]
+                return restore(value) if restore else value
+
+            value = fn(ctx)
+            if self.store:
+                self.store.save(self.key, name, value, self.fingerprint)
+            return value
+
+        return run
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store():
+    """Checkpoint store singleton (JOB_DATABASE_URL varsa Postgres, devre dışıysa None)"""
+    global _store
+
+    if not CHECKPOINT_ENABLED:
+        return None
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if JOB_DATABASE_URL:
+                    _store = PostgresCheckpointStore(JOB_DATABASE_URL)
+                else:
+                    _store = CheckpointStore(os.path.join(CACHE_DIR, "checkpoints.sqlite3"))
+
+    return _store
+
+
+def delete_checkpoints(key: Optional[str]) -> int:
+    """İçerik kaydedildikten sonra üretimin checkpoint'lerini siler"""
+    store = get_checkpoint_store()
+    if not store or not key:
+        return 0
+    return store.delete(key)
@@ -0,0 +1,161 @@
+"""
+ContentForge Extractors
+Snippet'lerden istatistik ve alıntı çıkarıcı
+
+Tüm kalıplar tek bir derlenmiş regex'te birleşir; her snippet bir kez
+taranır. Sonuçlar ilk görülme sırasıyla tekilleştirilir (deterministik).
+
+Mikro benchmark:
+    python -m agents.extractors
+"""
+
+import re
+import time
+import random
+from typing import Dict, Iterable, List, Tuple
+
+
+MAX_STATS_PER_TEXT = 10
+MAX_QUOTES_PER_TEXT = 5
+
+# Alıntılar lookahead ile yakalanır; içlerindeki istatistikler de aynı taramada bulunur
+_PATTERN = re.compile(
+    r"(?=[\d\$€₺%\"'«])(?:"
+    r"(?P<money>[\$€₺]\s*\d+[\.,]?\d*(?:\s*(?:milyon|milyar|bin|K|M|B)\b)?)"
+    r"|(?P<year>20\d{2}\s*[-–]\s*20\d{2}|20\d{2}\s+yılında)"
+    r"|(?P<percent>%\s*\d+[\.,]?\d*|\d+[\.,]?\d*\s*%)"
+    r"|(?P<big>\d+[\.,]?\d*\s*(?:milyon|milyar|trilyon|million|billion|trillion))"
+    r'|(?=(?P<dq>"(?P<dq_text>[^"]{20,200})"))'
+    r"|(?=(?P<sq>'(?P<sq_text>[^']{20,200})'))"
+    r"|(?=(?P<gq>«(?P<gq_text>[^»]{20,200})»)))",
+    re.IGNORECASE
+)
+
+_STAT_FORMATS = {
+    "money": "💵 {}",
+    "year": "📅 {}",
+    "percent": "📈 {}",
+    "big": "💰 {}",
+}
+
+_QUOTE_GROUPS = (("dq", "dq_text"), ("sq", "sq_text"), ("gq", "gq_text"))
+
+
+def unique(items: Iterable[str]) -> List[str]:
+    """Sırayı koruyarak tekilleştirir"""
+    return list(dict.fromkeys(items))
+
+
+class ResearchExtractor:
+    """Tek geçişte istatistik + alıntı çıkarıcı"""
+
+    def __init__(self, max_stats: int = MAX_STATS_PER_TEXT, max_quotes: int = MAX_QUOTES_PER_TEXT):
+        self.max_stats = max_stats
+        self.max_quotes = max_quotes
+
+    def scan(self, text: str) -> Tuple[List[str], List[str]]:
+        """Metni bir kez tarar, (istatistikler, alıntılar) döndürür"""
+        stats = {}
+        quotes = {}
+        quote_end = 0
+
+        if not text:
+            return [], []
+
+        for match in _PATTERN.finditer(text):
+            kind = match.lastgroup
+            if kind in _STAT_FORMATS:
+                stats.setdefault(_STAT_FORMATS[kind].format(match.group(kind).strip()), None)
+                continue
+
+            # Alıntılar birbiriyle çakışmaz (kapanış tırnağı yeni alıntı başlatmaz)
+            for group, text_group in _QUOTE_GROUPS:
+                if match.group(group) is not None:
+                    if match.start() >= quote_end:
+                        quotes.setdefault(f'💬 "{match.group(text_group)}"', None)
+                        quote_end = match.start() + len(match.group(group))
+                    break
+
+        return list(stats)[:self.max_stats], list(quotes)[:self.max_quotes]
+
+    def extract_statistics(self, text: str) -> List[str]:
+        return self.scan(text)[0]
+
+    def extract_quotes(self, text: str) -> List[str]:
+        return self.scan(text)[1]
+
+
+DEFAULT_EXTRACTOR = ResearchExtractor()
+
+
+# ============================================================
+# MİKRO BENCHMARK
+# ============================================================
+
+def _legacy_scan(text: str) -> Tuple[List[str], List[str]]:
+    """Eski çok geçişli uygulama (karşılaştırma için)"""
+    stats = []
+    percentages = re.findall(r'%\s*\d+[\.,]?\d*|\d+[\.,]?\d*\s*%', text)
+    stats.extend([f"📈 {p.strip()}" for p in percentages])
+    big_numbers = re.findall(r'\d+[\.,]?\d*\s*(milyon|milyar|trilyon|million|billion|trillion)', text, re.IGNORECASE)
+    stats.extend([f"💰 {n}" for n in big_numbers])
+    re.findall(r'[\$€₺]\s*\d+[\.,]?\d*\s*(milyon|milyar|bin|K|M|B)?', text, re.IGNORECASE)
+    year_data = re.findall(r'20\d{2}\s*[-–]\s*20\d{2}|20\d{2}\s+yılında', text)
+    stats.extend([f"📅 {y}" for y in year_data])
+
+    quoted = re.findall(r'"([^"]{20,200})"', text)
+    quoted += re.findall(r"'([^']{20,200})'", text)
+    quoted += re.findall(r'«([^»]{20,200})»', text)
+    return list(set(stats))[:10], [f'💬 "{q}"' for q in quoted[:5]]
+
+
+def _sample_snippets(count: int, seed: int = 42) -> List[str]:
+    rnd = random.Random(seed)
+    parts = [
+        "Pazar {y} yılında %{p} büyüdü",
+        "toplam {n} milyar dolar yatırım",
+        "gelir ${n} milyon seviyesine ulaştı",
+        "{y}-{y2} döneminde kullanıcı sayısı {n} milyon",
+        '"Bu teknoloji sektörün geleceğini tamamen değiştirecek" dedi',
+        "«Yapay zeka yatırımları önümüzdeki yıllarda hızlanacak»",
+        "uzmanlar büyümenin süreceğini öngörüyor",
+        "ankete katılanların {p}% oranı memnun",
+    ]
+    snippets = []
+    for _ in range(count):
+        words = rnd.sample(parts, k=4)
+        snippets.append(". ".join(w.format(
+            y=rnd.randint(2015, 2025), y2=rnd.randint(2026, 2030),
+            p=rnd.randint(1, 99), n=rnd.randint(1, 900)
+        ) for w in words))
+    return snippets
+
+
+def benchmark(count: int = 5000, repeat: int = 3) -> Dict[str, float]:
+    """Eski ve yeni çıkarıcıyı aynı snippet'ler üzerinde karşılaştırır"""
+    snippets = _sample_snippets(count)
+    extractor = ResearchExtractor()
+
+    def measure(fn) -> Tuple[float, int]:
+        best, found = None, 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            found = sum(len(s) + len(q) for s, q in map(fn, snippets))
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, found
+
+    legacy_time, legacy_found = measure(_legacy_scan)
+    new_time, new_found = measure(extractor.scan)
+    return {
+        "snippets": count,
+        "legacy_ms": round(legacy_time * 1000, 1),
+        "single_pass_ms": round(new_time * 1000, 1),
+        "speedup": round(legacy_time / new_time, 2) if new_time else 0.0,
+        "legacy_items": legacy_found,
+        "single_pass_items": new_found,
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark())
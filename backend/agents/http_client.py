@@ -0,0 +1,123 @@
+"""
+ContentForge HTTP Client
+Agent'ların tüm dış HTTP çağrıları için ortak bağlantı havuzu
+
+- Host başına keep-alive bağlantı havuzu (Serper, Unsplash, ...)
+- Host bazlı bağlantı sınırı (HTTP_HOST_LIMITS)
+- Bağlantı/okuma hatalarında otomatik tekrar deneme (POST yalnızca bağlantı
+  kurulamadıysa tekrar denenir; Serper sorgusu iki kez ücretlendirilmesin)
+- Bağlantı yeniden kullanım sayaçları
+"""
+
+import threading
+from typing import Dict, Any
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.settings import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_MAX_RETRIES,
+    HTTP_HOST_LIMITS,
+)
+
+
+def _parse_host_limits(raw: str) -> Dict[str, int]:
+    """'google.serper.dev=16,api.unsplash.com=4' -> {host: limit}"""
+    limits = {}
+    for item in raw.split(","):
+        host, _, limit = item.strip().partition("=")
+        if host and limit.strip().isdigit():
+            limits[host.strip()] = int(limit)
+    return limits
+
+
+def _make_adapter(pool_maxsize: int, block: bool = False) -> HTTPAdapter:
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=HTTP_MAX_RETRIES,
+        status=HTTP_MAX_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        # Okuma hatası ve 5xx tekrarları yalnızca idempotent GET için; bağlantı
+        # hataları (istek hiç gitmedi) urllib3'te her metotta tekrar denenir
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    return HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize,
+        pool_block=block,
+        max_retries=retry,
+    )
+
+
+# Tüm thread'lerin paylaştığı adapter'lar (bağlantı havuzları bunların içinde)
+_default_adapter = _make_adapter(HTTP_POOL_MAXSIZE)
+_host_adapters = {
+    host: _make_adapter(limit, block=True)
+    for host, limit in _parse_host_limits(HTTP_HOST_LIMITS).items()
+}
+
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """
+    Thread'e özel Session döndürür
+
+    Session'lar ayrı, adapter'lar ortaktır; böylece havuzlar paylaşılır
+    ama cookie/header durumu thread'ler arasında karışmaz.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", _default_adapter)
+        session.mount("http://", _default_adapter)
+        for host, adapter in _host_adapters.items():
+            session.mount(f"https://{host}", adapter)
+            session.mount(f"http://{host}", adapter)
+        _local.session = session
+    return session
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """Ortak havuz üzerinden GET"""
+    return get_session().get(url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """Ortak havuz üzerinden POST"""
+    return get_session().post(url, **kwargs)
+
+
+def get_http_stats() -> Dict[str, Any]:
+    """
+    Host başına açılan bağlantı ve gönderilen istek sayıları
+
+    reused = istek sayısı - açılan bağlantı sayısı
+    """
+    hosts = {}
+    for adapter in [_default_adapter, *_host_adapters.values()]:
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats = hosts.setdefault(pool.host, {"connections": 0, "requests": 0})
+            stats["connections"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+
+    for stats in hosts.values():
+        stats["reused"] = max(0, stats["requests"] - stats["connections"])
+
+    total_requests = sum(s["requests"] for s in hosts.values())
+    total_reused = sum(s["reused"] for s in hosts.values())
+    return {
+        "hosts": hosts,
+        "requests": total_requests,
+        "reused": total_reused,
+        "reuse_rate": round(total_reused / total_requests, 3) if total_requests else 0.0,
+        "host_limits": {host: a._pool_maxsize for host, a in _host_adapters.items()},
+    }
@@ -0,0 +1,194 @@
+"""
+ContentForge Image Curator
+Unsplash görsel seçimi: tekilleştirilmiş, eş zamanlı ve önbellekli
+
+- Sorgular normalize edilir (normalize_query); aynı sorgu bir kez aranır
+- Hero ve bölüm sorguları eş zamanlı çalışır (en fazla IMAGE_MAX_WORKERS)
+- Sonuçlar normalize sorguya göre IMAGE_CACHE_TTL süreyle önbellekte tutulur
+- Bölüm görselleri taslak / final içeriğin H2 başlıklarından aranır
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from config.settings import (
+    CACHE_DIR,
+    SEARCH_CACHE_ENABLED,
+    IMAGE_CACHE_TTL,
+    IMAGE_CACHE_MAX_ENTRIES,
+    IMAGE_MAX_WORKERS,
+    IMAGE_SECTION_LIMIT,
+)
+from agents.http_client import http_get
+from agents.resilience import get_provider
+from agents.search_cache import SearchCache
+from agents.singleflight import get_group as get_flight_group
+from agents.topic_normalizer import normalize_query
+from agents.extractors import unique
+
+
+UNSPLASH_ACCESS_KEY = os.getenv("UNSPLASH_ACCESS_KEY", "")
+
+_HEADING_RE = re.compile(r"^##\s+(.+?)\s*$", re.MULTILINE)
+_HEADING_PREFIX_RE = re.compile(r"^[\W\d_]*(?:adım\s*\d+\s*[:.\-]\s*)?", re.IGNORECASE)
+
+
+# ============================================================
+# UNSPLASH ARAMA
+# ============================================================
+
+def search_images(query: str, count: int = 3) -> List[Dict]:
+    """Unsplash araması (önbellek + aynı anda gelen özdeş sorguları birleştirme)"""
+    if not UNSPLASH_ACCESS_KEY:
+        return []
+
+    key = f"{normalize_query(query)}|{count}"
+    cache = get_image_cache()
+    if cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    return get_flight_group("images").do(key, lambda: _fetch_images(query, count, cache, key))
+
+
+def _fetch_images(query: str, count: int, cache=None, key: str = "") -> List[Dict]:
+    try:
+        def send():
+            response = http_get(
+                "https://api.unsplash.com/search/photos",
+                params={"query": query, "per_page": count, "orientation": "landscape"},
+                headers={"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"},
+                timeout=10
+            )
+            response.raise_for_status()
+            return response
+
+        data = get_provider("unsplash").call(send).json()
+
+        images = []
+        for photo in data.get("results", []):
+            images.append({
+                "url": photo["urls"]["regular"],
+                "thumb": photo["urls"]["thumb"],
+                "alt": photo.get("alt_description") or query,
+                "credit": photo["user"]["name"],
+                "credit_link": photo["user"]["links"]["html"]
+            })
+    except Exception as e:
+        print(f"Görsel arama hatası: {e}")
+        return []
+
+    if cache and images:
+        cache.set(key, images, IMAGE_CACHE_TTL)
+    return images
+
+
+# ============================================================
+# GÖRSEL SEÇİMİ
+# ============================================================
+
+def section_headings(content: str, limit: int = IMAGE_SECTION_LIMIT) -> List[str]:
+    """Markdown içerikten H2 başlıkları (numara / emoji önekleri temizlenmiş)"""
+    headings = []
+    for match in _HEADING_RE.finditer(content or ""):
+        heading = _HEADING_PREFIX_RE.sub("", match.group(1)).strip(" *#")
+        if heading and heading not in headings:
+            headings.append(heading)
+    return headings[:limit]
+
+
+class ImageCurator:
+    """Hero ve bölüm görsellerini eş zamanlı seçer"""
+
+    def __init__(self, max_workers: int = IMAGE_MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="images")
+
+    def curate(self, topic: str, sections: Optional[List[str]] = None,
+               include_hero: bool = True) -> Dict[str, Dict]:
+        """
+        {"hero": görsel, bölüm: görsel, ...} döndürür
+
+        Normalize edildiğinde aynı olan sorgular (ör. bölüm adı konuyla aynıysa)
+        bir kez aranır; aynı fotoğraf iki bölüme verilmez.
+        """
+        if not UNSPLASH_ACCESS_KEY:
+            return {}
+
+        slots = []
+        if include_hero:
+            slots.append(("hero", topic))
+        for section in unique(section.strip() for section in sections or [] if section.strip())[:IMAGE_SECTION_LIMIT]:
+            slots.append((section, f"{section} {topic}"))
+
+        # Normalize sorguya göre tekilleştir (sıra korunur)
+        queries = {}
+        for _, query in slots:
+            queries.setdefault(normalize_query(query), query)
+
+        # Çakışmada yedek olsun diye sorgu başına birkaç aday
+        futures = {key: self._executor.submit(search_images, query, 3) for key, query in queries.items()}
+
+        images = {}
+        used = set()
+        for slot, query in slots:
+            for candidate in futures[normalize_query(query)].result():
+                if candidate["url"] not in used:
+                    images[slot] = candidate
+                    used.add(candidate["url"])
+                    break
+        return images
+
+
+def insert_section_images(content: str, images: Dict[str, Dict]) -> str:
+    """Bölüm görsellerini ilgili H2 başlığının altına ekler (zaten görsel varsa eklemez)"""
+    if not images:
+        return content
+
+    lines = content.split("\n")
+    output = []
+    for position, line in enumerate(lines):
+        output.append(line)
+        match = _HEADING_RE.match(line)
+        if not match:
+            continue
+        heading = _HEADING_PREFIX_RE.sub("", match.group(1)).strip(" *#")
+        image = images.get(heading)
+        following = next((l for l in lines[position + 1:] if l.strip()), "")
+        if image and not following.lstrip().startswith("!["):
+            output.extend(["", f"![{image['alt']}]({image['url']})", f"*Fotoğraf: {image['credit']}*", ""])
+    return "\n".join(output)
+
+
+_image_cache: Optional[SearchCache] = None
+_curator: Optional[ImageCurator] = None
+_lock = threading.Lock()
+
+
+def get_image_cache() -> Optional[SearchCache]:
+    """Görsel önbelleği singleton (search cache kapalıysa None)"""
+    global _image_cache
+
+    if not SEARCH_CACHE_ENABLED:
+        return None
+
+    if _image_cache is None:
+        with _lock:
+            if _image_cache is None:
+                _image_cache = SearchCache(os.path.join(CACHE_DIR, "image_cache.sqlite3"), IMAGE_CACHE_MAX_ENTRIES)
+
+    return _image_cache
+
+
+def get_image_curator() -> ImageCurator:
+    """Süreç genelinde tek görsel seçici (paylaşılan thread havuzu)"""
+    global _curator
+
+    if _curator is None:
+        with _lock:
+            if _curator is None:
+                _curator = ImageCurator()
+
+    return _curator
@@ -0,0 +1,170 @@
+"""
+ContentForge Pipeline DAG
+Bağımlılık grafiği olarak tanımlanan aşamaları eş zamanlı çalıştırır
+
+- Stage: tek iş birimi (ör. research, images, seo_score); deps bitince çalışır
+- Step: kullanıcıya gösterilen agent adımı (1..N); bir veya daha fazla stage'i kapsar
+
+Aşamalar bağımsızsa paralel çalışır, ama event'ler her zaman adım sırasıyla
+üretilir: step k'nin agent_start'ı, step k-1'in agent_complete'inden sonra,
+agent_complete'i ise step'in tüm stage'leri bitince gelir. Frontend'in
+AgentProgress bileşeni sıralı start/complete çiftleri bekler.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Generator, Iterable, List, Tuple, Union
+
+
+class Stage:
+    """Grafikteki tek aşama; fn(ctx) sonucu ctx[name]'e yazılır"""
+
+    __slots__ = ("name", "fn", "deps")
+
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = ()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+
+class Step:
+    """
+    Kullanıcıya gösterilen adım
+
+    Args:
+        start_message: Metin veya ctx -> metin
+        complete: ctx -> (mesaj, data)
+    """
+
+    __slots__ = ("number", "agent", "stages", "start_message", "complete")
+
+    def __init__(self, number: int, agent: Dict[str, Any], stages: Iterable[str],
+                 start_message: Union[str, Callable[[Dict[str, Any]], str]],
+                 complete: Callable[[Dict[str, Any]], Tuple[str, Dict[str, Any]]]):
+        self.number = number
+        self.agent = agent
+        self.stages = tuple(stages)
+        self.start_message = start_message
+        self.complete = complete
+
+
+class StageGraph:
+    """Stage'leri bağımlılık sırasıyla, bağımsız olanları eş zamanlı çalıştırır"""
+
+    def __init__(self, stages: List[Stage], steps: List[Step], max_workers: int = 4):
+        self.stages = {stage.name: stage for stage in stages}
+        self.steps = sorted(steps, key=lambda step: step.number)
+        self.max_workers = max_workers
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            unknown = [dep for dep in stage.deps if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"{stage.name}: bilinmeyen bağımlılık {unknown}")
+        for step in self.steps:
+            unknown = [name for name in step.stages if name not in self.stages]
+            if unknown:
+                raise ValueError(f"Adım {step.number}: bilinmeyen stage {unknown}")
+
+        # Döngü kontrolü (Kahn)
+        remaining = {name: set(stage.deps) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Döngüsel bağımlılık: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def run(self, ctx: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+        """
+        Grafiği çalıştırır, adım event'lerini sırayla üretir
+
+        Bir stage hata verirse bekleyen stage'ler başlatılmaz ve hata yukarı fırlatılır.
+        """
+        total_steps = len(self.steps)
+        started: Dict[str, float] = {}
+        finished: Dict[str, float] = {}
+        running: Dict[Future, str] = {}
+        submitted = set()
+        next_step = 0
+        step_open = False
+        origin = time.perf_counter()
+
+        def timed(stage: Stage) -> Callable[[], Any]:
+            def call():
+                started[stage.name] = time.perf_counter()
+                try:
+                    return stage.fn(ctx)
+                finally:
+                    finished[stage.name] = time.perf_counter()
+            return call
+
+        def submit_ready(executor: ThreadPoolExecutor):
+            for name, stage in self.stages.items():
+                if name in submitted:
+                    continue
+                if all(dep in ctx["_done"] for dep in stage.deps):
+                    submitted.add(name)
+                    running[executor.submit(timed(stage))] = name
+
+        ctx["_done"] = set()
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="pipeline") as executor:
+            submit_ready(executor)
+
+            while True:
+                # Sıradaki adımın event'leri (start -> complete, adım adım)
+                while next_step < total_steps:
+                    step = self.steps[next_step]
+                    if not step_open:
+                        if not any(name in submitted for name in step.stages):
+                            break
+                        message = step.start_message(ctx) if callable(step.start_message) else step.start_message
+                        yield {
+                            "type": "agent_start",
+                            "agent": step.agent,
+                            "step": step.number,
+                            "total_steps": total_steps,
+                            "message": message
+                        }
+                        step_open = True
+                    if not all(name in ctx["_done"] for name in step.stages):
+                        break
+                    message, data = step.complete(ctx)
+                    yield {
+                        "type": "agent_complete",
+                        "agent": step.agent,
+                        "step": step.number,
+                        "total_steps": total_steps,
+                        "message": message,
+                        "data": data
+                    }
+                    step_open = False
+                    next_step += 1
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        for pending in running:
+                            pending.cancel()
+                        raise error
+                    ctx[name] = future.result()
+                    ctx["_done"].add(name)
+                submit_ready(executor)
+
+        self.timings = {
+            name: {
+                "start": round(started[name] - origin, 3),
+                "end": round(finished[name] - origin, 3),
+            }
+            for name in self.stages if name in finished
+        }
+        del ctx["_done"]
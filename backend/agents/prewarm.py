@@ -0,0 +1,153 @@
+"""
+ContentForge Prewarm
+Popüler konuların araştırmasını yoğun olmayan saatlerde önceden yapar
+
+1. contents tablosundan son PREWARM_LOOKBACK_DAYS günün konuları okunur
+2. Konular canonical_topic ile gruplanır, en sık PREWARM_TOP_N konu seçilir
+3. Her konu için snapshot'ta taze olmayan katmanlar aranır ve snapshot'a yazılır
+4. Toplam Serper sorgusu PREWARM_QUERY_BUDGET'ı aşmaz
+
+Böylece popüler bir konunun ilk isteği araştırma aşamasını snapshot'tan
+karşılar (formata özel katman hariç).
+
+Kullanım (cron):
+    python -m agents.prewarm              # yalnızca PREWARM_HOURS içinde çalışır
+    python -m agents.prewarm --force      # saat kontrolü olmadan
+    python -m agents.prewarm --dry-run    # yalnızca planı göster
+"""
+
+import argparse
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import (
+    SERPER_API_KEY,
+    PREWARM_TOP_N,
+    PREWARM_LOOKBACK_DAYS,
+    PREWARM_QUERY_BUDGET,
+    PREWARM_HOURS,
+)
+from agents.blog_agents import build_research_plan, run_research_plan
+from agents.research_snapshots import ResearchSnapshot, get_snapshot_store
+from agents.resilience import get_provider
+from agents.topic_normalizer import canonical_topic
+
+
+def in_off_peak(now: Optional[datetime] = None, hours: str = PREWARM_HOURS) -> bool:
+    """UTC saat 'başlangıç-bitiş' aralığında mı (gece yarısını geçebilir: 23-3)"""
+    now = now or datetime.now(timezone.utc)
+    start, end = (int(part) for part in hours.split("-"))
+    if start <= end:
+        return start <= now.hour < end
+    return now.hour >= start or now.hour < end
+
+
+def load_recent_topics(days: int = PREWARM_LOOKBACK_DAYS) -> List[str]:
+    """contents tablosundaki son günlerin konuları"""
+    from database.supabase_client import get_supabase
+
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    result = get_supabase().table("contents") \
+        .select("topic") \
+        .gte("created_at", since.isoformat()) \
+        .execute()
+    return [row["topic"] for row in result.data or [] if row.get("topic")]
+
+
+def trending_topics(topics: List[str], top_n: int = PREWARM_TOP_N) -> List[Tuple[str, int]]:
+    """
+    Konuları canonical anahtara göre sayar
+
+    Returns:
+        [(en sık yazılış biçimi, istek sayısı)] - sayıya göre azalan
+    """
+    groups: Dict[str, Counter] = {}
+    for topic in topics:
+        groups.setdefault(canonical_topic(topic), Counter())[topic.strip()] += 1
+
+    ranked = sorted(groups.values(), key=lambda variants: -sum(variants.values()))
+    return [(variants.most_common(1)[0][0], sum(variants.values())) for variants in ranked[:top_n]]
+
+
+def prewarm(topics: List[Tuple[str, int]], budget: int = PREWARM_QUERY_BUDGET,
+            dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Konuların taze olmayan araştırma katmanlarını bütçe dahilinde arar
+
+    Returns:
+        Çalıştırma raporu (ısıtılan / zaten taze / bütçe yetmeyen konular,
+        kullanılan sorgu ve Serper HTTP çağrısı sayısı)
+    """
+    report = {
+        "budget": budget,
+        "queries_used": 0,
+        "warmed": [],
+        "already_fresh": [],
+        "over_budget": [],
+        "serper_calls": 0,
+        "duration": 0.0,
+    }
+
+    store = get_snapshot_store()
+    if not SERPER_API_KEY or not store:
+        report["error"] = "SERPER_API_KEY veya snapshot store yok"
+        return report
+
+    serper = get_provider("serper")
+    calls_before = serper.stats()["calls"]
+    started = time.perf_counter()
+
+    for topic, requests in topics:
+        snapshot = store.load(topic) or ResearchSnapshot(topic)
+        plan = [layer for layer in build_research_plan(topic) if not snapshot.is_fresh(layer)]
+        cost = sum(len(layer["queries"]) for layer in plan)
+
+        if not plan:
+            report["already_fresh"].append(topic)
+            continue
+        if report["queries_used"] + cost > budget:
+            report["over_budget"].append(topic)
+            continue
+
+        report["queries_used"] += cost
+        entry = {"topic": topic, "requests": requests, "layers": [layer["name"] for layer in plan], "queries": cost}
+        report["warmed"].append(entry)
+        if dry_run:
+            continue
+
+        execution = run_research_plan(plan, use_cached=False)
+        for layer in plan:
+            snapshot.put_results(layer, execution["results"][layer["name"]])
+        entry["revision"] = store.save(snapshot)
+        entry["seconds"] = execution["timings"]["total"]
+        entry["queries"] = execution["timings"]["queries_run"]
+        report["queries_used"] -= execution["timings"]["queries_saved"]
+
+    report["serper_calls"] = serper.stats()["calls"] - calls_before
+    report["duration"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def run(top_n: int = PREWARM_TOP_N, days: int = PREWARM_LOOKBACK_DAYS,
+        budget: int = PREWARM_QUERY_BUDGET, force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+    """Saat kontrolü + konu seçimi + ön ısıtma"""
+    if not force and not in_off_peak():
+        return {"skipped": f"PREWARM_HOURS ({PREWARM_HOURS} UTC) dışında"}
+
+    topics = trending_topics(load_recent_topics(days), top_n)
+    report = prewarm(topics, budget, dry_run=dry_run)
+    report["candidates"] = len(topics)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Popüler konuların araştırmasını önceden yapar")
+    parser.add_argument("--top", type=int, default=PREWARM_TOP_N)
+    parser.add_argument("--days", type=int, default=PREWARM_LOOKBACK_DAYS)
+    parser.add_argument("--budget", type=int, default=PREWARM_QUERY_BUDGET)
+    parser.add_argument("--force", action="store_true", help="Saat aralığını yok say")
+    parser.add_argument("--dry-run", action="store_true", help="Arama yapmadan planı göster")
+    args = parser.parse_args()
+
+    print(run(args.top, args.days, args.budget, force=args.force, dry_run=args.dry_run))
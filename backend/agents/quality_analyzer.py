@@ -13,8 +13,9 @@ import re
 import math
 from typing import Dict, List, Tuple
 from groq import Groq
-import requests
-from config.settings import DEFAULT_MODEL, SERPER_API_KEY
+from config.settings import DEFAULT_MODEL, SERPER_API_KEY, SERPER_BASE_URL
+from agents.http_client import http_post
+from agents.resilience import get_provider
 
 
 # ============================================================
@@ -330,7 +331,7 @@ Genel görüşleri veya öznel ifadeleri ALMA."""
     user = f"İçerik:\n{content[:3000]}"
     
     try:
-        response = client.chat.completions.create(
+        response = get_provider("groq").call(lambda: client.chat.completions.create(
             model=DEFAULT_MODEL,
             messages=[
                 {"role": "system", "content": system},
@@ -338,7 +339,7 @@ Genel görüşleri veya öznel ifadeleri ALMA."""
             ],
             temperature=0.2,
             max_tokens=500,
-        )
+        ))
         
         claims = response.choices[0].message.content.strip().split('\n')
         claims = [c.strip('- ').strip() for c in claims if c.strip() and len(c.strip()) > 10]
@@ -354,14 +355,17 @@ def verify_claim(claim: str) -> Dict:
         return {"verified": None, "confidence": 0, "source": None}
     
     try:
-        response = requests.post(
-            "https://google.serper.dev/search",
-            headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
-            json={"q": claim, "gl": "tr", "hl": "tr", "num": 3},
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
+        def send():
+            response = http_post(
+                f"{SERPER_BASE_URL}/search",
+                headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
+                json={"q": claim, "gl": "tr", "hl": "tr", "num": 3},
+                timeout=10
+            )
+            response.raise_for_status()
+            return response
+        
+        data = get_provider("serper").call(send).json()
         
         results = data.get("organic", [])
         if not results:
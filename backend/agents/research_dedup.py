@@ -0,0 +1,191 @@
+"""
+ContentForge Research Dedup
+Katmanlar arası sonuç tekilleştirme
+
+1. Aynı URL (normalize edilmiş) -> tekrar
+2. Neredeyse aynı snippet (kelime shingle'ları üzerinde MinHash + LSH) -> tekrar
+
+Her sonuç için sabit sayıda hash hesaplanır ve yalnızca aynı LSH
+kovasına düşen adaylarla karşılaştırılır; toplam maliyet sonuç
+sayısıyla doğrusal artar.
+"""
+
+import re
+import hashlib
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from agents.search_result import SearchResult
+
+
+NUM_PERM = 64          # MinHash imza uzunluğu
+BANDS = 16             # LSH bant sayısı (BANDS * ROWS == NUM_PERM)
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3       # Kelime shingle boyutu
+SIMILARITY_THRESHOLD = 0.7
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_TRACKING_PARAMS = {"fbclid", "gclid", "ref"}
+
+
+def _permutations() -> List[Tuple[int, int]]:
+    """Sabit tohumlu (a, b) çiftleri - süreçler arası aynı imza"""
+    params = []
+    for i in range(NUM_PERM):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % _MERSENNE_PRIME or 1
+        b = int.from_bytes(digest[8:], "big") % _MERSENNE_PRIME
+        params.append((a, b))
+    return params
+
+
+_PERMUTATIONS = _permutations()
+
+
+def normalize_url(url: str) -> str:
+    """Karşılaştırma için URL normalizasyonu (www, sondaki /, fragment, izleme parametreleri)"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not (k.lower().startswith("utm_") or k.lower() in _TRACKING_PARAMS)
+    ])
+    path = parts.path.rstrip("/")
+    return f"{host}{path}" + (f"?{query}" if query else "")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Metnin kelime shingle'larının 32-bit hash kümesi"""
+    tokens = _TOKEN_RE.findall(text.casefold())
+    if not tokens:
+        return set()
+    if len(tokens) < size:
+        grams = [" ".join(tokens)]
+    else:
+        grams = [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode(), digest_size=4).digest(), "big")
+        for g in grams
+    }
+
+
+def minhash(features: Set[int]) -> Tuple[int, ...]:
+    """Shingle kümesinin MinHash imzası"""
+    return tuple(
+        min(((a * x + b) % _MERSENNE_PRIME) & _MAX_HASH for x in features)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """İki imzadan tahmini Jaccard benzerliği"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+class ResearchDeduplicator:
+    """Sonuçları sırayla görür; daha önce görülen URL veya benzer snippet'i eler"""
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._urls: Set[str] = set()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._signatures: List[Tuple[int, ...]] = []
+        self.stats = {"seen": 0, "kept": 0, "duplicate_urls": 0, "near_duplicates": 0}
+
+    def _find_similar(self, signature: Tuple[int, ...]) -> Optional[int]:
+        checked = set()
+        for band in range(BANDS):
+            key = (band, signature[band * ROWS:(band + 1) * ROWS])
+            for candidate in self._buckets.get(key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if estimate_similarity(signature, self._signatures[candidate]) >= self.threshold:
+                    return candidate
+        return None
+
+    def add(self, result: SearchResult) -> bool:
+        """Sonuç yeniyse kaydeder ve True döndürür"""
+        self.stats["seen"] += 1
+
+        url = normalize_url(result.link)
+        if url and url in self._urls:
+            self.stats["duplicate_urls"] += 1
+            return False
+
+        signature = None
+        features = shingles(result.snippet)
+        if features:
+            signature = minhash(features)
+            if self._find_similar(signature) is not None:
+                self.stats["near_duplicates"] += 1
+                return False
+
+        if url:
+            self._urls.add(url)
+        if signature is not None:
+            index = len(self._signatures)
+            self._signatures.append(signature)
+            for band in range(BANDS):
+                key = (band, signature[band * ROWS:(band + 1) * ROWS])
+                self._buckets.setdefault(key, []).append(index)
+
+        self.stats["kept"] += 1
+        return True
+
+    def filter(self, results: List[SearchResult], limit: Optional[int] = None) -> List[SearchResult]:
+        """
+        Listeden yeni olanları sırayı koruyarak döndürür
+
+        limit'e ulaşınca durur; kalan sonuçlar görülmemiş sayılır ve
+        sonraki katmanlarda kullanılabilir.
+        """
+        kept = []
+        for result in results:
+            if limit is not None and len(kept) >= limit:
+                break
+            if self.add(result):
+                kept.append(result)
+        return kept
+
+
+class SaturationTracker:
+    """
+    Bir katmanın sorgularının getirdiği yeni (normalize) URL sayısını izler
+
+    Katman doygun sayılır:
+    - son sorgu min_new'den az yeni URL getirdiyse ("saturated")
+    - katmanda enough kadar farklı URL toplandıysa ("enough")
+    Boş dönen sorgu (hata / sonuç yok) doygunluk sayılmaz.
+    """
+
+    def __init__(self, enough: int, min_new: int = 1):
+        self.enough = enough
+        self.min_new = min_new
+        self._urls: Set[str] = set()
+        self.new_per_query: List[int] = []
+
+    def add(self, results: List[SearchResult]) -> int:
+        """Sorgu sonuçlarını kaydeder, getirdiği yeni URL sayısını döndürür"""
+        before = len(self._urls)
+        self._urls.update(url for url in (normalize_url(r.link) for r in results) if url)
+        new = len(self._urls) - before
+        self.new_per_query.append(new if results else -1)
+        return new
+
+    @property
+    def distinct(self) -> int:
+        return len(self._urls)
+
+    def reason(self) -> Optional[str]:
+        """Doygunsa sebebi, değilse None"""
+        if self.distinct >= self.enough:
+            return "enough"
+        if self.new_per_query and 0 <= self.new_per_query[-1] < self.min_new:
+            return "saturated"
+        return None
@@ -0,0 +1,149 @@
+"""
+ContentForge Research Packer
+Yazar prompt'ları için konuya göre sıralanmış, bütçeye sığdırılmış araştırma metni
+
+1. Her sonuç (başlık + snippet) konuya göre BM25 ile puanlanır
+2. MMR ile en alakalı ve öncekilere en az benzeyen sonuç seçilir
+3. Token bütçesi dolana kadar seçime devam edilir
+4. Seçilenler katman sırasına göre gruplanarak metne dökülür
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Set
+from agents.search_result import SearchResult
+
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+MMR_LAMBDA = 0.7          # 1 = sadece alaka, 0 = sadece çeşitlilik
+CHARS_PER_TOKEN = 4       # Kaba token tahmini
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.casefold()) if len(t) > 1]
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def bm25_scores(query: List[str], documents: List[List[str]]) -> List[float]:
+    """Her doküman için sorguya göre BM25 skoru"""
+    if not documents:
+        return []
+
+    n = len(documents)
+    avg_len = sum(len(d) for d in documents) / n or 1.0
+    doc_freq = Counter()
+    for doc in documents:
+        doc_freq.update(set(doc))
+
+    idf = {
+        term: math.log(1 + (n - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+        for term in set(query)
+    }
+
+    scores = []
+    for doc in documents:
+        tf = Counter(doc)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avg_len)
+        scores.append(sum(
+            idf[term] * tf[term] * (BM25_K1 + 1) / (tf[term] + norm)
+            for term in idf if tf[term]
+        ))
+    return scores
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _format_result(r: SearchResult) -> str:
+    lines = [f"**{r.title}**", r.snippet]
+    if r.date:
+        lines.append(f"📅 {r.date}")
+    if r.source:
+        lines.append(f"🔗 Kaynak: {r.source}")
+    return "\n".join(lines)
+
+
+def pack_research(research_data: Dict[str, Any], topic: str, token_budget: int) -> str:
+    """
+    Araştırma verisinden token bütçesine sığan en alakalı bağlamı üretir
+
+    Args:
+        research_data: deep_research çıktısı
+        topic: Blog konusu (BM25 sorgusu)
+        token_budget: Yaklaşık token bütçesi
+    """
+    if not research_data:
+        return ""
+
+    candidates = []
+    for layer_order, (layer_name, layer_data) in enumerate(research_data["layers"].items()):
+        for r in layer_data["results"]:
+            if r.title and r.snippet:
+                text = _format_result(r)
+                candidates.append({
+                    "layer": layer_name,
+                    "layer_order": layer_order,
+                    "text": text,
+                    "tokens": tokenize(f"{r.title} {r.snippet}"),
+                    "cost": estimate_tokens(text) + 1,
+                })
+
+    header = (
+        f"# 📚 ARAŞTIRMA ÖZETİ: {topic}\n"
+        f"**Toplam Kaynak:** {research_data['sources_count']} | "
+        f"**Benzersiz Site:** {len(research_data['sources'])}\n"
+    )
+    budget = token_budget - estimate_tokens(header)
+
+    scores = bm25_scores(tokenize(topic), [c["tokens"] for c in candidates])
+    top = max(scores, default=0.0) or 1.0
+    for candidate, score in zip(candidates, scores):
+        candidate["relevance"] = score / top
+        candidate["token_set"] = set(candidate["tokens"])
+
+    # MMR ile açgözlü seçim (redundancy: seçilenlere en yüksek benzerlik)
+    selected = []
+    remaining = set(range(len(candidates)))
+    redundancy = [0.0] * len(candidates)
+    while remaining and budget > 0:
+        best, best_value = None, None
+        for index in sorted(remaining):
+            if candidates[index]["cost"] > budget:
+                continue
+            value = MMR_LAMBDA * candidates[index]["relevance"] - (1 - MMR_LAMBDA) * redundancy[index]
+            if best_value is None or value > best_value:
+                best, best_value = index, value
+        if best is None:
+            break
+        selected.append(best)
+        remaining.discard(best)
+        budget -= candidates[best]["cost"]
+        for index in remaining:
+            redundancy[index] = max(
+                redundancy[index],
+                _jaccard(candidates[index]["token_set"], candidates[best]["token_set"])
+            )
+
+    # Katman sırasına göre grupla
+    sections = [header]
+    current_layer = None
+    for index in sorted(selected, key=lambda i: (candidates[i]["layer_order"], i)):
+        candidate = candidates[index]
+        if candidate["layer"] != current_layer:
+            current_layer = candidate["layer"]
+            category = research_data["layers"][current_layer]["category"]
+            sections.append(f"\n## {category['icon']} {category['name'].upper()}")
+        sections.append(candidate["text"])
+        sections.append("")
+
+    return "\n".join(sections)
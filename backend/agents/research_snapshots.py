@@ -0,0 +1,317 @@
+"""
+ContentForge Research Snapshots
+Konu bazında yeniden kullanılabilir araştırma çıktısı
+
+Snapshot, her katmanın sorgu başına ham arama sonuçlarını ve çekilme
+zamanını (fetched_at) saklar. Aynı konu farklı format, hedef kitle veya
+tonla yeniden üretildiğinde araştırma tekrar yapılmaz; yalnızca eksik
+veya bayatlamış katmanlar yenilenir. Çıkarım, tekilleştirme ve derleme
+ham sonuçlar üzerinden her seferinde yeniden yapılır.
+
+Katman durumları (fetched_at'ten geçen süreye göre):
+- taze:   TTL içinde, olduğu gibi kullanılır
+- bayat:  TTL dolmuş ama bayat süre içinde; hemen kullanılır, arka planda yenilenir
+- dolmuş: bayat süre de geçmiş; eksik katman gibi beklenerek aranır
+
+Depolama: CACHE_DIR altında SQLite (WAL), zlib ile sıkıştırılmış JSON.
+Her kayıtta şema sürümü (format) ve her yazmada artan revizyon tutulur.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from config.settings import (
+    CACHE_DIR,
+    RESEARCH_SNAPSHOT_ENABLED,
+    RESEARCH_SNAPSHOT_MAX_ENTRIES,
+    RESEARCH_SNAPSHOT_TTL_NEWS,
+    RESEARCH_SNAPSHOT_TTL,
+    RESEARCH_SNAPSHOT_STALE_NEWS,
+    RESEARCH_SNAPSHOT_STALE,
+)
+from agents.search_result import SearchResult
+from agents.search_cache import is_recent
+from agents.revalidator import get_revalidator, PRIORITY_NEWS, PRIORITY_EVERGREEN
+from agents.topic_normalizer import canonical_topic
+
+
+# Snapshot şema sürümü; uyumsuz kayıtlar yok sayılır
+SNAPSHOT_FORMAT = 1
+
+# Eviction kontrolü kaç yazmada bir yapılır
+EVICTION_CHECK_INTERVAL = 20
+
+
+def topic_key(topic: str) -> str:
+    """Snapshot anahtarı için konu normalizasyonu"""
+    return canonical_topic(topic)
+
+
+def layer_key(layer: Dict[str, Any]) -> str:
+    """Plan katmanının snapshot içindeki anahtarı"""
+    return layer.get("key", layer["name"])
+
+
+def _is_recent_layer(layer: Dict[str, Any]) -> bool:
+    return is_recent(layer["search"].get("search_type", "search"), layer["search"].get("time_range"))
+
+
+def layer_ttl(layer: Dict[str, Any]) -> int:
+    """Katmanın tazelik süresi (saniye)"""
+    return RESEARCH_SNAPSHOT_TTL_NEWS if _is_recent_layer(layer) else RESEARCH_SNAPSHOT_TTL
+
+
+def layer_stale_ttl(layer: Dict[str, Any]) -> int:
+    """TTL sonrası katmanın bayat kullanılabileceği ek süre (saniye)"""
+    return RESEARCH_SNAPSHOT_STALE_NEWS if _is_recent_layer(layer) else RESEARCH_SNAPSHOT_STALE
+
+
+class ResearchSnapshot:
+    """Bir konunun katman bazlı ham araştırma sonuçları"""
+
+    def __init__(self, topic: str, layers: Optional[Dict[str, Dict]] = None, revision: int = 0):
+        self.topic = topic
+        self.key = topic_key(topic)
+        self.layers = layers or {}
+        self.revision = revision
+
+    def covers(self, layer: Dict[str, Any]) -> bool:
+        """Kayıtlı katman plandaki sorguların hepsini içeriyorsa True (daha sığ derinlikle çekilmemiş)"""
+        entry = self.layers.get(layer_key(layer))
+        return entry is not None and len(entry["results"]) >= len(layer["queries"])
+
+    def is_fresh(self, layer: Dict[str, Any]) -> bool:
+        age = self.age(layer)
+        return self.covers(layer) and age < layer_ttl(layer)
+
+    def is_usable(self, layer: Dict[str, Any]) -> bool:
+        """Katman taze veya bayat süre içindeyse True"""
+        age = self.age(layer)
+        return self.covers(layer) and age < layer_ttl(layer) + layer_stale_ttl(layer)
+
+    def get_results(self, layer: Dict[str, Any]) -> List[List[SearchResult]]:
+        """Katmanın (plandaki sorgu sayısı kadar) sorgu sırasıyla sonuç listeleri"""
+        entry = self.layers[layer_key(layer)]
+        return [
+            [SearchResult.from_dict(r) for r in results]
+            for results in entry["results"][:len(layer["queries"])]
+        ]
+
+    def put_results(self, layer: Dict[str, Any], results: List[List[SearchResult]],
+                    fetched_at: Optional[float] = None):
+        """Yeni çekilen katmanı kaydeder (tamamen boş sonuçlar saklanmaz)"""
+        if not any(results):
+            return
+        self.layers[layer_key(layer)] = {
+            "name": layer["name"],
+            "queries": list(layer["queries"]),
+            "fetched_at": time.time() if fetched_at is None else fetched_at,
+            "results": [[r.to_dict() for r in query_results] for query_results in results],
+        }
+
+    def age(self, layer: Dict[str, Any]) -> Optional[float]:
+        entry = self.layers.get(layer_key(layer))
+        return None if entry is None else round(time.time() - entry["fetched_at"], 1)
+
+    def to_payload(self) -> bytes:
+        data = {"format": SNAPSHOT_FORMAT, "topic": self.topic, "layers": self.layers}
+        return zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    @classmethod
+    def from_payload(cls, payload: bytes, revision: int = 0) -> Optional["ResearchSnapshot"]:
+        data = json.loads(zlib.decompress(payload).decode("utf-8"))
+        if data.get("format") != SNAPSHOT_FORMAT:
+            return None
+        return cls(data["topic"], data["layers"], revision)
+
+
+class SnapshotStore:
+    """SQLite tabanlı snapshot deposu"""
+
+    def __init__(self, path: str, max_entries: int = RESEARCH_SNAPSHOT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "errors": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS research_snapshots (
+                topic_key TEXT PRIMARY KEY,
+                format INTEGER NOT NULL,
+                revision INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_research_snapshots_updated ON research_snapshots(updated_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Thread başına bir bağlantı"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _read(self, conn: sqlite3.Connection, key: str) -> Optional[ResearchSnapshot]:
+        row = conn.execute(
+            "SELECT payload, revision FROM research_snapshots WHERE topic_key = ? AND format = ?",
+            (key, SNAPSHOT_FORMAT)
+        ).fetchone()
+        if row is None:
+            return None
+        return ResearchSnapshot.from_payload(row[0], row[1])
+
+    def load(self, topic: str) -> Optional[ResearchSnapshot]:
+        """Konunun snapshot'ını döndürür, yoksa None"""
+        try:
+            snapshot = self._read(self._connect(), topic_key(topic))
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            print(f"Snapshot okuma hatası: {e}")
+            self._count("errors")
+            snapshot = None
+
+        self._count("hits" if snapshot else "misses")
+        return snapshot
+
+    def save(self, snapshot: ResearchSnapshot) -> int:
+        """
+        Snapshot'ı yazar ve yeni revizyonu döndürür
+
+        Aynı konu başka bir süreçte güncellendiyse katmanlar birleştirilir;
+        her katman için daha yeni fetched_at kazanır.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                current = self._read(conn, snapshot.key)
+                revision = 1
+                if current is not None:
+                    for key, entry in current.layers.items():
+                        mine = snapshot.layers.get(key)
+                        if mine is None or mine["fetched_at"] < entry["fetched_at"]:
+                            snapshot.layers[key] = entry
+                    revision = current.revision + 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO research_snapshots (topic_key, format, revision, payload, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (snapshot.key, SNAPSHOT_FORMAT, revision, snapshot.to_payload(), time.time())
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            print(f"Snapshot yazma hatası: {e}")
+            self._count("errors")
+            return snapshot.revision
+
+        snapshot.revision = revision
+        self._count("stores")
+
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICTION_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+        return revision
+
+    def evict(self) -> int:
+        """Sınırı aşan en eski snapshot'ları ve eski şema kayıtlarını siler"""
+        try:
+            conn = self._connect()
+            removed = conn.execute(
+                "DELETE FROM research_snapshots WHERE format != ?", (SNAPSHOT_FORMAT,)
+            ).rowcount
+            total = conn.execute("SELECT COUNT(*) FROM research_snapshots").fetchone()[0]
+            overflow = total - self.max_entries
+            if overflow > 0:
+                removed += conn.execute(
+                    "DELETE FROM research_snapshots WHERE topic_key IN "
+                    "(SELECT topic_key FROM research_snapshots ORDER BY updated_at ASC LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+        except sqlite3.Error as e:
+            print(f"Snapshot temizleme hatası: {e}")
+            self._count("errors")
+            return 0
+
+        self._count("evictions", removed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Sayaçlar ve güncel kayıt sayısı (sayaçlar bu sürece aittir)"""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else 0.0
+        try:
+            counters["entries"] = self._connect().execute(
+                "SELECT COUNT(*) FROM research_snapshots"
+            ).fetchone()[0]
+        except sqlite3.Error:
+            counters["entries"] = None
+        counters["max_entries"] = self.max_entries
+        return counters
+
+
+def schedule_refresh(topic: str, layers: List[Dict[str, Any]],
+                     fetch: Callable[[List[Dict[str, Any]]], Dict[str, Any]]) -> bool:
+    """
+    Bayat katmanları arka planda yeniden arar ve snapshot'a yazar
+
+    Args:
+        fetch: Plan alıp run_research_plan çıktısı döndüren fonksiyon
+    """
+    store = get_snapshot_store()
+    if not store or not layers:
+        return False
+
+    def refresh():
+        execution = fetch(layers)
+        fresh = ResearchSnapshot(topic)
+        for layer in layers:
+            fresh.put_results(layer, execution["results"][layer["name"]])
+        if fresh.layers:
+            store.save(fresh)
+
+    key = f"snapshot:{topic_key(topic)}:" + ",".join(sorted(layer_key(layer) for layer in layers))
+    priority = PRIORITY_NEWS if any(_is_recent_layer(layer) for layer in layers) else PRIORITY_EVERGREEN
+    return get_revalidator().schedule(key, refresh, priority)
+
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Snapshot store singleton (devre dışıysa None)"""
+    global _store
+
+    if not RESEARCH_SNAPSHOT_ENABLED:
+        return None
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SnapshotStore(os.path.join(CACHE_DIR, "research_snapshots.sqlite3"))
+
+    return _store
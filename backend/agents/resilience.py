@@ -0,0 +1,367 @@
+"""
+ContentForge Resilience
+Dış servisler (Serper, Unsplash, Groq) için hız sınırlama ve devre kesici
+
+- TokenBucket: süreç genelinde sağlayıcı başına istek hızı sınırı
+- Retry-After: 429 yanıtlarında sağlayıcının istediği kadar beklenir
+- CircuitBreaker: art arda hatalarda sağlayıcıya istek göndermeden hemen hata verir
+- AdaptiveLimiter: gecikme ve hata oranına göre eş zamanlılık sınırını ayarlar (AIMD)
+"""
+
+import math
+import time
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from config.settings import (
+    PROVIDER_RATE_LIMITS,
+    PROVIDER_CONCURRENCY,
+    ADAPTIVE_WINDOW,
+    RATE_LIMIT_MAX_WAIT,
+    RATE_LIMIT_MAX_RETRIES,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+)
+
+
+class CircuitOpenError(Exception):
+    """Devre açık, sağlayıcıya istek gönderilmedi"""
+
+
+class RateLimitExceeded(Exception):
+    """Hız sınırı içinde izin alınamadı"""
+
+
+# ============================================================
+# TOKEN BUCKET
+# ============================================================
+
+class TokenBucket:
+    """Saniyede `rate` token üreten, en fazla `capacity` biriktiren kova"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: float) -> bool:
+        """Token alır; timeout içinde alınamazsa False"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate if self.rate > 0 else timeout)
+            if now + wait > deadline:
+                return False
+            time.sleep(min(wait, 1.0))
+
+    def pause(self, seconds: float):
+        """Retry-After süresince token verme"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "tokens": round(self._tokens, 2),
+                "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            }
+
+
+# ============================================================
+# CIRCUIT BREAKER
+# ============================================================
+
+class CircuitBreaker:
+    """
+    closed -> (art arda failure_threshold hata) -> open
+    open -> (reset_timeout sonra) -> half_open (tek deneme isteği)
+    half_open -> başarı: closed / hata: open
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """Alınan deneme hakkı kullanılmadan bırakılır"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {"state": self.state, "consecutive_failures": self._failures}
+            if self.state == "open":
+                stats["retry_in"] = round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 2)
+            return stats
+
+
+# ============================================================
+# ADAPTIVE CONCURRENCY (AIMD)
+# ============================================================
+
+def _percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class AdaptiveLimiter:
+    """
+    Eş zamanlı istek sınırı (AIMD)
+
+    Her `window` tamamlanan istekte bir değerlendirilir:
+    - 429 / hata oranı yüksek / p95 gecikme hedefin üstünde -> sınır yarıya iner
+    - aksi halde sınır 1 artar (min_limit <= sınır <= max_limit)
+    """
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int,
+                 target_p95: float, window: int = ADAPTIVE_WINDOW, max_error_rate: float = 0.1):
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_p95 = target_p95
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.in_flight = 0
+        self._latencies = deque(maxlen=200)
+        self._samples = []
+        self._adjustments = {"increases": 0, "decreases": 0}
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float) -> bool:
+        """Sınır müsait olana kadar bekler; timeout içinde olmazsa False"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.in_flight >= self.limit:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float, outcome: str = "ok"):
+        """outcome: ok / throttled (429) / error"""
+        with self._cond:
+            self.in_flight -= 1
+            self._latencies.append(latency)
+            self._samples.append((latency, outcome))
+            if len(self._samples) >= self.window:
+                self._adjust()
+            self._cond.notify_all()
+
+    def release_unsampled(self):
+        """Sağlayıcıya gitmeyen istek (ör. yerel hız sınırı doldu): slot bırakılır, örnek yazılmaz"""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def _adjust(self):
+        latencies = [latency for latency, _ in self._samples]
+        throttled = any(outcome == "throttled" for _, outcome in self._samples)
+        error_rate = sum(1 for _, outcome in self._samples if outcome == "error") / len(self._samples)
+        self._samples = []
+
+        if throttled or error_rate > self.max_error_rate or _percentile(latencies, 95) > self.target_p95:
+            new_limit = max(self.min_limit, self.limit // 2)
+            if new_limit < self.limit:
+                self._adjustments["decreases"] += 1
+        else:
+            new_limit = min(self.max_limit, self.limit + 1)
+            if new_limit > self.limit:
+                self._adjustments["increases"] += 1
+        self.limit = new_limit
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            latencies = list(self._latencies)
+            return {
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self.in_flight,
+                "target_p95": self.target_p95,
+                "latency_p50": round(_percentile(latencies, 50), 3),
+                "latency_p95": round(_percentile(latencies, 95), 3),
+                "samples": len(latencies),
+                **self._adjustments,
+            }
+
+
+# ============================================================
+# SAĞLAYICI KORUMASI
+# ============================================================
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After başlığını saniyeye çevirir (saniye veya HTTP tarihi)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_status(error: Exception) -> Tuple[Optional[int], Optional[float]]:
+    """requests / groq hatalarından HTTP durum kodu ve Retry-After"""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None) or getattr(error, "status_code", None)
+    headers = getattr(response, "headers", None) or {}
+    return status, parse_retry_after(headers.get("retry-after"))
+
+
+class ProviderGuard:
+    """Bir sağlayıcıya giden tüm çağrılar için hız sınırı + eş zamanlılık + devre kesici"""
+
+    def __init__(self, name: str, rate: float, burst: float, concurrency: AdaptiveLimiter):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "succeeded": 0, "failed": 0, "rate_limited": 0, "rejected": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        fn'i korumalı çalıştırır
+
+        fn hata durumunda exception fırlatmalıdır (ör. raise_for_status).
+        429'da Retry-After kadar beklenip en fazla RATE_LIMIT_MAX_RETRIES kez
+        tekrar denenir; 5xx / bağlantı hataları devre kesiciye yazılır.
+        """
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            if not self.breaker.allow():
+                self._count("rejected")
+                raise CircuitOpenError(f"{self.name} devresi açık")
+            if not self.concurrency.acquire(timeout=RATE_LIMIT_MAX_WAIT):
+                self._count("rejected")
+                self.breaker.release()
+                raise RateLimitExceeded(f"{self.name} eş zamanlılık sınırı aşıldı")
+            if not self.bucket.acquire(timeout=RATE_LIMIT_MAX_WAIT):
+                self._count("rejected")
+                self.concurrency.release_unsampled()
+                self.breaker.release()
+                raise RateLimitExceeded(f"{self.name} hız sınırı aşıldı")
+
+            self._count("calls")
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                status, retry_after = _error_status(e)
+                latency = time.monotonic() - started
+                if status == 429:
+                    self._count("rate_limited")
+                    self.concurrency.release(latency, "throttled")
+                    # 429 kesinti değil ama başarı da değil: hata sayacı sıfırlanmaz
+                    self.breaker.release()
+                    wait = retry_after if retry_after is not None else 2 ** attempt
+                    if attempt < RATE_LIMIT_MAX_RETRIES and wait <= RATE_LIMIT_MAX_WAIT:
+                        self.bucket.pause(wait)
+                        continue
+                    self.bucket.pause(min(wait, RATE_LIMIT_MAX_WAIT))
+                elif status is None or status >= 500:
+                    self.concurrency.release(latency, "error")
+                    self.breaker.record_failure()
+                else:
+                    self.concurrency.release(latency, "ok")
+                    self.breaker.record_success()
+                self._count("failed")
+                raise
+
+            self.concurrency.release(time.monotonic() - started, "ok")
+            self.breaker.record_success()
+            self._count("succeeded")
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "circuit": self.breaker.stats(),
+            "rate_limit": self.bucket.stats(),
+            "concurrency": self.concurrency.stats(),
+        }
+
+
+_providers: Dict[str, ProviderGuard] = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(name: str) -> ProviderGuard:
+    """Sağlayıcı koruması singleton (serper, unsplash, groq)"""
+    with _providers_lock:
+        guard = _providers.get(name)
+        if guard is None:
+            rate, burst = PROVIDER_RATE_LIMITS.get(name, (10.0, 10.0))
+            initial, min_limit, max_limit, target_p95 = PROVIDER_CONCURRENCY.get(name, (8, 1, 32, 5.0))
+            guard = _providers[name] = ProviderGuard(
+                name, rate, burst,
+                AdaptiveLimiter(initial, min_limit, max_limit, target_p95)
+            )
+        return guard
+
+
+def get_provider_stats() -> Dict[str, Dict[str, Any]]:
+    with _providers_lock:
+        guards = list(_providers.values())
+    return {guard.name: guard.stats() for guard in guards}
@@ -0,0 +1,101 @@
+"""
+ContentForge Revalidator
+Stale-while-revalidate için arka plan yenileme kuyruğu
+
+Bayat önbellek kaydı hemen döndürülür, yenileme buraya bırakılır.
+- Aynı anahtar için kuyrukta / çalışmakta olan yenileme tekrar eklenmez
+- En fazla max_concurrent yenileme aynı anda çalışır
+- Kuyruk doluysa yeni yenileme atılır (bayat kayıt bir sonraki istekte tekrar dener)
+- Düşük öncelik değeri önce çalışır (haber katmanları: PRIORITY_NEWS)
+"""
+
+import itertools
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
+from config.settings import REVALIDATE_MAX_CONCURRENT, REVALIDATE_MAX_PENDING
+
+
+PRIORITY_NEWS = 0
+PRIORITY_EVERGREEN = 1
+
+
+class Revalidator:
+    """Sınırlı eş zamanlılıkla arka plan yenileyici"""
+
+    def __init__(self, max_concurrent: int = REVALIDATE_MAX_CONCURRENT,
+                 max_pending: int = REVALIDATE_MAX_PENDING):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_pending = max_pending
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._keys = set()
+        self._workers = []
+        self._running = 0
+        self._counters = {"scheduled": 0, "deduplicated": 0, "dropped": 0, "completed": 0, "failed": 0}
+
+    def schedule(self, key: str, fn: Callable[[], Any], priority: int = PRIORITY_EVERGREEN) -> bool:
+        """Yenilemeyi kuyruğa ekler; eklenmediyse False"""
+        with self._lock:
+            if key in self._keys:
+                self._counters["deduplicated"] += 1
+                return False
+            if len(self._keys) >= self.max_pending + self.max_concurrent:
+                self._counters["dropped"] += 1
+                return False
+            self._keys.add(key)
+            self._counters["scheduled"] += 1
+            if len(self._workers) < self.max_concurrent:
+                worker = threading.Thread(target=self._work, name=f"revalidator-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+
+        self._queue.put((priority, next(self._order), key, fn))
+        return True
+
+    def _work(self):
+        while True:
+            _, _, key, fn = self._queue.get()
+            with self._lock:
+                self._running += 1
+            outcome = "failed"
+            try:
+                fn()
+                outcome = "completed"
+            except Exception as e:
+                print(f"Arka plan yenileme hatası ({key}): {e}")
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._keys.discard(key)
+                    self._counters[outcome] += 1
+                self._queue.task_done()
+
+    def join(self):
+        """Kuyruktaki tüm yenilemeler bitene kadar bekler (test / CLI için)"""
+        self._queue.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["running"] = self._running
+            stats["pending"] = len(self._keys) - self._running
+        stats["max_concurrent"] = self.max_concurrent
+        return stats
+
+
+_revalidator: Optional[Revalidator] = None
+_revalidator_lock = threading.Lock()
+
+
+def get_revalidator() -> Revalidator:
+    """Süreç genelinde tek yenileme kuyruğu"""
+    global _revalidator
+
+    if _revalidator is None:
+        with _revalidator_lock:
+            if _revalidator is None:
+                _revalidator = Revalidator()
+
+    return _revalidator
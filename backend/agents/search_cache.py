@@ -0,0 +1,221 @@
+"""
+ContentForge Search Cache
+Web arama sonuçları için kalıcı, süreçler arası paylaşılan önbellek
+
+SQLite (WAL modu) üzerinde çalışır; aynı makinedeki tüm uvicorn
+worker'ları aynı dosyayı kullanır.
+
+TTL politikası:
+- Haber / son dönem sorguları (news, time_range=d/w/m): kısa
+- Genel, SSS, tanım sorguları: uzun
+
+Stale-while-revalidate: TTL dolan kayıt, ek bir bayat süre boyunca
+lookup() ile (fresh=False) döndürülmeye devam eder; çağıran kaydı
+sunup arka planda yeniler. Haber kayıtlarının bayat süresi de kısadır.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import (
+    CACHE_DIR,
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_TTL_NEWS,
+    SEARCH_CACHE_TTL_EVERGREEN,
+    SEARCH_CACHE_STALE_NEWS,
+    SEARCH_CACHE_STALE_EVERGREEN,
+)
+from agents.topic_normalizer import normalize_query
+
+
+# Kısa TTL uygulanan zaman aralıkları
+RECENT_TIME_RANGES = ("h", "d", "w", "m")
+
+# Eviction kontrolü kaç yazmada bir yapılır
+EVICTION_CHECK_INTERVAL = 50
+
+
+def is_recent(search_type: str = "search", time_range: str = None) -> bool:
+    """Haber / son dönem araması mı"""
+    return search_type == "news" or time_range in RECENT_TIME_RANGES
+
+
+def ttl_for(search_type: str = "search", time_range: str = None) -> int:
+    """Arama tipine göre TTL (saniye) döndürür"""
+    if is_recent(search_type, time_range):
+        return SEARCH_CACHE_TTL_NEWS
+    return SEARCH_CACHE_TTL_EVERGREEN
+
+
+def stale_ttl_for(search_type: str = "search", time_range: str = None) -> int:
+    """TTL sonrası bayat sunulabilecek ek süre (saniye)"""
+    if is_recent(search_type, time_range):
+        return SEARCH_CACHE_STALE_NEWS
+    return SEARCH_CACHE_STALE_EVERGREEN
+
+
+def make_key(query: str, language: str = "tr", search_type: str = "search",
+             time_range: str = None, num_results: int = 10) -> str:
+    """Arama parametrelerinden önbellek anahtarı üretir (sorgu normalize edilir)"""
+    raw = json.dumps([normalize_query(query), language, search_type, time_range, num_results], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """SQLite tabanlı, boyut sınırlı arama önbelleği"""
+
+    def __init__(self, path: str, max_entries: int = SEARCH_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "errors": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                stale_until REAL NOT NULL DEFAULT 0
+            )
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(search_cache)")}
+        if "stale_until" not in columns:
+            conn.execute("ALTER TABLE search_cache ADD COLUMN stale_until REAL NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_last_access ON search_cache(last_access)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Thread başına bir bağlantı"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def lookup(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """
+        Kaydı (değer, taze_mi) olarak döndürür; yoksa veya bayat süresi de
+        dolmuşsa None
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expires_at FROM search_cache WHERE key = ? AND max(expires_at, stale_until) > ?",
+                (key, now)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+            fresh = row[1] > now
+            self._count("hits" if fresh else "stale_hits")
+            return json.loads(row[0]), fresh
+        except sqlite3.Error as e:
+            print(f"Önbellek okuma hatası: {e}")
+            self._count("errors")
+            self._count("misses")
+            return None
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Taze kayıt varsa döndürür, yoksa None"""
+        entry = self.lookup(key)
+        if entry is None or not entry[1]:
+            return None
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl: int, stale_ttl: int = 0):
+        """Kaydı yazar, gerekirse eski kayıtları temizler"""
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, value, created_at, expires_at, last_access, stale_until) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now + ttl, now, now + ttl + stale_ttl)
+            )
+            self._count("stores")
+        except sqlite3.Error as e:
+            print(f"Önbellek yazma hatası: {e}")
+            self._count("errors")
+            return
+
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICTION_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+
+    def evict(self) -> int:
+        """Bayat süresi de dolan kayıtları ve sınırı aşan en eski erişilen kayıtları siler"""
+        try:
+            conn = self._connect()
+            removed = conn.execute(
+                "DELETE FROM search_cache WHERE max(expires_at, stale_until) <= ?", (time.time(),)
+            ).rowcount
+            total = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+            overflow = total - self.max_entries
+            if overflow > 0:
+                removed += conn.execute(
+                    "DELETE FROM search_cache WHERE key IN "
+                    "(SELECT key FROM search_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+        except sqlite3.Error as e:
+            print(f"Önbellek temizleme hatası: {e}")
+            self._count("errors")
+            return 0
+
+        self._count("evictions", removed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Sayaçlar ve güncel kayıt sayısı (sayaçlar bu sürece aittir)"""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+        counters["hit_rate"] = round((counters["hits"] + counters["stale_hits"]) / lookups, 3) if lookups else 0.0
+        try:
+            counters["entries"] = self._connect().execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        except sqlite3.Error:
+            counters["entries"] = None
+        counters["max_entries"] = self.max_entries
+        return counters
+
+
+_cache: Optional[SearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Search cache singleton (devre dışıysa None)"""
+    global _cache
+
+    if not SEARCH_CACHE_ENABLED:
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SearchCache(os.path.join(CACHE_DIR, "search_cache.sqlite3"))
+
+    return _cache
@@ -0,0 +1,123 @@
+"""
+ContentForge Search Result
+Araştırma sonuçları için kompakt, tipli temsil
+
+Her sonuç __slots__ kullanır (örnek başına __dict__ yok); kaynak domainleri
+intern edilir, böylece aynı siteden gelen yüzlerce sonuç tek string paylaşır.
+Eski dict erişimi (r.get("snippet"), r["link"], r.get("is_kg")) desteklenir.
+"""
+
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+
+ORGANIC = "organic"
+NEWS = "news"
+KNOWLEDGE_GRAPH = "kg"
+ANSWER = "answer"
+QUESTION = "question"
+
+
+@lru_cache(maxsize=4096)
+def extract_domain(url: str) -> str:
+    """URL'den domain çıkarır (önbellekli, intern edilmiş)"""
+    try:
+        return sys.intern(urlparse(url).netloc.replace("www.", ""))
+    except ValueError:
+        return ""
+
+
+class SearchResult:
+    """Tek bir arama sonucu"""
+
+    __slots__ = ("title", "snippet", "link", "date", "source", "kind", "attributes")
+
+    def __init__(self, title: str = "", snippet: str = "", link: str = "", date: str = "",
+                 source: str = "", kind: str = ORGANIC, attributes: Optional[Dict] = None):
+        self.title = title
+        self.snippet = snippet
+        self.link = link
+        self.date = date
+        self.source = sys.intern(source) if source else ""
+        self.kind = sys.intern(kind)
+        self.attributes = attributes
+
+    @property
+    def is_kg(self) -> bool:
+        return self.kind == KNOWLEDGE_GRAPH
+
+    @property
+    def is_answer(self) -> bool:
+        return self.kind == ANSWER
+
+    @property
+    def is_question(self) -> bool:
+        return self.kind == QUESTION
+
+    # Eski dict tabanlı kod için uyumluluk
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.__slots__ or key in ("is_kg", "is_answer", "is_question"):
+            value = getattr(self, key)
+            return default if value is None else value
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__ or key in ("is_kg", "is_answer", "is_question"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SearchResult):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"SearchResult(kind={self.kind!r}, source={self.source!r}, title={self.title[:40]!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON / önbellek için eski dict biçimi"""
+        data = {
+            "title": self.title,
+            "snippet": self.snippet,
+            "link": self.link,
+            "date": self.date,
+            "source": self.source,
+        }
+        if self.kind == NEWS:
+            data["kind"] = self.kind
+        elif self.kind != ORGANIC:
+            data[f"is_{self.kind}"] = True
+        if self.attributes:
+            data["attributes"] = self.attributes
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchResult":
+        kind = data.get("kind")
+        if not kind:
+            if data.get("is_kg"):
+                kind = KNOWLEDGE_GRAPH
+            elif data.get("is_answer"):
+                kind = ANSWER
+            elif data.get("is_question"):
+                kind = QUESTION
+            else:
+                kind = ORGANIC
+        return cls(
+            title=data.get("title", ""),
+            snippet=data.get("snippet", ""),
+            link=data.get("link", ""),
+            date=data.get("date", ""),
+            source=data.get("source", ""),
+            kind=kind,
+            attributes=data.get("attributes"),
+        )
+
+
+def to_jsonable(value: Any) -> Any:
+    """json.dumps(default=...) için: SearchResult -> dict"""
+    if isinstance(value, SearchResult):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
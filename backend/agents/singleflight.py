@@ -0,0 +1,88 @@
+"""
+ContentForge Single-Flight
+Aynı anda yapılan özdeş çağrıları tek bir çağrıda birleştirir
+
+Aynı anahtarla gelen eş zamanlı çağrılardan yalnızca ilki fonksiyonu
+çalıştırır; diğerleri onun sonucunu (veya hatasını) paylaşır. Paylaşılan
+sonuç aynı nesnedir, çağıranlar tarafından değiştirilmemelidir.
+"""
+
+import threading
+from typing import Any, Callable, Dict
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Süreç içi istek birleştirici"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._counters = {"calls": 0, "executed": 0, "collapsed": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """fn'i anahtar başına aynı anda en fazla bir kez çalıştırır"""
+        with self._lock:
+            self._counters["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._counters["collapsed"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._counters["executed"] += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+        return call.result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._calls)
+        stats["collapse_rate"] = round(stats["collapsed"] / stats["calls"], 3) if stats["calls"] else 0.0
+        return stats
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_group(name: str) -> SingleFlight:
+    """İsimli single-flight grubu (search, images, ...)"""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+def get_singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
@@ -0,0 +1,131 @@
+"""
+ContentForge Topic Normalizer
+Önbellek anahtarları için Türkçe uyumlu konu / sorgu normalizasyonu
+
+"Yapay Zeka", "yapay zeka " ve "YAPAY ZEKA" aynı anahtara düşer.
+str.lower() Türkçe "İ" harfini "i̇" (noktalı birleşik) yapar. Türkçe casefold
+(İ -> i, I -> ı) yalnızca gösterim içindir: anahtarlarda ı ve i tek harfe
+indirilir, böylece "AI" / "ai" ve "ISTANBUL" / "İstanbul" (ASCII klavye) aynı
+anahtara düşer.
+
+İsabet oranı karşılaştırması:
+    python -m agents.topic_normalizer              # contents tablosundan
+    python -m agents.topic_normalizer topics.txt   # satır başına bir konu
+"""
+
+import re
+import sys
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List
+from config.settings import TOPIC_STRIP_SUFFIXES
+
+
+_TURKISH_UPPER = str.maketrans({"İ": "i", "I": "ı"})
+_CIRCUMFLEX = str.maketrans({"â": "a", "î": "i", "û": "u"})
+_DOTLESS_I = str.maketrans({"ı": "i"})
+
+# Harf, rakam ve + / # (c++, c#) dışındaki her şey ayırıcıdır
+_SEPARATOR_RE = re.compile(r"[^\w+#]+", re.UNICODE)
+_WHITESPACE_RE = re.compile(r"\s+", re.UNICODE)
+
+# Uzundan kısaya; yalnızca kök en az MIN_STEM harf kalıyorsa kesilir
+_SUFFIXES = ("ların", "lerin", "ları", "leri", "lar", "ler")
+MIN_STEM = 3
+
+
+def turkish_casefold(text: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevirir (İ -> i, I -> ı); gösterim için"""
+    text = unicodedata.normalize("NFC", text)
+    return text.translate(_TURKISH_UPPER).lower().translate(_CIRCUMFLEX)
+
+
+def key_casefold(text: str) -> str:
+    """Anahtar için casefold: Türkçe casefold + ı -> i (İngilizce kısaltmalar, ASCII yazım)"""
+    return turkish_casefold(text).translate(_DOTLESS_I)
+
+
+def strip_suffix(word: str) -> str:
+    """Kesme işaretinden sonrasını ve çoğul eklerini atar (istanbul'da -> istanbul)"""
+    word = word.split("'", 1)[0].split("’", 1)[0]
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def normalize_query(query: str) -> str:
+    """
+    Arama sorgusu anahtarı: büyük/küçük harf ve boşluk farkları yok sayılır
+
+    Noktalama korunur; tırnaklı sorgu ("..." CEO) arama motoru için farklı anlam taşır.
+    """
+    return _WHITESPACE_RE.sub(" ", key_casefold(query)).strip()
+
+
+@lru_cache(maxsize=4096)
+def canonical_topic(topic: str, strip_suffixes: bool = TOPIC_STRIP_SUFFIXES) -> str:
+    """Konu anahtarı: casefold (ı = i), noktalama -> boşluk, opsiyonel ek atma"""
+    text = turkish_casefold(topic)
+    if strip_suffixes:
+        # Ekler Türkçe yazımla eşleşir (ları / lar), ı -> i sonra
+        text = " ".join(strip_suffix(word) for word in text.split())
+    return " ".join(_SEPARATOR_RE.sub(" ", text.translate(_DOTLESS_I)).split())
+
+
+# ============================================================
+# İSABET ORANI KARŞILAŞTIRMASI
+# ============================================================
+
+def hit_rate(topics: List[str], key_fn: Callable[[str], str]) -> float:
+    """Konular sırayla üretilseydi anahtarın önbellekte bulunma oranı"""
+    if not topics:
+        return 0.0
+    return round(1 - len({key_fn(t) for t in topics}) / len(topics), 3)
+
+
+def compare_hit_rates(topics: Iterable[str]) -> Dict[str, object]:
+    """Farklı anahtar stratejilerinin isabet oranlarını karşılaştırır"""
+    topics = [t for t in topics if t and t.strip()]
+    strategies = {
+        "raw": lambda t: t,
+        "lower_strip": lambda t: t.lower().strip(),
+        "turkish_casefold": lambda t: " ".join(_SEPARATOR_RE.sub(" ", turkish_casefold(t)).split()),
+        "canonical": lambda t: canonical_topic(t, False),
+        "canonical_suffix": lambda t: canonical_topic(t, True),
+    }
+    report = {
+        "topics": len(topics),
+        "hit_rate": {name: hit_rate(topics, fn) for name, fn in strategies.items()},
+    }
+
+    # Yalnızca canonical ile birleşen en sık gruplar (örnek)
+    groups = Counter(canonical_topic(t, False) for t in topics)
+    report["top_merged"] = [
+        {"key": key, "variants": sorted({t for t in topics if canonical_topic(t, False) == key})}
+        for key, _ in groups.most_common(5)
+        if len({t for t in topics if canonical_topic(t, False) == key}) > 1
+    ]
+    return report
+
+
+def load_topics_from_contents(limit: int = 5000) -> List[str]:
+    """contents tablosundaki son konular"""
+    from database.supabase_client import get_supabase
+
+    result = get_supabase().table("contents") \
+        .select("topic") \
+        .order("created_at", desc=True) \
+        .limit(limit) \
+        .execute()
+    return [row["topic"] for row in result.data or []]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as f:
+            sample = [line.rstrip("\n") for line in f]
+    else:
+        sample = load_topics_from_contents()
+    print(compare_hit_rates(sample))
@@ -0,0 +1,184 @@
+"""
+ContentForge Admission Control
+Eş zamanlı üretim sınırı, bekleme kuyruğu ve geri basınç
+
+- En fazla GENERATION_MAX_CONCURRENT pipeline aynı anda çalışır
+- Fazlası GENERATION_MAX_QUEUE uzunluğunda FIFO kuyrukta bekler
+- Kuyruk da doluysa istek hemen reddedilir (503 + Retry-After)
+- SSE istemcileri beklerken sıra numarası değişikliklerini alır
+
+Sınır worker süreci başınadır (uvicorn --workers N ise toplam N katı).
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, Deque, Dict, Optional
+from config.settings import (
+    GENERATION_MAX_CONCURRENT,
+    GENERATION_MAX_QUEUE,
+    GENERATION_RETRY_AFTER,
+)
+
+
+class QueueFull(Exception):
+    """Kapasite ve kuyruk dolu"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Üretim kuyruğu dolu, {retry_after} sn sonra tekrar deneyin")
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """Tek üretimin kuyruk / çalışma hakkı; release() her durumda çağrılmalı"""
+
+    def __init__(self, controller: "AdmissionController", granted: asyncio.Future):
+        self._controller = controller
+        self._granted = granted
+        self._released = False
+        self.enqueued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+
+    @property
+    def granted(self) -> bool:
+        return self._granted.done() and not self._granted.cancelled()
+
+    @property
+    def position(self) -> int:
+        """Kuyruktaki sıra (1'den başlar), çalışıyorsa 0"""
+        return self._controller.position(self)
+
+    async def wait(self):
+        """Çalışma hakkı gelene kadar bekler"""
+        await asyncio.shield(self._granted)
+
+    async def positions(self) -> AsyncGenerator[int, None]:
+        """Sıra değiştikçe yeni sırayı üretir; hak gelince biter"""
+        last = None
+        while not self.granted:
+            position = self.position
+            if position != last:
+                last = position
+                yield position
+            changed = asyncio.ensure_future(self._controller.changed())
+            try:
+                await asyncio.wait({changed, self._granted}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                changed.cancel()
+
+    def release(self):
+        """Kuyruktan çıkar veya çalışma hakkını bırakır (birden fazla çağrılabilir)"""
+        if self._released:
+            return
+        self._released = True
+        self._controller._release(self)
+
+
+class AdmissionController:
+    """Sınırlı eş zamanlılık + sınırlı kuyruk (tek event loop üzerinde)"""
+
+    def __init__(self, max_concurrent: int = GENERATION_MAX_CONCURRENT,
+                 max_queue: int = GENERATION_MAX_QUEUE,
+                 retry_after: int = GENERATION_RETRY_AFTER):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._running = 0
+        self._waiting: Deque[Ticket] = deque()
+        self._changed: Optional[asyncio.Event] = None
+        self._avg_seconds: Optional[float] = None
+        self._counters = {"admitted": 0, "queued": 0, "rejected": 0, "completed": 0, "abandoned": 0}
+
+    def admit(self) -> Ticket:
+        """
+        Hemen çalışma hakkı ya da kuyrukta yer verir
+
+        Raises:
+            QueueFull: Kapasite ve kuyruk doluysa
+        """
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+        ticket = Ticket(self, granted)
+
+        if self._running < self.max_concurrent:
+            self._grant(ticket)
+        elif len(self._waiting) < self.max_queue:
+            self._waiting.append(ticket)
+            self._counters["queued"] += 1
+        else:
+            self._counters["rejected"] += 1
+            raise QueueFull(self.estimate_wait(len(self._waiting) + 1))
+
+        self._counters["admitted"] += 1
+        return ticket
+
+    def position(self, ticket: Ticket) -> int:
+        try:
+            return self._waiting.index(ticket) + 1
+        except ValueError:
+            return 0
+
+    async def changed(self):
+        """Kuyruk bir sonraki değiştiğinde döner"""
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        await self._changed.wait()
+
+    def estimate_wait(self, position: int) -> int:
+        """Kuyruğun 'position'. sırasının yaklaşık bekleme süresi (sn)"""
+        average = self._avg_seconds or self.retry_after
+        rounds = math.ceil(position / self.max_concurrent)
+        return max(1, int(math.ceil(rounds * average)))
+
+    def _grant(self, ticket: Ticket):
+        self._running += 1
+        ticket.started_at = time.monotonic()
+        ticket._granted.set_result(True)
+
+    def _release(self, ticket: Ticket):
+        if ticket.granted:
+            self._running -= 1
+            self._counters["completed"] += 1
+            duration = time.monotonic() - ticket.started_at
+            # Üstel ortalama: Retry-After tahmini için
+            self._avg_seconds = duration if self._avg_seconds is None else 0.8 * self._avg_seconds + 0.2 * duration
+        else:
+            # Sırası gelmeden vazgeçti (bağlantı koptu)
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+            ticket._granted.cancel()
+            self._counters["abandoned"] += 1
+
+        while self._waiting and self._running < self.max_concurrent:
+            self._grant(self._waiting.popleft())
+        self._notify()
+
+    def _notify(self):
+        if self._changed is not None:
+            self._changed.set()
+        self._changed = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._counters)
+        stats.update({
+            "running": self._running,
+            "waiting": len(self._waiting),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "avg_seconds": round(self._avg_seconds, 1) if self._avg_seconds else None,
+        })
+        return stats
+
+
+_admission: Optional[AdmissionController] = None
+
+
+def get_admission() -> AdmissionController:
+    """Süreç genelinde tek üretim kapısı (yalnızca event loop'tan kullanılır)"""
+    global _admission
+
+    if _admission is None:
+        _admission = AdmissionController()
+
+    return _admission
@@ -3,9 +3,20 @@ ContentForge API
 FastAPI uygulaması
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import auth_router, blog_router, user_router
+from api.routes import auth_router, blog_router, user_router, jobs_router
+from api.deps import require_metrics_token
+from agents.search_cache import get_search_cache
+from agents.research_snapshots import get_snapshot_store
+from agents.checkpoints import get_checkpoint_store
+from agents.revalidator import get_revalidator
+from agents.http_client import get_http_stats
+from agents.singleflight import get_singleflight_stats
+from agents.resilience import get_provider_stats
+from api.admission import get_admission
+from api.generations import get_generations
+from jobs.store import get_job_store
 
 # ============================================================
 # APP OLUŞTUR
@@ -44,6 +55,7 @@ app.add_middleware(
 app.include_router(auth_router, prefix="/api")
 app.include_router(blog_router, prefix="/api")
 app.include_router(user_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
 
 
 # ============================================================
@@ -63,3 +75,28 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)])
+def metrics():
+    """
+    Önbellek ve dış servis sayaçları (bu worker süreci için)
+    
+    METRICS_TOKEN ile korunur. Senkron tanımlı: SQLite / Postgres sayımları
+    thread havuzunda çalışır, event loop'u bloklamaz.
+    """
+    cache = get_search_cache()
+    snapshots = get_snapshot_store()
+    checkpoints = get_checkpoint_store()
+    return {
+        "search_cache": cache.stats() if cache else {"enabled": False},
+        "research_snapshots": snapshots.stats() if snapshots else {"enabled": False},
+        "revalidator": get_revalidator().stats(),
+        "generations": get_admission().stats(),
+        "streams": get_generations().stats(),
+        "jobs": get_job_store().stats(),
+        "checkpoints": checkpoints.stats() if checkpoints else {"enabled": False},
+        "http": get_http_stats(),
+        "singleflight": get_singleflight_stats(),
+        "providers": get_provider_stats(),
+    }
@@ -3,11 +3,16 @@ API Dependencies
 Kimlik doğrulama ve ortak bağımlılıklar
 """
 
+import hmac
+from typing import Optional
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from database.supabase_client import get_supabase
+from config.settings import METRICS_TOKEN
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
@@ -22,8 +27,8 @@ async def get_current_user(
     supabase = get_supabase()
     
     try:
-        # Supabase token'ı doğrular ve kullanıcıyı döner
-        response = supabase.auth.get_user(token)
+        # Supabase token'ı doğrular ve kullanıcıyı döner (senkron istemci, thread havuzunda)
+        response = await run_in_threadpool(supabase.auth.get_user, token)
         
         if not response.user:
             raise HTTPException(
@@ -41,3 +46,22 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Kimlik doğrulama başarısız"
         )
+
+
+def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """
+    /metrics gibi iç endpoint'ler için admin token kontrolü.
+    METRICS_TOKEN tanımlı değilse endpoint yokmuş gibi 404 döner.
+    """
+    
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    
+    if credentials is None or not hmac.compare_digest(credentials.credentials, METRICS_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Geçersiz metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
@@ -0,0 +1,157 @@
+"""
+ContentForge Generations
+Bağlantıdan bağımsız çalışan üretimler ve yeniden bağlanılabilir event log'ları
+
+Her create-stream isteği bir Generation oluşturur; pipeline arka plan
+görevinde çalışır ve event'lerini sınırlı bir log'a (GENERATION_EVENT_LOG_SIZE)
+1'den artan seq ile yazar. SSE bağlantısı yalnızca bu log'u okur:
+
+- Bağlantı koparsa üretim devam eder
+- İstemci Last-Event-ID ("<generation_id>:<seq>") ile yeniden bağlanınca
+  kaçırdığı event'ler tekrar gönderilir, sonra canlı akışa devam edilir
+- Biten üretimler GENERATION_RETENTION saniye sonra bellekten silinir
+- Başarısız üretim resume_id ile yeniden denenebilir: yeni deneme yeni bir akış
+  id'si alır (event id'leri her akışta 1'den artar, eski Last-Event-ID'ler
+  karışmaz), pipeline checkpoint anahtarı (checkpoint_id) ise korunur ve
+  tamamlanan aşamalar atlanır. Aynı checkpoint_id ile iki üretim aynı anda
+  çalışamaz.
+
+Kayıt worker süreci başınadır; çok süreçli kurulumda kalıcı akış için /api/jobs.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncGenerator, Deque, Dict, Optional, Tuple
+from config.settings import GENERATION_EVENT_LOG_SIZE, GENERATION_RETENTION
+
+
+class Generation:
+    """Tek üretimin event log'u"""
+
+    def __init__(self, user_id: str, max_events: int = GENERATION_EVENT_LOG_SIZE,
+                 checkpoint_id: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        # Yeniden denemelerde ilk üretimin id'si (checkpoint anahtarı, resume_id)
+        self.checkpoint_id = checkpoint_id or self.id
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._log: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=max(1, max_events))
+        self._seq = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        """Event'i log'a ekler, bekleyen akışları uyandırır"""
+        self._seq += 1
+        self._log.append((self._seq, event))
+        self._wake()
+        return self._seq
+
+    def finish(self):
+        self.finished_at = time.time()
+        self._wake()
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def events(self, after: int = 0) -> AsyncGenerator[Tuple[int, Dict[str, Any]], None]:
+        """
+        seq > after olan event'leri (log'da kalanları) verir, sonra yenilerini bekler
+
+        Üretim bitip log tükenince biter.
+        """
+        while True:
+            changed = self._changed
+            for seq, event in list(self._log):
+                if seq > after:
+                    after = seq
+                    yield seq, event
+            if self.finished and after >= self._seq:
+                return
+            if after >= self._seq:
+                await changed.wait()
+
+
+class GenerationRegistry:
+    """Süreçteki üretimler (id -> Generation)"""
+
+    def __init__(self, retention: int = GENERATION_RETENTION):
+        self.retention = retention
+        self._generations: Dict[str, Generation] = {}
+
+    def create(self, user_id: str, checkpoint_id: Optional[str] = None) -> Generation:
+        """
+        Yeni üretim; checkpoint_id verilirse (resume_id) o üretimin yeniden denemesi
+
+        Raises:
+            ValueError: Aynı checkpoint_id ile üretim hâlâ sürüyor
+        """
+        self.cleanup()
+        if checkpoint_id and any(
+            not generation.finished and generation.user_id == user_id
+            and generation.checkpoint_id == checkpoint_id
+            for generation in self._generations.values()
+        ):
+            raise ValueError("Bu üretim hâlâ sürüyor")
+        generation = Generation(user_id, checkpoint_id=checkpoint_id)
+        self._generations[generation.id] = generation
+        return generation
+
+    def get(self, generation_id: str, user_id: str) -> Optional[Generation]:
+        """Kullanıcının üretimi (başkasınınsa veya silindiyse None)"""
+        generation = self._generations.get(generation_id)
+        if generation is None or generation.user_id != user_id:
+            return None
+        return generation
+
+    def cleanup(self) -> int:
+        """Saklama süresi dolan bitmiş üretimleri siler"""
+        cutoff = time.time() - self.retention
+        expired = [
+            generation_id for generation_id, generation in self._generations.items()
+            if generation.finished and generation.finished_at < cutoff
+        ]
+        for generation_id in expired:
+            del self._generations[generation_id]
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        running = sum(1 for generation in self._generations.values() if not generation.finished)
+        return {"running": running, "retained": len(self._generations) - running}
+
+
+def parse_event_id(value: Optional[str]) -> Tuple[Optional[str], int]:
+    """
+    Last-Event-ID çözümlemesi
+
+    "<generation_id>:<seq>" -> (generation_id, seq), "<seq>" -> (None, seq),
+    geçersiz veya boş -> (None, 0)
+    """
+    if not value:
+        return None, 0
+    generation_id, _, seq = value.strip().rpartition(":")
+    try:
+        return generation_id or None, max(0, int(seq))
+    except ValueError:
+        return None, 0
+
+
+_registry: Optional[GenerationRegistry] = None
+
+
+def get_generations() -> GenerationRegistry:
+    """Süreç genelinde tek üretim kaydı (yalnızca event loop'tan kullanılır)"""
+    global _registry
+
+    if _registry is None:
+        _registry = GenerationRegistry()
+
+    return _registry
@@ -0,0 +1,129 @@
+"""
+ContentForge Load Test
+Eş zamanlı blog üretimleri sırasında diğer endpoint'lerin yanıt süresini ölçer
+
+N adet /api/blog/create-stream isteği aynı anda başlatılır; üretimler sürerken
+/health düzenli aralıklarla çağrılır. Pipeline event loop'u blokluyorsa /health
+gecikmesi üretim süresine yaklaşır, bloklamıyorsa milisaniyeler içinde kalır.
+
+Not: Üretimler gerçek kullanıcı kotasından düşer ve içerik kaydedilir.
+
+Kullanım (API çalışırken):
+    python -m api.load_test --token <JWT> --generations 3
+    LOAD_TEST_TOKEN=<JWT> python -m api.load_test --base-url http://localhost:8000
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+import requests
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Sıralı değerlerde en yakın sıra yöntemiyle yüzdelik"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_generation(base_url: str, token: str, topic: str, length: str) -> Dict[str, Any]:
+    """Tek SSE üretimini sonuna kadar okur"""
+    started = time.perf_counter()
+    result = {"status": "error", "events": 0, "first_event": None}
+
+    try:
+        response = requests.post(
+            f"{base_url}/api/blog/create-stream",
+            json={"topic": topic, "length": length},
+            headers={"Authorization": f"Bearer {token}"},
+            stream=True,
+            timeout=600
+        )
+        if response.status_code != 200:
+            result["status"] = f"http {response.status_code}"
+            return result
+
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data: "):
+                continue
+            event = json.loads(line[len("data: "):])
+            result["events"] += 1
+            if result["first_event"] is None:
+                result["first_event"] = round(time.perf_counter() - started, 3)
+            if event["type"] in ("final", "error"):
+                result["status"] = event["type"]
+    except Exception as e:
+        result["status"] = f"hata: {e}"
+    finally:
+        result["seconds"] = round(time.perf_counter() - started, 3)
+
+    return result
+
+
+def run(base_url: str, token: str, generations: int = 3, topic: str = "Yapay zeka ve e-ticaret",
+        length: str = "short", interval: float = 0.2) -> Dict[str, Any]:
+    """
+    Üretimleri başlatır, bitene kadar /health gecikmesini örnekler
+
+    Returns:
+        {"health": {samples, p50_ms, p95_ms, max_ms, errors}, "generations": [...]}
+    """
+    results: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+
+    def worker(index: int):
+        outcome = run_generation(base_url, token, f"{topic} {index + 1}" if generations > 1 else topic, length)
+        with lock:
+            results.append(outcome)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(generations)]
+    for thread in threads:
+        thread.start()
+
+    latencies = []
+    errors = 0
+    session = requests.Session()
+    while any(thread.is_alive() for thread in threads):
+        started = time.perf_counter()
+        try:
+            session.get(f"{base_url}/health", timeout=30).raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except Exception:
+            errors += 1
+        time.sleep(interval)
+
+    return {
+        "health": {
+            "samples": len(latencies),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "max_ms": round(max(latencies, default=0.0), 1),
+            "errors": errors,
+        },
+        "generations": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Üretim sırasında /health gecikmesini ölçer")
+    parser.add_argument("--base-url", default=os.getenv("LOAD_TEST_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--token", default=os.getenv("LOAD_TEST_TOKEN", ""), help="Supabase erişim token'ı")
+    parser.add_argument("--generations", type=int, default=3, help="Eş zamanlı üretim sayısı")
+    parser.add_argument("--topic", default="Yapay zeka ve e-ticaret")
+    parser.add_argument("--length", default="short")
+    parser.add_argument("--interval", type=float, default=0.2, help="/health örnekleme aralığı (sn)")
+    parser.add_argument("--max-p95-ms", type=float, default=500, help="Bu değer aşılırsa çıkış kodu 1")
+    args = parser.parse_args()
+
+    if not args.token:
+        parser.error("--token veya LOAD_TEST_TOKEN gerekli")
+
+    report = run(args.base_url, args.token, args.generations, args.topic, args.length, args.interval)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(1 if report["health"]["p95_ms"] > args.max_p95_ms else 0)
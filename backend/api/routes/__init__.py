@@ -1,3 +1,4 @@
 from .auth import router as auth_router
 from .blog import router as blog_router
 from .user import router as user_router
+from .jobs import router as jobs_router
@@ -3,15 +3,21 @@ Blog Routes
 İçerik oluşturma ve yönetim + SSE streaming
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
 import json
 from datetime import datetime, timezone
 from api.deps import get_current_user
-from database.supabase_client import get_supabase
-from agents.blog_agents import run_blog_pipeline, run_blog_pipeline_streaming, get_agents_info, AGENTS
+from database.supabase_client import get_supabase, save_content
+from agents.blog_agents import run_blog_pipeline_async, run_blog_pipeline_async_streaming, get_agents_info, AGENTS
+from agents.search_result import to_jsonable
+from agents.checkpoints import checkpoint_key, delete_checkpoints
+from api.admission import QueueFull, Ticket, get_admission
+from api.generations import Generation, get_generations, parse_event_id
 from config.settings import FREE_MONTHLY_LIMIT, PRO_MONTHLY_LIMIT
 
 router = APIRouter(prefix="/blog", tags=["blog"])
@@ -27,6 +33,10 @@ class BlogCreateRequest(BaseModel):
     tone: str = "friendly"     # formal, friendly, educational, persuasive
     length: str = "medium"     # short (500), medium (1000), long (2000+)
     format_type: str = "standard"  # standard, listicle, howto, comparison, casestudy
+    reuse_research: bool = True    # Konunun araştırma snapshot'ını kullan
+    refresh_stale: bool = True     # Snapshot'taki bayat katmanları arka planda yenile
+    research_depth: Optional[str] = None  # quick, standard, deep (boşsa uzunluk ve plana göre)
+    resume_id: Optional[str] = None       # Başarısız üretimin / işin id'si: tamamlanan aşamalardan devam
     
     class Config:
         json_schema_extra = {
@@ -100,18 +110,30 @@ def get_monthly_usage(user_id: str) -> int:
     return result.count or 0
 
 
-def check_usage_limit(user_id: str) -> tuple[bool, int, int]:
+def check_usage_limit(user_id: str, plan: Optional[str] = None) -> tuple[bool, int, int]:
     """
     Kullanım limitini kontrol eder.
     Returns: (limit_aşıldı_mı, kullanılan, limit)
     """
-    plan = get_user_plan(user_id)
+    plan = plan or get_user_plan(user_id)
     usage = get_monthly_usage(user_id)
     limit = PRO_MONTHLY_LIMIT if plan == "pro" else FREE_MONTHLY_LIMIT
     
     return (usage >= limit, usage, limit)
 
 
+def admit_generation() -> Ticket:
+    """Üretim kuyruğuna alır; kapasite ve kuyruk doluysa hemen 503 + Retry-After"""
+    try:
+        return get_admission().admit()
+    except QueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
 # ============================================================
 # ENDPOINT'LER
 # ============================================================
@@ -127,8 +149,9 @@ async def create_blog(
     
     user_id = current_user["id"]
     
-    # Limit kontrolü
-    limit_exceeded, usage, limit = check_usage_limit(user_id)
+    # Limit kontrolü (senkron Supabase çağrıları thread havuzunda)
+    plan = await run_in_threadpool(get_user_plan, user_id)
+    limit_exceeded, usage, limit = await run_in_threadpool(check_usage_limit, user_id, plan)
     
     if limit_exceeded:
         raise HTTPException(
@@ -136,35 +159,47 @@ async def create_blog(
             detail=f"Aylık limit doldu ({usage}/{limit}). Pro plana geçin."
         )
     
+    ticket = admit_generation()
     try:
-        # Blog oluştur - zengin parametrelerle
-        results = run_blog_pipeline(
+        # Aynı resume_id ile süren üretim varsa (stream veya değil) ikinci kopya başlamaz
+        generation = get_generations().create(user_id, request.resume_id)
+    except ValueError as e:
+        ticket.release()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    generation_id = generation.checkpoint_id
+    checkpoint_id = checkpoint_key(user_id, generation_id)
+    
+    try:
+        # Sıra gelene kadar bekle
+        await ticket.wait()
+        
+        # Blog oluştur - zengin parametrelerle (event loop'u bloklamaz)
+        results = await run_blog_pipeline_async(
             topic=request.topic,
             audience=request.audience,
             tone=request.tone,
             length=request.length,
             format_type=request.format_type,
-            verbose=True
+            reuse_research=request.reuse_research,
+            refresh_stale=request.refresh_stale,
+            research_depth=request.research_depth,
+            user_plan=plan,
+            checkpoint_id=checkpoint_id
         )
         content = results["final"]
         quality = results.get("quality")
         
         # Veritabanına kaydet
-        supabase = get_supabase()
+        saved = await run_in_threadpool(save_content, user_id, request.topic, content)
         
-        insert_result = supabase.table("contents").insert({
-            "user_id": user_id,
-            "topic": request.topic,
-            "content": content,
-        }).execute()
-        
-        if not insert_result.data:
+        if not saved:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="İçerik kaydedilemedi"
+                detail="İçerik kaydedilemedi",
+                headers={"X-Generation-Id": generation_id}
             )
         
-        saved = insert_result.data[0]
+        await run_in_threadpool(delete_checkpoints, checkpoint_id)
         
         return BlogResponse(
             id=saved["id"],
@@ -177,10 +212,15 @@ async def create_blog(
     except HTTPException:
         raise
     except Exception as e:
+        # resume_id=X-Generation-Id ile tekrar denenirse kaydedilen aşamalardan devam edilir
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Blog oluşturma hatası: {str(e)}"
+            detail=f"Blog oluşturma hatası: {str(e)}",
+            headers={"X-Generation-Id": generation_id}
         )
+    finally:
+        generation.finish()
+        ticket.release()
 
 
 @router.get("/history", response_model=BlogListResponse)
@@ -312,82 +352,90 @@ async def get_agents():
 # STREAMING BLOG OLUŞTURMA (SSE)
 # ============================================================
 
-@router.post("/create-stream")
-async def create_blog_stream(
-    request: BlogCreateRequest,
-    current_user: dict = Depends(get_current_user)
-):
+async def run_generation(generation: Generation, ticket: Ticket, request: BlogCreateRequest,
+                         user_id: str, plan: str):
     """
-    SSE ile blog oluşturur. Her agent aşamasında event gönderir.
+    Pipeline'ı bağlantıdan bağımsız çalıştırır, event'leri üretimin log'una yazar
     """
     
-    user_id = current_user["id"]
-    
-    # Limit kontrolü
-    limit_exceeded, usage, limit = check_usage_limit(user_id)
-    
-    if limit_exceeded:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Aylık limit doldu ({usage}/{limit}). Pro plana geçin."
-        )
+    final_content = None
+    final_quality = None
+    checkpoint_id = checkpoint_key(user_id, generation.checkpoint_id)
     
-    async def event_generator():
-        """SSE event generator"""
+    try:
+        # Kapasite doluysa sıra değiştikçe bildir
+        async for position in ticket.positions():
+            generation.publish({
+                "type": "queued",
+                "message": f"Sırada bekleniyor ({position}. sıra)",
+                "data": {
+                    "position": position,
+                    "estimated_wait": get_admission().estimate_wait(position)
+                }
+            })
         
-        final_content = None
-        final_quality = None
+        async for event in run_blog_pipeline_async_streaming(
+            topic=request.topic,
+            audience=request.audience,
+            tone=request.tone,
+            length=request.length,
+            format_type=request.format_type,
+            reuse_research=request.reuse_research,
+            refresh_stale=request.refresh_stale,
+            research_depth=request.research_depth,
+            user_plan=plan,
+            checkpoint_id=checkpoint_id
+        ):
+            generation.publish(event)
+            
+            # Final event'te içeriği kaydet
+            if event["type"] == "final":
+                final_content = event["data"]["content"]
+                final_quality = event["data"]["quality"]
         
-        try:
-            for event in run_blog_pipeline_streaming(
-                topic=request.topic,
-                audience=request.audience,
-                tone=request.tone,
-                length=request.length,
-                format_type=request.format_type
-            ):
-                # Event'i SSE formatına çevir
-                event_data = json.dumps(event, ensure_ascii=False)
-                yield f"data: {event_data}\n\n"
-                
-                # Final event'te içeriği kaydet
-                if event["type"] == "final":
-                    final_content = event["data"]["content"]
-                    final_quality = event["data"]["quality"]
+        # Veritabanına kaydet
+        if final_content:
+            blog_data = await run_in_threadpool(save_content, user_id, request.topic, final_content)
+            
+            if not blog_data:
+                raise RuntimeError("İçerik kaydedilemedi")
+            
+            await run_in_threadpool(delete_checkpoints, checkpoint_id)
             
-            # Veritabanına kaydet
-            if final_content:
-                supabase = get_supabase()
-                
-                insert_result = supabase.table("contents").insert({
-                    "user_id": user_id,
+            # Kaydedildi event'i
+            generation.publish({
+                "type": "saved",
+                "message": "Blog kaydedildi",
+                "data": {
+                    "id": blog_data["id"],
                     "topic": request.topic,
                     "content": final_content,
-                }).execute()
-                
-                if insert_result.data:
-                    blog_data = insert_result.data[0]
-                    
-                    # Kaydedildi event'i
-                    saved_event = {
-                        "type": "saved",
-                        "message": "Blog kaydedildi",
-                        "data": {
-                            "id": blog_data["id"],
-                            "topic": request.topic,
-                            "content": final_content,
-                            "created_at": blog_data["created_at"],
-                            "quality": final_quality
-                        }
-                    }
-                    yield f"data: {json.dumps(saved_event, ensure_ascii=False)}\n\n"
-        
-        except Exception as e:
-            error_event = {
-                "type": "error",
-                "message": str(e)
-            }
-            yield f"data: {json.dumps(error_event, ensure_ascii=False)}\n\n"
+                    "created_at": blog_data["created_at"],
+                    "quality": final_quality
+                }
+            })
+    
+    except Exception as e:
+        # resume_id ile tekrar denenirse tamamlanan aşamalar atlanır
+        generation.publish({
+            "type": "error",
+            "message": str(e),
+            "data": {"resume_id": generation.checkpoint_id}
+        })
+    
+    finally:
+        ticket.release()
+        generation.finish()
+
+
+def stream_generation(generation: Generation, after: int = 0) -> StreamingResponse:
+    """Üretimin log'unu after'dan itibaren SSE olarak akıtır (id: <generation_id>:<seq>)"""
+    
+    async def event_generator():
+        """SSE event generator"""
+        async for seq, event in generation.events(after):
+            event_data = json.dumps(event, ensure_ascii=False, default=to_jsonable)
+            yield f"id: {generation.id}:{seq}\ndata: {event_data}\n\n"
     
     return StreamingResponse(
         event_generator(),
@@ -395,6 +443,84 @@ async def create_blog_stream(
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
+            "X-Accel-Buffering": "no",
+            "X-Generation-Id": generation.id
         }
     )
+
+
+@router.post("/create-stream")
+async def create_blog_stream(
+    request: BlogCreateRequest,
+    current_user: dict = Depends(get_current_user),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    SSE ile blog oluşturur. Her agent aşamasında event gönderir.
+    
+    Last-Event-ID ile tekrar gönderilirse yeni üretim başlatılmaz; aynı
+    üretimin kaçırılan event'leri gönderilip akışa devam edilir.
+    
+    Hata event'indeki resume_id ile gönderilirse kaydedilen aşamalar (araştırma,
+    taslak, ...) atlanır; yeni deneme yeni bir akış id'si (X-Generation-Id) alır.
+    """
+    
+    user_id = current_user["id"]
+    generations = get_generations()
+    
+    # Yeniden bağlanma: kota harcamadan mevcut üretime bağlan
+    generation_id, after = parse_event_id(last_event_id)
+    if generation_id:
+        generation = generations.get(generation_id, user_id)
+        if not generation:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Üretim bulunamadı veya süresi doldu"
+            )
+        return stream_generation(generation, after)
+    
+    # Limit kontrolü (senkron Supabase çağrıları thread havuzunda)
+    plan = await run_in_threadpool(get_user_plan, user_id)
+    limit_exceeded, usage, limit = await run_in_threadpool(check_usage_limit, user_id, plan)
+    
+    if limit_exceeded:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Aylık limit doldu ({usage}/{limit}). Pro plana geçin."
+        )
+    
+    ticket = admit_generation()
+    
+    try:
+        generation = generations.create(user_id, request.resume_id)
+    except ValueError as e:
+        ticket.release()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    
+    generation.task = asyncio.create_task(run_generation(generation, ticket, request, user_id, plan))
+    
+    return stream_generation(generation)
+
+
+@router.get("/stream/{generation_id}")
+async def resume_blog_stream(
+    generation_id: str,
+    after: int = 0,
+    current_user: dict = Depends(get_current_user),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Süren (veya yeni biten) üretimin akışına yeniden bağlanır.
+    Last-Event-ID header'ı veya after parametresinden sonraki event'ler gönderilir.
+    """
+    
+    generation = get_generations().get(generation_id, current_user["id"])
+    
+    if not generation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Üretim bulunamadı veya süresi doldu"
+        )
+    
+    _, seq = parse_event_id(last_event_id)
+    return stream_generation(generation, max(after, seq))
@@ -0,0 +1,153 @@
+"""
+Job Routes
+Arka plan blog üretimi: iş gönder, durumunu sorgula, event'lerini izle
+
+Üretim API sürecinde değil jobs.worker süreçlerinde çalışır; bağlantı kopsa da
+iş devam eder, istemci event akışına istediği yerden yeniden bağlanabilir.
+"""
+
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from api.deps import get_current_user
+from api.generations import parse_event_id
+from api.routes.blog import BlogCreateRequest, get_user_plan, check_usage_limit
+from agents.checkpoints import checkpoint_key
+from jobs.store import DONE, FINISHED, get_job_store
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Event akışında yeni event kontrol aralığı (sn)
+EVENT_POLL_INTERVAL = 0.5
+
+
+# ============================================================
+# YARDIMCI FONKSİYONLAR
+# ============================================================
+
+def get_user_job(job_id: str, user_id: str) -> dict:
+    """Kullanıcının işini getirir, yoksa 404"""
+    job = get_job_store().get(job_id)
+
+    if not job or job["user_id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="İş bulunamadı"
+        )
+
+    return job
+
+
+def job_status(job: dict) -> dict:
+    store = get_job_store()
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "topic": job["params"]["topic"],
+        "position": store.position(job["id"]),
+        "attempts": job["attempts"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "result": job["result"],
+        "error": job["error"] if job["status"] != DONE else None,
+    }
+
+
+def submit_job(user_id: str, request: BlogCreateRequest) -> dict:
+    """Kota kontrolü (bekleyen işler dahil) + kuyruğa ekleme"""
+    store = get_job_store()
+    plan = get_user_plan(user_id)
+    _, usage, limit = check_usage_limit(user_id, plan)
+    active = store.count_active(user_id)
+
+    if usage + active >= limit:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Aylık limit doldu ({usage}/{limit}, {active} iş bekliyor). Pro plana geçin."
+        )
+
+    params = request.model_dump()
+    params["user_plan"] = plan
+    
+    # Başarısız işin checkpoint'lerinden devam (zincirleme denemelerde ilk işin anahtarı)
+    resume_id = params.pop("resume_id")
+    if resume_id:
+        previous = get_user_job(resume_id, user_id)
+        params["checkpoint_id"] = previous["params"].get("checkpoint_id") or checkpoint_key(user_id, resume_id)
+    job_id = store.submit(user_id, params)
+    return job_status(store.get(job_id))
+
+
+# ============================================================
+# ENDPOINT'LER
+# ============================================================
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    request: BlogCreateRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Blog üretim işini kuyruğa ekler, iş id'sini hemen döndürür.
+    """
+    return await run_in_threadpool(submit_job, current_user["id"], request)
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    İşin durumunu döndürür (queued / running / done / failed).
+    """
+    job = await run_in_threadpool(get_user_job, job_id, current_user["id"])
+    return await run_in_threadpool(job_status, job)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    after: int = 0,
+    current_user: dict = Depends(get_current_user),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    İşin event'lerini SSE ile akıtır (after veya Last-Event-ID'den sonrakiler).
+    İş bitip son event gönderilince akış kapanır.
+    """
+    await run_in_threadpool(get_user_job, job_id, current_user["id"])
+    store = get_job_store()
+    _, resume_seq = parse_event_id(last_event_id)
+
+    async def event_generator():
+        last = max(after, resume_seq)
+
+        while True:
+            events = await run_in_threadpool(store.events, job_id, last)
+            for seq, event in events:
+                last = seq
+                yield f"id: {seq}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+            if not events:
+                job = await run_in_threadpool(store.get, job_id)
+                if job["status"] in FINISHED:
+                    # Bitişten hemen önce yazılan event kalmadıysa çık
+                    if not await run_in_threadpool(store.events, job_id, last):
+                        break
+                    continue
+                await asyncio.sleep(EVENT_POLL_INTERVAL)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -5,6 +5,7 @@ from .settings import (
     SUPABASE_KEY,
     DEFAULT_MODEL,
     SEARCH_RESULTS_COUNT,
+    RESEARCH_MAX_WORKERS,
     FREE_MONTHLY_LIMIT,
     PRO_MONTHLY_LIMIT,
     OUTPUT_DIR,
@@ -11,11 +11,113 @@ SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")  # anon/public key
 
+# /metrics erişimi (Authorization: Bearer <token>); boşsa endpoint kapalı
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 # Model ayarları
 DEFAULT_MODEL = "llama-3.3-70b-versatile"
 
 # Web Search ayarları
 SEARCH_RESULTS_COUNT = 5
+SERPER_BASE_URL = os.getenv("SERPER_BASE_URL", "https://google.serper.dev")
+SERPER_BATCH_SIZE = int(os.getenv("SERPER_BATCH_SIZE", "100"))  # Batch isteği başına sorgu
+
+# Araştırma ayarları
+RESEARCH_MAX_WORKERS = int(os.getenv("RESEARCH_MAX_WORKERS", "0"))  # Araştırma thread havuzu (0: CONCURRENCY_SERPER_MAX)
+RESEARCH_BATCH_MODE = os.getenv("RESEARCH_BATCH_MODE", "off")        # off / layer / request
+# Katman doygunluğunda erken durma: ilk dalgada yeni kaynak gelmiyorsa kalan sorgular atlanır, gelmişse hepsi ikinci dalgada çalışır
+RESEARCH_EARLY_STOP = os.getenv("RESEARCH_EARLY_STOP", "true").lower() == "true"
+RESEARCH_INITIAL_QUERIES = int(os.getenv("RESEARCH_INITIAL_QUERIES", "2"))        # Katman başına ilk dalga
+RESEARCH_MIN_NEW_SOURCES = int(os.getenv("RESEARCH_MIN_NEW_SOURCES", "1"))        # Sorgu bundan az yeni URL getirirse dur
+RESEARCH_SATURATION_FACTOR = float(os.getenv("RESEARCH_SATURATION_FACTOR", "1.5"))  # limit * faktör URL'de dur
+
+# Pipeline aşamaları (araştırma ∥ görsel, kalite ∥ bölüm görselleri) için eş zamanlı aşama sınırı
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "4"))
+
+# Üretim kabulü (worker süreci başına): eş zamanlı pipeline, bekleme kuyruğu, 503 Retry-After
+GENERATION_MAX_CONCURRENT = int(os.getenv("GENERATION_MAX_CONCURRENT", "4"))
+GENERATION_MAX_QUEUE = int(os.getenv("GENERATION_MAX_QUEUE", "20"))
+GENERATION_RETRY_AFTER = int(os.getenv("GENERATION_RETRY_AFTER", "60"))   # Süre ölçülene kadar tahmini üretim süresi (sn)
+GENERATION_EVENT_LOG_SIZE = int(os.getenv("GENERATION_EVENT_LOG_SIZE", "500"))  # Üretim başına saklanan event (Last-Event-ID)
+GENERATION_RETENTION = int(os.getenv("GENERATION_RETENTION", "600"))            # Biten üretimin log'u kaç sn tutulur
+
+# Arka plan iş kuyruğu (python -m jobs.worker): SQLite CACHE_DIR/jobs.sqlite3
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))                        # Worker süreci sayısı
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))        # Boş kuyrukta bekleme (sn)
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "60"))           # Heartbeat gelmezse iş yeniden kuyruğa
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_DATABASE_URL = os.getenv("JOB_DATABASE_URL", "")                   # postgresql://... ise çok makineli Postgres kuyruğu
+
+# Aşama checkpoint'leri: başarısız üretim aynı id ile tekrar denenince tamamlanan aşamalardan devam eder
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+CHECKPOINT_TTL = int(os.getenv("CHECKPOINT_TTL", str(24 * 60 * 60)))   # 1 gün
+
+# HTTP bağlantı havuzu
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))   # Host havuzu sayısı
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))           # Host başına bağlantı
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_HOST_LIMITS = os.getenv("HTTP_HOST_LIMITS", "google.serper.dev=16,api.unsplash.com=4")
+
+# Dış servis hız sınırları: (saniyede istek, burst)
+PROVIDER_RATE_LIMITS = {
+    "serper": (float(os.getenv("RATE_LIMIT_SERPER", "10")), float(os.getenv("RATE_LIMIT_SERPER_BURST", "20"))),
+    "unsplash": (float(os.getenv("RATE_LIMIT_UNSPLASH", "1.4")), float(os.getenv("RATE_LIMIT_UNSPLASH_BURST", "10"))),
+    "groq": (float(os.getenv("RATE_LIMIT_GROQ", "0.5")), float(os.getenv("RATE_LIMIT_GROQ_BURST", "5"))),
+}
+
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "30"))       # Token / Retry-After için en fazla bekleme
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "2"))    # 429 sonrası tekrar deneme
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# Adaptif eş zamanlılık: (başlangıç, min, max, hedef p95 gecikme saniye)
+PROVIDER_CONCURRENCY = {
+    "serper": (int(os.getenv("CONCURRENCY_SERPER", "8")), 2, int(os.getenv("CONCURRENCY_SERPER_MAX", "32")),
+               float(os.getenv("LATENCY_TARGET_SERPER", "3"))),
+    "unsplash": (4, 1, int(os.getenv("CONCURRENCY_UNSPLASH_MAX", "8")),
+                 float(os.getenv("LATENCY_TARGET_UNSPLASH", "3"))),
+    "groq": (int(os.getenv("CONCURRENCY_GROQ", "4")), 1, int(os.getenv("CONCURRENCY_GROQ_MAX", "16")),
+             float(os.getenv("LATENCY_TARGET_GROQ", "45"))),
+}
+ADAPTIVE_WINDOW = int(os.getenv("ADAPTIVE_WINDOW", "20"))  # Kaç istekte bir sınır güncellenir
+
+# Önbellek ayarları
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "20000"))
+SEARCH_CACHE_TTL_NEWS = int(os.getenv("SEARCH_CACHE_TTL_NEWS", str(60 * 60)))              # 1 saat
+SEARCH_CACHE_TTL_EVERGREEN = int(os.getenv("SEARCH_CACHE_TTL_EVERGREEN", str(7 * 24 * 60 * 60)))  # 7 gün
+# TTL dolduktan sonra kaydın bayat olarak sunulup arka planda yenilendiği ek süre
+SEARCH_CACHE_STALE_NEWS = int(os.getenv("SEARCH_CACHE_STALE_NEWS", str(6 * 60 * 60)))          # 6 saat
+SEARCH_CACHE_STALE_EVERGREEN = int(os.getenv("SEARCH_CACHE_STALE_EVERGREEN", str(30 * 24 * 60 * 60)))  # 30 gün
+
+# Arka plan yenileme (stale-while-revalidate)
+REVALIDATE_MAX_CONCURRENT = int(os.getenv("REVALIDATE_MAX_CONCURRENT", "2"))
+REVALIDATE_MAX_PENDING = int(os.getenv("REVALIDATE_MAX_PENDING", "100"))
+
+# Konu normalizasyonu: önbellek anahtarlarında çoğul / kesme işareti eklerini at
+TOPIC_STRIP_SUFFIXES = os.getenv("TOPIC_STRIP_SUFFIXES", "false").lower() == "true"
+
+# Görsel önbelleği ve eş zamanlılığı (Unsplash)
+IMAGE_CACHE_TTL = int(os.getenv("IMAGE_CACHE_TTL", str(7 * 24 * 60 * 60)))   # 7 gün
+IMAGE_CACHE_MAX_ENTRIES = int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", "5000"))
+IMAGE_MAX_WORKERS = int(os.getenv("IMAGE_MAX_WORKERS", "4"))
+IMAGE_SECTION_LIMIT = int(os.getenv("IMAGE_SECTION_LIMIT", "5"))          # En fazla kaç bölüme görsel
+
+# Araştırma snapshot'ları (aynı konu için farklı format / yeniden üretim)
+RESEARCH_SNAPSHOT_ENABLED = os.getenv("RESEARCH_SNAPSHOT_ENABLED", "true").lower() == "true"
+RESEARCH_SNAPSHOT_MAX_ENTRIES = int(os.getenv("RESEARCH_SNAPSHOT_MAX_ENTRIES", "2000"))
+RESEARCH_SNAPSHOT_TTL_NEWS = int(os.getenv("RESEARCH_SNAPSHOT_TTL_NEWS", str(6 * 60 * 60)))      # 6 saat
+RESEARCH_SNAPSHOT_TTL = int(os.getenv("RESEARCH_SNAPSHOT_TTL", str(7 * 24 * 60 * 60)))           # 7 gün
+RESEARCH_SNAPSHOT_STALE_NEWS = int(os.getenv("RESEARCH_SNAPSHOT_STALE_NEWS", str(24 * 60 * 60)))     # 1 gün
+RESEARCH_SNAPSHOT_STALE = int(os.getenv("RESEARCH_SNAPSHOT_STALE", str(30 * 24 * 60 * 60)))          # 30 gün
+
+# Popüler konu ön ısıtma (python -m agents.prewarm, cron ile)
+PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", "20"))
+PREWARM_LOOKBACK_DAYS = int(os.getenv("PREWARM_LOOKBACK_DAYS", "7"))
+PREWARM_QUERY_BUDGET = int(os.getenv("PREWARM_QUERY_BUDGET", "300"))    # Çalıştırma başına Serper sorgusu
+PREWARM_HOURS = os.getenv("PREWARM_HOURS", "23-3")                      # UTC saat aralığı (TR 02-06)
 
 # Kullanım limitleri
 FREE_MONTHLY_LIMIT = 3
@@ -65,6 +65,55 @@ FROM auth.users
 WHERE id NOT IN (SELECT id FROM profiles)
 ON CONFLICT (id) DO NOTHING;
 
+-- 6. Üretim işleri (opsiyonel, JOB_DATABASE_URL ile çok makineli worker'lar)
+-- Worker'lar bu tablolara doğrudan Postgres bağlantısıyla erişir; RLS açık ve
+-- policy yok, yani anon / authenticated istemciler okuyamaz.
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    params JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    content_id TEXT,
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    lease_until TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS job_events (
+    id BIGSERIAL PRIMARY KEY,
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    event JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_queued ON jobs(created_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(lease_until) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id, status);
+CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events(job_id, id);
+
+ALTER TABLE jobs ENABLE ROW LEVEL SECURITY;
+ALTER TABLE job_events ENABLE ROW LEVEL SECURITY;
+
+-- 7. Aşama checkpoint'leri (opsiyonel, JOB_DATABASE_URL ile)
+-- Başarısız üretim tekrar denenince tamamlanan aşamalar buradan okunur.
+CREATE TABLE IF NOT EXISTS checkpoints (
+    checkpoint_key TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    payload BYTEA NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (checkpoint_key, stage)
+);
+
+CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints(created_at);
+
+ALTER TABLE checkpoints ENABLE ROW LEVEL SECURITY;
+
 -- ============================================================
 -- Kurulum tamamlandı!
 -- ============================================================
@@ -2,6 +2,7 @@
 Supabase Database Client
 """
 
+from typing import Optional
 from supabase import create_client, Client
 from config.settings import SUPABASE_URL, SUPABASE_KEY
 
@@ -18,3 +19,14 @@ def get_supabase() -> Client:
         _client = create_client(SUPABASE_URL, SUPABASE_KEY)
     
     return _client
+
+
+def save_content(user_id: str, topic: str, content: str) -> Optional[dict]:
+    """Üretilen içeriği contents tablosuna kaydeder, kaydı döndürür"""
+    insert_result = get_supabase().table("contents").insert({
+        "user_id": user_id,
+        "topic": topic,
+        "content": content,
+    }).execute()
+    
+    return insert_result.data[0] if insert_result.data else None
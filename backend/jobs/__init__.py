@@ -0,0 +1 @@
+from .store import JobStore, get_job_store, QUEUED, RUNNING, DONE, FAILED, FINISHED
@@ -0,0 +1,256 @@
+"""
+ContentForge Postgres Job Store
+Birden fazla makinedeki worker'lar için Postgres tabanlı iş kuyruğu
+
+JobStore (SQLite) ile aynı arayüz; JOB_DATABASE_URL tanımlıysa get_job_store()
+bunu döndürür. API ve worker'lar aynı veritabanına bağlanır, farklı
+makinelerde çalışabilir.
+
+- claim: SELECT ... FOR UPDATE SKIP LOCKED; eş zamanlı worker'lar aynı işi almaz,
+  birbirini beklemez
+- lease: claim ve heartbeat lease_until = now() + JOB_STALE_SECONDS yazar;
+  süre veritabanı saatine göre ölçülür (makineler arası saat farkı etkilemez)
+- job_events: worker'ların yazdığı event'ler; API SSE ile aktarır, event id'leri
+  (BIGSERIAL) iş içinde artan sıradadır
+
+Tablolar yoksa oluşturulur (database/schema.sql ile aynı şema).
+Gereken paket (opsiyonel): pip install "psycopg[binary]"
+"""
+
+import json
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import JOB_MAX_ATTEMPTS, JOB_STALE_SECONDS
+from agents.search_result import to_jsonable
+from jobs.store import QUEUED, RUNNING, DONE, FAILED, retry_event
+
+try:
+    import psycopg
+    from psycopg.types.json import Jsonb
+except ImportError:
+    psycopg = None
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    params JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    content_id TEXT,
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    lease_until TIMESTAMP WITH TIME ZONE
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queued ON jobs(created_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(lease_until) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id, status);
+CREATE TABLE IF NOT EXISTS job_events (
+    id BIGSERIAL PRIMARY KEY,
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    event JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events(job_id, id);
+"""
+
+# Zaman damgaları SQLite deposuyla aynı biçimde (epoch saniye) döner
+_SELECT_JOB = """
+    SELECT id, user_id, params, status, attempts, worker, content_id, result, error,
+           EXTRACT(EPOCH FROM created_at)::float8, EXTRACT(EPOCH FROM started_at)::float8,
+           EXTRACT(EPOCH FROM finished_at)::float8, EXTRACT(EPOCH FROM lease_until)::float8
+    FROM jobs
+"""
+_COLUMNS = ("id", "user_id", "params", "status", "attempts", "worker", "content_id",
+            "result", "error", "created_at", "started_at", "finished_at", "lease_until")
+
+
+def _jsonb(value: Any) -> "Jsonb":
+    return Jsonb(value, dumps=lambda obj: json.dumps(obj, ensure_ascii=False, default=to_jsonable))
+
+
+class PostgresJobStore:
+    """Postgres iş kuyruğu (çok makineli worker'lar)"""
+
+    def __init__(self, dsn: str, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 lease_seconds: int = JOB_STALE_SECONDS):
+        if psycopg is None:
+            raise RuntimeError('JOB_DATABASE_URL için psycopg gerekli: pip install "psycopg[binary]"')
+
+        self.dsn = dsn
+        self.max_attempts = max(1, max_attempts)
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+
+        with self._connect().transaction():
+            self._connect().execute(SCHEMA)
+
+    def _connect(self) -> "psycopg.Connection":
+        """Thread başına bir bağlantı (autocommit; çok adımlı işler transaction() içinde)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            conn = psycopg.connect(self.dsn, autocommit=True)
+            self._local.conn = conn
+        return conn
+
+    def _execute(self, query: str, params: tuple = ()) -> "psycopg.Cursor":
+        return self._connect().execute(query, params)
+
+    # ============================================================
+    # API TARAFI
+    # ============================================================
+
+    def submit(self, user_id: str, params: Dict[str, Any]) -> str:
+        """İşi kuyruğa ekler, iş id'sini döndürür"""
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, user_id, params, status) VALUES (%s, %s, %s, %s)",
+            (job_id, user_id, _jsonb(params), QUEUED)
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._execute(_SELECT_JOB + " WHERE id = %s", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_COLUMNS, row))
+        # SQLite deposuyla aynı alan adı
+        job["heartbeat_at"] = job.pop("lease_until")
+        return job
+
+    def position(self, job_id: str) -> int:
+        """Kuyruktaki sıra (1'den başlar), kuyrukta değilse 0"""
+        return self._execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = %s AND created_at <= "
+            "(SELECT created_at FROM jobs WHERE id = %s AND status = %s)",
+            (QUEUED, job_id, QUEUED)
+        ).fetchone()[0]
+
+    def count_active(self, user_id: str) -> int:
+        """Kullanıcının bitmemiş işleri (kota kontrolü için)"""
+        return self._execute(
+            "SELECT COUNT(*) FROM jobs WHERE user_id = %s AND status IN (%s, %s)",
+            (user_id, QUEUED, RUNNING)
+        ).fetchone()[0]
+
+    def events(self, job_id: str, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """id > after olan event'ler, sırayla"""
+        return self._execute(
+            "SELECT id, event FROM job_events WHERE job_id = %s AND id > %s ORDER BY id",
+            (job_id, after)
+        ).fetchall()
+
+    # ============================================================
+    # WORKER TARAFI
+    # ============================================================
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """En eski kuyruktaki işi kilitleyip bu worker'a atar (kilitli işler atlanır)"""
+        row = self._execute(
+            """
+            UPDATE jobs SET status = %s, worker = %s, attempts = attempts + 1,
+                   started_at = NOW(), lease_until = NOW() + make_interval(secs => %s)
+            WHERE id = (
+                SELECT id FROM jobs WHERE status = %s
+                ORDER BY created_at
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING id
+            """,
+            (RUNNING, worker, self.lease_seconds, QUEUED)
+        ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Lease'i uzatır; iş artık bu worker'da değilse False"""
+        return self._execute(
+            "UPDATE jobs SET lease_until = NOW() + make_interval(secs => %s) "
+            "WHERE id = %s AND worker = %s AND status = %s",
+            (self.lease_seconds, job_id, worker, RUNNING)
+        ).rowcount == 1
+
+    def append_event(self, job_id: str, event: Dict[str, Any]) -> int:
+        """Event'i işin log'una ekler, event id'sini döndürür"""
+        return self._execute(
+            "INSERT INTO job_events (job_id, event) VALUES (%s, %s) RETURNING id",
+            (job_id, _jsonb(event))
+        ).fetchone()[0]
+
+    def set_content(self, job_id: str, content_id: str):
+        """Kaydedilen içeriğin id'si (yeniden denemede tekrar kaydetmemek için)"""
+        self._execute("UPDATE jobs SET content_id = %s WHERE id = %s", (content_id, job_id))
+
+    def finish(self, job_id: str, worker: str, result: Dict[str, Any]) -> bool:
+        return self._execute(
+            "UPDATE jobs SET status = %s, result = %s, finished_at = NOW(), lease_until = NULL "
+            "WHERE id = %s AND worker = %s AND status = %s",
+            (DONE, _jsonb(result), job_id, worker, RUNNING)
+        ).rowcount == 1
+
+    def fail(self, job_id: str, worker: str, error: str) -> Optional[str]:
+        """
+        Başarısız denemeyi kaydeder
+
+        Returns:
+            Yeni durum: deneme hakkı kaldıysa queued, yoksa failed
+        """
+        conn = self._connect()
+        with conn.transaction():
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE id = %s AND worker = %s AND status = %s FOR UPDATE",
+                (job_id, worker, RUNNING)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._retry_or_fail(conn, job_id, row[0], error)
+
+    def requeue_stale(self, stale_seconds: Optional[int] = None) -> int:
+        """
+        Lease'i dolan (worker'ı çöken / bağlantısı kopan) işleri yeniden kuyruğa alır
+
+        Lease süresi claim / heartbeat'te belirlenir; stale_seconds yalnızca
+        SQLite deposuyla arayüz uyumu için vardır.
+        """
+        return self._requeue("lease_until < NOW()", ())
+
+    def requeue_worker(self, worker: str) -> int:
+        """Ölen bir worker'ın işlerini lease dolmadan yeniden kuyruğa alır"""
+        return self._requeue("worker = %s", (worker,))
+
+    def _requeue(self, condition: str, params: tuple) -> int:
+        conn = self._connect()
+        with conn.transaction():
+            rows = conn.execute(
+                f"SELECT id, attempts FROM jobs WHERE status = %s AND {condition} FOR UPDATE SKIP LOCKED",
+                (RUNNING, *params)
+            ).fetchall()
+            for job_id, attempts in rows:
+                self._retry_or_fail(conn, job_id, attempts, "Worker yanıt vermiyor")
+        return len(rows)
+
+    def _retry_or_fail(self, conn: "psycopg.Connection", job_id: str, attempts: int, error: str) -> str:
+        status = QUEUED if attempts < self.max_attempts else FAILED
+        conn.execute(
+            "UPDATE jobs SET status = %s, worker = NULL, lease_until = NULL, error = %s, "
+            "finished_at = CASE WHEN %s THEN NOW() END WHERE id = %s",
+            (status, error, status == FAILED, job_id)
+        )
+        conn.execute(
+            "INSERT INTO job_events (job_id, event) VALUES (%s, %s)",
+            (job_id, _jsonb(retry_event(status, attempts, error)))
+        )
+        return status
+
+    def stats(self) -> Dict[str, Any]:
+        """Durum başına iş sayısı"""
+        rows = self._execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        stats = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        stats.update(dict(rows))
+        return stats
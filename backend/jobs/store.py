@@ -0,0 +1,284 @@
+"""
+ContentForge Job Store
+Blog üretim işleri için SQLite tabanlı kalıcı kuyruk
+
+- jobs: iş parametreleri, durum (queued / running / done / failed), deneme sayısı,
+  çalışan worker ve son heartbeat zamanı
+- job_events: işin pipeline event'leri, iş başına 1'den artan seq ile
+
+API süreci iş ekler ve event okur; worker süreçleri iş alır (claim), event yazar
+ve heartbeat gönderir. Heartbeat'i JOB_STALE_SECONDS boyunca gelmeyen iş (worker
+çöktü) yeniden kuyruğa alınır; JOB_MAX_ATTEMPTS denemeden sonra failed olur.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import CACHE_DIR, JOB_DATABASE_URL, JOB_MAX_ATTEMPTS, JOB_STALE_SECONDS
+from agents.search_result import to_jsonable
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+FINISHED = (DONE, FAILED)
+
+_COLUMNS = ("id", "user_id", "params", "status", "attempts", "worker", "content_id",
+            "result", "error", "created_at", "started_at", "finished_at", "heartbeat_at")
+
+
+class JobStore:
+    """SQLite iş kuyruğu (süreçler arası paylaşılır, WAL)"""
+
+    def __init__(self, path: str, max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max(1, max_attempts)
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                content_id TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                heartbeat_at REAL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id, status)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_events (
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                event TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (job_id, seq)
+            )
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Thread başına bir bağlantı"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, work):
+        """work(conn) fonksiyonunu yazma kilidiyle çalıştırır"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    # ============================================================
+    # API TARAFI
+    # ============================================================
+
+    def submit(self, user_id: str, params: Dict[str, Any]) -> str:
+        """İşi kuyruğa ekler, iş id'sini döndürür"""
+        job_id = uuid.uuid4().hex
+        self._connect().execute(
+            "INSERT INTO jobs (id, user_id, params, status, created_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, user_id, json.dumps(params, ensure_ascii=False), QUEUED, time.time())
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_COLUMNS, row))
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def position(self, job_id: str) -> int:
+        """Kuyruktaki sıra (1'den başlar), kuyrukta değilse 0"""
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at <= "
+            "(SELECT created_at FROM jobs WHERE id = ? AND status = ?)",
+            (QUEUED, job_id, QUEUED)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def count_active(self, user_id: str) -> int:
+        """Kullanıcının bitmemiş işleri (kota kontrolü için)"""
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE user_id = ? AND status IN (?, ?)",
+            (user_id, QUEUED, RUNNING)
+        ).fetchone()[0]
+
+    def events(self, job_id: str, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """seq > after olan event'ler, sırayla"""
+        rows = self._connect().execute(
+            "SELECT seq, event FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, after)
+        ).fetchall()
+        return [(seq, json.loads(event)) for seq, event in rows]
+
+    # ============================================================
+    # WORKER TARAFI
+    # ============================================================
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """En eski kuyruktaki işi bu worker'a atar"""
+        def work(conn):
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, "
+                "started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, worker, now, now, row[0])
+            )
+            return row[0]
+
+        job_id = self._transaction(work)
+        return self.get(job_id) if job_id else None
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """İş hâlâ bu worker'daysa heartbeat yazar; değilse False (iş elinden alındı)"""
+        return self._connect().execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND worker = ? AND status = ?",
+            (time.time(), job_id, worker, RUNNING)
+        ).rowcount == 1
+
+    def append_event(self, job_id: str, event: Dict[str, Any]) -> int:
+        """Event'i işin log'una ekler, seq döndürür"""
+        return self._transaction(lambda conn: self._insert_event(conn, job_id, event))
+
+    def _insert_event(self, conn: sqlite3.Connection, job_id: str, event: Dict[str, Any]) -> int:
+        seq = conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?", (job_id,)
+        ).fetchone()[0]
+        conn.execute(
+            "INSERT INTO job_events (job_id, seq, event, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, seq, json.dumps(event, ensure_ascii=False, default=to_jsonable), time.time())
+        )
+        return seq
+
+    def set_content(self, job_id: str, content_id: str):
+        """Kaydedilen içeriğin id'si (yeniden denemede tekrar kaydetmemek için)"""
+        self._connect().execute("UPDATE jobs SET content_id = ? WHERE id = ?", (content_id, job_id))
+
+    def finish(self, job_id: str, worker: str, result: Dict[str, Any]) -> bool:
+        return self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, finished_at = ? WHERE id = ? AND worker = ? AND status = ?",
+            (DONE, json.dumps(result, ensure_ascii=False, default=to_jsonable), time.time(), job_id, worker, RUNNING)
+        ).rowcount == 1
+
+    def fail(self, job_id: str, worker: str, error: str) -> str:
+        """
+        Başarısız denemeyi kaydeder
+
+        Returns:
+            Yeni durum: deneme hakkı kaldıysa queued, yoksa failed
+        """
+        def work(conn):
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = ?",
+                (job_id, worker, RUNNING)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._retry_or_fail(conn, job_id, row[0], error)
+
+        return self._transaction(work)
+
+    def requeue_stale(self, stale_seconds: int = JOB_STALE_SECONDS) -> int:
+        """Heartbeat'i kesilen (worker'ı çöken) işleri yeniden kuyruğa alır"""
+        return self._requeue("heartbeat_at < ?", (time.time() - stale_seconds,))
+
+    def requeue_worker(self, worker: str) -> int:
+        """Ölen bir worker'ın işlerini beklemeden yeniden kuyruğa alır"""
+        return self._requeue("worker = ?", (worker,))
+
+    def _requeue(self, condition: str, params: tuple) -> int:
+        def work(conn):
+            rows = conn.execute(
+                f"SELECT id, attempts FROM jobs WHERE status = ? AND {condition}", (RUNNING, *params)
+            ).fetchall()
+            for job_id, attempts in rows:
+                self._retry_or_fail(conn, job_id, attempts, "Worker yanıt vermiyor")
+            return len(rows)
+
+        return self._transaction(work)
+
+    def _retry_or_fail(self, conn: sqlite3.Connection, job_id: str, attempts: int, error: str) -> str:
+        status = QUEUED if attempts < self.max_attempts else FAILED
+        conn.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, error = ?, finished_at = ? WHERE id = ?",
+            (status, error, time.time() if status == FAILED else None, job_id)
+        )
+        self._insert_event(conn, job_id, retry_event(status, attempts, error))
+        return status
+
+    def stats(self) -> Dict[str, Any]:
+        """Durum başına iş sayısı"""
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        stats = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        stats.update(dict(rows))
+        return stats
+
+
+def retry_event(status: str, attempts: int, error: str) -> Dict[str, Any]:
+    """Başarısız denemeden sonra işin log'una yazılan event"""
+    if status == QUEUED:
+        return {
+            "type": "requeued",
+            "message": f"Deneme {attempts} başarısız, iş yeniden kuyruğa alındı",
+            "data": {"attempt": attempts, "error": error}
+        }
+    return {"type": "error", "message": error, "data": {"attempt": attempts, "error": error}}
+
+
+_store = None
+_lock = threading.Lock()
+
+
+def get_job_store():
+    """Süreç genelinde tek iş deposu (JOB_DATABASE_URL varsa Postgres, yoksa SQLite)"""
+    global _store
+
+    if _store is None:
+        with _lock:
+            if _store is None:
+                if JOB_DATABASE_URL:
+                    from jobs.postgres_store import PostgresJobStore
+                    _store = PostgresJobStore(JOB_DATABASE_URL)
+                else:
+                    _store = JobStore(os.path.join(CACHE_DIR, "jobs.sqlite3"))
+
+    return _store
@@ -0,0 +1,178 @@
+"""
+ContentForge Job Worker
+Kuyruktaki blog üretim işlerini ayrı süreçlerde çalıştırır
+
+Her worker süreci sırayla iş alır, run_blog_pipeline_streaming event'lerini
+işin log'una yazar, sonucu contents tablosuna kaydeder. İş sürerken heartbeat
+gönderir; süreç ölürse supervisor işini hemen, başka makinedeki / tamamen
+kapanan worker'ların işlerini heartbeat zaman aşımıyla yeniden kuyruğa alır.
+Yeniden denenen iş, önceki denemenin tamamladığı aşamalardan (checkpoint) devam eder.
+
+Kullanım (API'den ayrı, aynı CACHE_DIR ile):
+    python -m jobs.worker                 # JOB_WORKERS süreç
+    python -m jobs.worker --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+from config.settings import (
+    JOB_WORKERS,
+    JOB_POLL_INTERVAL,
+    JOB_HEARTBEAT_SECONDS,
+    JOB_STALE_SECONDS,
+)
+from agents.blog_agents import run_blog_pipeline_streaming
+from agents.checkpoints import checkpoint_key, delete_checkpoints
+from database.supabase_client import save_content
+from jobs.store import JobStore, get_job_store
+
+
+def worker_name(pid: Optional[int] = None) -> str:
+    return f"{socket.gethostname()}-{pid or os.getpid()}"
+
+
+class JobLost(Exception):
+    """İş bu worker'dan alındı (heartbeat zaman aşımı sonrası yeniden kuyruğa girdi)"""
+
+
+def run_job(store: JobStore, job: Dict[str, Any], worker: str):
+    """Tek işi çalıştırır; hata olursa store.fail ile yeniden dener / bitirir"""
+    job_id = job["id"]
+    params = job["params"]
+    # Yeniden denemeler (aynı iş veya resume_id) tamamlanan aşamalardan devam eder
+    checkpoint_id = params.get("checkpoint_id") or checkpoint_key(job["user_id"], job_id)
+    lost = threading.Event()
+    done = threading.Event()
+
+    def beat():
+        while not done.wait(JOB_HEARTBEAT_SECONDS):
+            if not store.heartbeat(job_id, worker):
+                lost.set()
+                return
+
+    heart = threading.Thread(target=beat, name=f"heartbeat-{job_id[:8]}", daemon=True)
+    heart.start()
+
+    try:
+        # Önceki deneme içeriği kaydettikten sonra öldüyse tekrar üretme
+        if job["content_id"]:
+            store.finish(job_id, worker, job["result"] or {"content_id": job["content_id"]})
+            return
+
+        final = None
+        for event in run_blog_pipeline_streaming(**{**params, "checkpoint_id": checkpoint_id}):
+            if lost.is_set():
+                raise JobLost(job_id)
+            store.append_event(job_id, event)
+            if event["type"] == "final":
+                final = event["data"]
+
+        if final is None:
+            raise RuntimeError("Pipeline final event üretmedi")
+        if lost.is_set():
+            raise JobLost(job_id)
+
+        saved = save_content(job["user_id"], params["topic"], final["content"])
+        if not saved:
+            raise RuntimeError("İçerik kaydedilemedi")
+        store.set_content(job_id, saved["id"])
+        delete_checkpoints(checkpoint_id)
+
+        store.append_event(job_id, {
+            "type": "saved",
+            "message": "Blog kaydedildi",
+            "data": {
+                "id": saved["id"],
+                "topic": params["topic"],
+                "content": final["content"],
+                "created_at": saved["created_at"],
+                "quality": final["quality"]
+            }
+        })
+        store.finish(job_id, worker, {
+            "content_id": saved["id"],
+            "quality": final["quality"],
+            "word_count": final["word_count"],
+        })
+
+    except JobLost:
+        print(f"İş başka worker'a geçti: {job_id}")
+    except Exception as e:
+        print(f"İş hatası ({job_id}): {e}")
+        store.fail(job_id, worker, str(e))
+    finally:
+        done.set()
+
+
+def worker_loop(stop: Optional[Any] = None):
+    """Tek worker süreci: iş al, çalıştır, kuyruk boşsa bekle"""
+    if stop is not None:
+        # Ctrl+C supervisor'a; worker elindeki işi bitirip çıkar
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    store = get_job_store()
+    worker = worker_name()
+    last_sweep = 0.0
+
+    while not (stop and stop.is_set()):
+        # Tüm worker'lar kapanmışken kalan işler (heartbeat zaman aşımı)
+        if time.monotonic() - last_sweep > JOB_STALE_SECONDS / 2:
+            store.requeue_stale()
+            last_sweep = time.monotonic()
+
+        job = store.claim(worker)
+        if job is None:
+            time.sleep(JOB_POLL_INTERVAL)
+            continue
+        run_job(store, job, worker)
+
+
+def run(workers: int = JOB_WORKERS):
+    """Worker süreçlerini başlatır, ölenleri yeniden başlatır"""
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    store = get_job_store()
+
+    def start():
+        process = context.Process(target=worker_loop, args=(stop,), daemon=True)
+        process.start()
+        return process
+
+    def shutdown(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    processes = [start() for _ in range(max(1, workers))]
+    print(f"{len(processes)} worker başlatıldı")
+
+    while not stop.is_set():
+        for index, process in enumerate(processes):
+            if not process.is_alive():
+                requeued = store.requeue_worker(worker_name(process.pid))
+                print(f"Worker öldü (pid {process.pid}, çıkış {process.exitcode}), {requeued} iş yeniden kuyrukta")
+                processes[index] = start()
+        stop.wait(1.0)
+
+    # Elindeki işi bitiremeyen worker durdurulur, işi hemen yeniden kuyruğa alınır
+    for process in processes:
+        process.join(timeout=30)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+            store.requeue_worker(worker_name(process.pid))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Blog üretim işlerini çalıştırır")
+    parser.add_argument("--workers", type=int, default=JOB_WORKERS)
+    args = parser.parse_args()
+
+    run(args.workers)
@@ -0,0 +1,49 @@
+"""/api/blog/create route testleri (kimlik doğrulama devre dışı)"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.routes.blog as blog_routes
+from api.app import app
+from api.deps import get_current_user
+from api.generations import GenerationRegistry
+
+PARAMS = {"topic": "Yapay Zeka", "length": "short"}
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = GenerationRegistry()
+    monkeypatch.setattr(blog_routes, "get_generations", lambda: registry)
+    monkeypatch.setattr(blog_routes, "get_user_plan", lambda user_id: "free")
+    monkeypatch.setattr(blog_routes, "check_usage_limit", lambda user_id, plan=None: (False, 0, 3))
+    return registry
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "email": "a@b.c"}
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_create_rejects_resume_while_running(registry, client):
+    running = registry.create("u1")
+
+    response = client.post("/api/blog/create", json={**PARAMS, "resume_id": running.checkpoint_id})
+
+    assert response.status_code == 409
+
+
+def test_failed_create_returns_resume_id_and_finishes(registry, client, monkeypatch):
+    async def failing_pipeline(**kwargs):
+        raise RuntimeError("groq down")
+
+    monkeypatch.setattr(blog_routes, "run_blog_pipeline_async", failing_pipeline)
+
+    response = client.post("/api/blog/create", json={**PARAMS, "resume_id": "g1"})
+
+    assert response.status_code == 500
+    assert response.headers["X-Generation-Id"] == "g1"
+    # Biten deneme kaydı tutmaz; aynı resume_id ile tekrar denenebilir
+    assert registry.create("u1", "g1").checkpoint_id == "g1"
@@ -0,0 +1,46 @@
+"""Üretim kaydı testleri (create-stream yeniden deneme / Last-Event-ID)"""
+
+import asyncio
+
+import pytest
+
+from api.generations import GenerationRegistry
+
+
+async def collect(generation, after=0):
+    return [(seq, event["n"]) async for seq, event in generation.events(after)]
+
+
+def test_retry_gets_own_stream_and_keeps_checkpoint_id():
+    async def scenario():
+        registry = GenerationRegistry()
+        first = registry.create("u1")
+        for n in range(1, 4):
+            first.publish({"n": n})
+        first.finish()
+
+        retry = registry.create("u1", first.checkpoint_id)
+        retry.publish({"n": "retry-1"})
+        retry.finish()
+
+        assert retry.id != first.id
+        assert retry.checkpoint_id == first.checkpoint_id
+        # İlk akışın eski Last-Event-ID'si yeni denemenin event'lerini atlatmaz
+        assert await collect(registry.get(first.id, "u1"), after=3) == []
+        assert await collect(registry.get(retry.id, "u1")) == [(1, "retry-1")]
+
+    asyncio.run(scenario())
+
+
+def test_running_checkpoint_cannot_start_twice():
+    async def scenario():
+        registry = GenerationRegistry()
+        first = registry.create("u1")
+
+        with pytest.raises(ValueError):
+            registry.create("u1", first.checkpoint_id)
+
+        first.finish()
+        assert registry.create("u1", first.checkpoint_id).checkpoint_id == first.checkpoint_id
+
+    asyncio.run(scenario())
@@ -0,0 +1,52 @@
+"""Ortak HTTP istemcisi tekrar deneme testleri"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agents.http_client import http_get, http_post
+
+
+@pytest.fixture
+def flaky_server():
+    """Her isteğe 503 dönen ve istekleri sayan yerel sunucu"""
+    hits = {"GET": 0, "POST": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self):
+            hits[self.command] += 1
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        do_GET = do_POST = _reply
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/", hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_post_is_not_retried_on_5xx(flaky_server):
+    url, hits = flaky_server
+    response = http_post(url, json={"q": "test"}, timeout=5)
+
+    assert response.status_code == 503
+    assert hits["POST"] == 1
+
+
+def test_get_is_retried_on_5xx(flaky_server):
+    url, hits = flaky_server
+    response = http_get(url, timeout=5)
+
+    assert response.status_code == 503
+    assert hits["GET"] > 1
@@ -0,0 +1,106 @@
+"""JobStore (SQLite) testleri; tests/test_postgres_store.py ile aynı senaryolar"""
+
+import threading
+
+import pytest
+
+from jobs.store import JobStore, QUEUED, RUNNING, DONE, FAILED
+
+PARAMS = {"topic": "Yapay Zeka", "length": "short"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+
+
+def test_concurrent_workers_never_claim_same_job(store):
+    job_ids = {store.submit("u1", PARAMS) for _ in range(20)}
+    claimed = []
+    lock = threading.Lock()
+
+    def work(worker):
+        while True:
+            job = store.claim(worker)
+            if job is None:
+                return
+            with lock:
+                claimed.append(job["id"])
+
+    threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(job_ids)
+    assert store.stats()[RUNNING] == 20
+
+
+def test_claim_takes_oldest_job(store):
+    first = store.submit("u1", PARAMS)
+    second = store.submit("u1", PARAMS)
+
+    assert store.position(second) == 2
+    assert store.claim("w1")["id"] == first
+    assert store.position(second) == 1
+
+
+def test_stale_heartbeat_requeues_job(store):
+    job_id = store.submit("u1", PARAMS)
+    store.claim("w1")
+    assert store.requeue_stale(stale_seconds=60) == 0
+
+    assert store.requeue_stale(stale_seconds=-1) == 1
+
+    job = store.get(job_id)
+    assert job["status"] == QUEUED
+    assert job["worker"] is None
+    assert store.events(job_id)[-1][1]["type"] == "requeued"
+    assert store.heartbeat(job_id, "w1") is False
+
+
+def test_requeue_worker(store):
+    first = store.submit("u1", PARAMS)
+    second = store.submit("u1", PARAMS)
+    store.claim("w1")
+    store.claim("w2")
+
+    assert store.requeue_worker("w1") == 1
+    assert store.get(first)["status"] == QUEUED
+    assert store.get(second)["status"] == RUNNING
+
+
+def test_retries_stop_at_max_attempts(store):
+    job_id = store.submit("u1", PARAMS)
+
+    store.claim("w1")
+    assert store.fail(job_id, "w1", "hata") == QUEUED
+
+    store.claim("w1")
+    assert store.fail(job_id, "w1", "hata") == FAILED
+
+    job = store.get(job_id)
+    assert job["attempts"] == 2
+    assert job["finished_at"] is not None
+    assert store.claim("w1") is None
+    assert store.events(job_id)[-1][1]["type"] == "error"
+
+
+def test_event_seq_increases_per_job(store):
+    first = store.submit("u1", PARAMS)
+    second = store.submit("u1", PARAMS)
+
+    assert [store.append_event(first, {"n": n}) for n in range(3)] == [1, 2, 3]
+    assert store.append_event(second, {"n": 0}) == 1
+    assert [seq for seq, _ in store.events(first, after=1)] == [2, 3]
+
+
+def test_finish_only_by_owning_worker(store):
+    job_id = store.submit("u1", PARAMS)
+    store.claim("w1")
+
+    assert store.finish(job_id, "w2", {}) is False
+    assert store.finish(job_id, "w1", {"content_id": "c1"}) is True
+    assert store.get(job_id)["status"] == DONE
+    assert store.get(job_id)["result"] == {"content_id": "c1"}
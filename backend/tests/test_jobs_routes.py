@@ -0,0 +1,100 @@
+"""/api/jobs route testleri (SQLite JobStore, kimlik doğrulama devre dışı)"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.routes.jobs as jobs_routes
+from api.app import app
+from api.deps import get_current_user
+from jobs.store import JobStore
+
+PARAMS = {"topic": "Yapay Zeka", "length": "short"}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+    monkeypatch.setattr(jobs_routes, "get_job_store", lambda: store)
+    monkeypatch.setattr(jobs_routes, "get_user_plan", lambda user_id: "free")
+    monkeypatch.setattr(jobs_routes, "check_usage_limit", lambda user_id, plan=None: (False, 0, 3))
+    return store
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "email": "a@b.c"}
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def read_events(response):
+    """SSE gövdesinden (id, event) çiftleri"""
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((int(lines["id"]), json.loads(lines["data"])))
+    return events
+
+
+def finished_job(store, count=3):
+    """count event yazılmış, bitmiş iş"""
+    job_id = store.submit("u1", PARAMS)
+    store.claim("w1")
+    for step in range(1, count + 1):
+        store.append_event(job_id, {"type": "agent_complete", "step": step})
+    store.finish(job_id, "w1", {"content_id": "c1"})
+    return job_id
+
+
+def test_events_stream_from_start(store, client):
+    job_id = finished_job(store)
+
+    response = client.get(f"/api/jobs/{job_id}/events")
+
+    assert response.status_code == 200
+    assert [seq for seq, _ in read_events(response)] == [1, 2, 3]
+
+
+def test_events_resume_with_last_event_id(store, client):
+    job_id = finished_job(store)
+
+    response = client.get(f"/api/jobs/{job_id}/events", headers={"Last-Event-ID": "2"})
+
+    assert [(seq, event["step"]) for seq, event in read_events(response)] == [(3, 3)]
+
+
+def test_events_of_other_user_not_found(store, client):
+    job_id = store.submit("u2", PARAMS)
+    assert client.get(f"/api/jobs/{job_id}/events").status_code == 404
+
+
+def test_submit_status_events(store, client):
+    response = client.post("/api/jobs", json={"topic": "Yapay Zeka", "length": "short"})
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["position"] == 1
+
+    claimed = store.claim("w1")
+    assert claimed["params"]["user_plan"] == "free"
+    assert "resume_id" not in claimed["params"]
+    assert client.get(f"/api/jobs/{job['id']}").json()["status"] == "running"
+
+    store.append_event(job["id"], {"type": "agent_start", "step": 1})
+    store.append_event(job["id"], {"type": "saved", "data": {"id": "c1"}})
+    store.finish(job["id"], "w1", {"content_id": "c1"})
+
+    status = client.get(f"/api/jobs/{job['id']}").json()
+    assert status["status"] == "done"
+    assert status["result"] == {"content_id": "c1"}
+
+    events = read_events(client.get(f"/api/jobs/{job['id']}/events"))
+    assert [event["type"] for _, event in events] == ["agent_start", "saved"]
+
+
+def test_submit_respects_quota_with_active_jobs(store, client, monkeypatch):
+    monkeypatch.setattr(jobs_routes, "check_usage_limit", lambda user_id, plan=None: (False, 2, 3))
+    assert client.post("/api/jobs", json=PARAMS).status_code == 202
+    assert client.post("/api/jobs", json=PARAMS).status_code == 429
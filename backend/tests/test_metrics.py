@@ -0,0 +1,27 @@
+"""/metrics erişim kontrolü"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.deps as deps
+from api.app import app
+
+client = TestClient(app)
+
+
+def test_metrics_disabled_without_token(monkeypatch):
+    monkeypatch.setattr(deps, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 404
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer yanlis"}])
+def test_metrics_rejects_bad_token(monkeypatch, headers):
+    monkeypatch.setattr(deps, "METRICS_TOKEN", "gizli")
+    assert client.get("/metrics", headers=headers).status_code == 401
+
+
+def test_metrics_with_token(monkeypatch):
+    monkeypatch.setattr(deps, "METRICS_TOKEN", "gizli")
+    response = client.get("/metrics", headers={"Authorization": "Bearer gizli"})
+    assert response.status_code == 200
+    assert "providers" in response.json()
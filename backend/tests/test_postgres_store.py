@@ -0,0 +1,108 @@
+"""
+PostgresJobStore testleri (pgserver ile yerel Postgres)
+
+Çalıştırma: pip install -r requirements-dev.txt && pytest
+"""
+
+import threading
+import time
+
+import pytest
+
+pgserver = pytest.importorskip("pgserver")
+pytest.importorskip("psycopg")
+
+from jobs.postgres_store import PostgresJobStore
+from jobs.store import QUEUED, RUNNING, FAILED
+
+PARAMS = {"topic": "Yapay Zeka", "length": "short"}
+
+
+@pytest.fixture(scope="module")
+def dsn(tmp_path_factory):
+    server = pgserver.get_server(str(tmp_path_factory.mktemp("pg")), cleanup_mode="stop")
+    yield server.get_uri()
+    server.cleanup()
+
+
+@pytest.fixture
+def store(dsn):
+    store = PostgresJobStore(dsn, max_attempts=2, lease_seconds=1)
+    store._execute("TRUNCATE jobs CASCADE")
+    return store
+
+
+def test_concurrent_workers_never_claim_same_job(store):
+    job_ids = {store.submit("u1", PARAMS) for _ in range(20)}
+    claimed = []
+    lock = threading.Lock()
+
+    def work(worker):
+        # Her thread kendi bağlantısını kullanır (thread-local)
+        while True:
+            job = store.claim(worker)
+            if job is None:
+                return
+            with lock:
+                claimed.append(job["id"])
+
+    threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(job_ids)
+    assert store.stats()[RUNNING] == 20
+
+
+def test_expired_lease_requeues_job(store):
+    job_id = store.submit("u1", PARAMS)
+    assert store.claim("w1")["id"] == job_id
+    assert store.requeue_stale() == 0
+
+    time.sleep(1.5)
+    assert store.requeue_stale() == 1
+
+    job = store.get(job_id)
+    assert job["status"] == QUEUED
+    assert job["worker"] is None
+    assert store.events(job_id)[-1][1]["type"] == "requeued"
+    # Eski worker işi kaybettiğini heartbeat'te öğrenir
+    assert store.heartbeat(job_id, "w1") is False
+
+
+def test_heartbeat_extends_lease(store):
+    job_id = store.submit("u1", PARAMS)
+    store.claim("w1")
+    for _ in range(3):
+        time.sleep(0.5)
+        assert store.heartbeat(job_id, "w1") is True
+    assert store.requeue_stale() == 0
+
+
+def test_requeue_worker(store):
+    first = store.submit("u1", PARAMS)
+    second = store.submit("u1", PARAMS)
+    store.claim("w1")
+    store.claim("w2")
+
+    assert store.requeue_worker("w1") == 1
+    assert store.get(first)["status"] == QUEUED
+    assert store.get(second)["status"] == RUNNING
+
+
+def test_retries_stop_at_max_attempts(store):
+    job_id = store.submit("u1", PARAMS)
+
+    store.claim("w1")
+    assert store.fail(job_id, "w1", "hata") == QUEUED
+
+    store.claim("w1")
+    assert store.fail(job_id, "w1", "hata") == FAILED
+
+    job = store.get(job_id)
+    assert job["attempts"] == 2
+    assert job["finished_at"] is not None
+    assert store.claim("w1") is None
+    assert store.events(job_id)[-1][1]["type"] == "error"
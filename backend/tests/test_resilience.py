@@ -0,0 +1,47 @@
+"""Sağlayıcı koruması testleri"""
+
+import pytest
+
+from agents.resilience import AdaptiveLimiter, CircuitBreaker, ProviderGuard
+
+
+def test_unsampled_release_does_not_shrink_limit():
+    limiter = AdaptiveLimiter(initial=4, min_limit=1, max_limit=8, target_p95=1.0, window=2)
+    for _ in range(4):
+        assert limiter.acquire(timeout=0.1)
+        limiter.release_unsampled()
+
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_provider_throttle_halves_limit():
+    limiter = AdaptiveLimiter(initial=4, min_limit=1, max_limit=8, target_p95=1.0, window=2)
+    for outcome in ("ok", "throttled"):
+        limiter.acquire(timeout=0.1)
+        limiter.release(0.1, outcome)
+
+    assert limiter.limit == 2
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(status_code)
+        self.status_code = status_code
+
+
+def test_throttle_does_not_reset_circuit_failures():
+    guard = ProviderGuard("test", rate=100.0, burst=100.0,
+                          concurrency=AdaptiveLimiter(initial=4, min_limit=1, max_limit=8, target_p95=1.0))
+    guard.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    responses = iter([_HTTPError(500), _HTTPError(429), _HTTPError(500)])
+
+    def fail():
+        raise next(responses)
+
+    with pytest.raises(_HTTPError):
+        guard.call(fail)
+    with pytest.raises(_HTTPError):
+        guard.call(fail)
+
+    assert guard.breaker.state == "open"
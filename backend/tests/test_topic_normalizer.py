@@ -0,0 +1,25 @@
+"""Önbellek anahtarı normalizasyonu testleri"""
+
+import pytest
+
+from agents.topic_normalizer import canonical_topic, normalize_query, turkish_casefold
+
+
+@pytest.mark.parametrize("variants", [
+    ("AI", "ai", "Ai"),
+    ("ISTANBUL", "İstanbul", "istanbul", "Istanbul"),
+    ("Yapay Zeka", "yapay zeka ", "YAPAY  ZEKA"),
+    ("IŞIK", "ışık", "Işık"),
+])
+def test_variants_share_key(variants):
+    assert len({canonical_topic(v) for v in variants}) == 1
+    assert len({normalize_query(v) for v in variants}) == 1
+
+
+def test_suffix_stripping_uses_turkish_spelling():
+    assert canonical_topic("ARAÇLARI", True) == canonical_topic("araç", True)
+
+
+def test_display_casefold_keeps_turkish_letters():
+    assert turkish_casefold("IŞIK") == "ışık"
+    assert turkish_casefold("İstanbul") == "istanbul"
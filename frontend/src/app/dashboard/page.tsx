@@ -63,6 +63,8 @@ export default function DashboardPage() {
   const [agentEvents, setAgentEvents] = useState<AgentEvent[]>([]);
   const [showAgentProgress, setShowAgentProgress] = useState(false);
   const [isGenerationComplete, setIsGenerationComplete] = useState(false);
+  // Başarısız üretim: tekrar denemede kaydedilen aşamalardan devam edilir
+  const [resumeId, setResumeId] = useState<string | undefined>();
 
   // Auth kontrolü
   useEffect(() => {
@@ -113,6 +115,12 @@ export default function DashboardPage() {
           setIsGenerationComplete(true);
         }
         
+        if (event.type === 'error') {
+          setResumeId(event.data?.resume_id);
+          setError(`${event.message || 'Blog oluşturulamadı'} - tekrar denerseniz kaldığı yerden devam edilir`);
+          setLoading(false);
+        }
+        
         if (event.type === 'saved' && event.data) {
           const newBlog: Blog = {
             id: event.data.id,
@@ -125,6 +133,7 @@ export default function DashboardPage() {
           setBlogs(prev => [newBlog, ...prev]);
           setSelectedBlog(newBlog);
           setTopic('');
+          setResumeId(undefined);
           
           if (usage) {
             setUsage({
@@ -150,7 +159,8 @@ export default function DashboardPage() {
       // onComplete
       () => {
         // Stream tamamlandı
-      }
+      },
+      resumeId
     );
   };
 
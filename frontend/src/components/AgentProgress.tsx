@@ -14,13 +14,19 @@ export default function AgentProgress({ events, isComplete }: AgentProgressProps
   const [currentStep, setCurrentStep] = useState(0);
   const [totalSteps, setTotalSteps] = useState(5);
   const [messages, setMessages] = useState<{ agent: Agent; message: string; isComplete: boolean }[]>([]);
+  const [queueMessage, setQueueMessage] = useState<string | null>(null);
   
   useEffect(() => {
     if (events.length === 0) return;
     
     const lastEvent = events[events.length - 1];
     
+    if (lastEvent.type === 'queued') {
+      setQueueMessage(lastEvent.message || null);
+    }
+    
     if (lastEvent.type === 'agent_start' && lastEvent.agent) {
+      setQueueMessage(null);
       setActiveAgent(lastEvent.agent);
       setCurrentStep(lastEvent.step || 0);
       setTotalSteps(lastEvent.total_steps || 5);
@@ -85,6 +91,11 @@ export default function AgentProgress({ events, isComplete }: AgentProgressProps
         />
       </div>
       
+      {/* Queue Position */}
+      {queueMessage && !activeAgent && (
+        <p className="mb-6 text-gray-400 text-sm animate-pulse">{queueMessage}</p>
+      )}
+      
       {/* Active Agent Card */}
       {activeAgent && !isComplete && (
         <div 
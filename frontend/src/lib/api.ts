@@ -107,67 +107,105 @@ export function createBlogStream(
   format_type: string = 'standard',
   onEvent: (event: AgentEvent) => void,
   onError: (error: Error) => void,
-  onComplete: () => void
+  onComplete: () => void,
+  resumeId?: string  // Başarısız üretimin id'si: tamamlanan aşamalardan devam
 ): () => void {
   const token = getToken();
   
   const controller = new AbortController();
   
-  fetch(`${API_URL}/api/blog/create-stream`, {
-    method: 'POST',
-    headers: {
+  // Bağlantı koparsa aynı üretime Last-Event-ID ile yeniden bağlan (yeni üretim / kota yok)
+  const MAX_RETRIES = 3;
+  let lastEventId = '';
+  let finished = false;
+  let retries = 0;
+  
+  const connect = () => {
+    const headers: Record<string, string> = {
       'Content-Type': 'application/json',
       'Authorization': `Bearer ${token}`
-    },
-    body: JSON.stringify({ topic, audience, tone, length, format_type }),
-    signal: controller.signal
-  })
-  .then(async (response) => {
-    if (!response.ok) {
-      const error = await response.json();
-      throw new Error(error.detail || 'Blog oluşturulamadı');
+    };
+    if (lastEventId) {
+      headers['Last-Event-ID'] = lastEventId;
     }
     
-    const reader = response.body?.getReader();
-    const decoder = new TextDecoder();
-    
-    if (!reader) {
-      throw new Error('Stream reader oluşturulamadı');
-    }
+    let received = 0;
     
-    let buffer = '';
+    const retry = () => {
+      if (!lastEventId || finished || retries >= MAX_RETRIES) {
+        return false;
+      }
+      retries += 1;
+      setTimeout(connect, 1000 * retries);
+      return true;
+    };
     
-    while (true) {
-      const { done, value } = await reader.read();
-      
-      if (done) {
-        onComplete();
-        break;
+    fetch(`${API_URL}/api/blog/create-stream`, {
+      method: 'POST',
+      headers,
+      body: JSON.stringify({ topic, audience, tone, length, format_type, resume_id: resumeId }),
+      signal: controller.signal
+    })
+    .then(async (response) => {
+      if (!response.ok) {
+        // Limit / kapasite / süresi dolmuş üretim: tekrar deneme
+        finished = true;
+        const error = await response.json();
+        throw new Error(error.detail || 'Blog oluşturulamadı');
       }
       
-      buffer += decoder.decode(value, { stream: true });
+      const reader = response.body?.getReader();
+      const decoder = new TextDecoder();
+      
+      if (!reader) {
+        throw new Error('Stream reader oluşturulamadı');
+      }
       
-      // SSE formatını parse et
-      const lines = buffer.split('\n');
-      buffer = lines.pop() || '';
+      let buffer = '';
       
-      for (const line of lines) {
-        if (line.startsWith('data: ')) {
-          try {
-            const data = JSON.parse(line.slice(6)) as AgentEvent;
-            onEvent(data);
-          } catch (e) {
-            console.error('Event parse hatası:', e);
+      while (true) {
+        const { done, value } = await reader.read();
+        
+        if (done) {
+          // Yeniden bağlanınca yeni event gelmediyse üretim zaten bitmiştir
+          if (received === 0 || !retry()) {
+            onComplete();
+          }
+          break;
+        }
+        
+        buffer += decoder.decode(value, { stream: true });
+        
+        // SSE formatını parse et
+        const lines = buffer.split('\n');
+        buffer = lines.pop() || '';
+        
+        for (const line of lines) {
+          if (line.startsWith('id: ')) {
+            lastEventId = line.slice(4);
+          } else if (line.startsWith('data: ')) {
+            try {
+              const data = JSON.parse(line.slice(6)) as AgentEvent;
+              received += 1;
+              if (data.type === 'saved' || data.type === 'error') {
+                finished = true;
+              }
+              onEvent(data);
+            } catch (e) {
+              console.error('Event parse hatası:', e);
+            }
           }
         }
       }
-    }
-  })
-  .catch((error) => {
-    if (error.name !== 'AbortError') {
-      onError(error);
-    }
-  });
+    })
+    .catch((error) => {
+      if (error.name !== 'AbortError' && !retry()) {
+        onError(error);
+      }
+    });
+  };
+  
+  connect();
   
   // Abort fonksiyonu döndür
   return () => controller.abort();
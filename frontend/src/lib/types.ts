@@ -11,7 +11,7 @@ export interface Agent {
 }
 
 export interface AgentEvent {
-  type: 'agent_start' | 'agent_complete' | 'final' | 'saved' | 'error';
+  type: 'queued' | 'agent_start' | 'agent_complete' | 'final' | 'saved' | 'error';
   agent?: Agent;
   step?: number;
   total_steps?: number;